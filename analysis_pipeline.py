@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from document import Document, as_document
+from scraping_utils import RateLimitExceeded, fetch_and_extract
+
+# A job board with its own /analyze_<name> route, taking a '<name>_url' field
+Platform = namedtuple('Platform', ['name', 'label', 'url_marker', 'extractor', 'timeout'])
+
+PLATFORMS = {}
+
+def register_platform(name, label, url_marker, extractor, timeout=15):
+    """
+    Add a job board: `label` is its display name, `url_marker` a string
+    its posting URLs contain and `extractor` the PageExtractor for them
+    (scraping_utils.job_content_extractor(name) for the boards it knows)
+    """
+    PLATFORMS[name] = Platform(name, label, url_marker, extractor, timeout)
+    return PLATFORMS[name]
+
+class AnalysisPipeline:
+    STAGES = ('fetch', 'extract', 'normalize', 'score', 'analyze')
+
+    def __init__(self, predictor, result_cache=None, check_companies=None, documents=None):
+        """
+        Posting analysis as explicit stages, each timed:
+        fetch      request the page (or revalidate the page cache's copy)
+        extract    stream the body through the platform's extractor
+        normalize  one TextFeatures pass (lowercasing, word count, indicator
+                   phrases, salary mentions) shared by every analysis
+        score      one model call for all texts not in the result cache
+        analyze    salary, description quality and interview analyses
+        Texts can also enter at normalize (analyze_texts). Each one travels
+        as a Document, taken from `documents` (a RecentDocuments) when the
+        text was seen recently. Company checks run after the result cache
+        so store updates apply right away.
+        `predictor` may also be a function returning it, called when it is
+        first needed, so the model loads on first use.
+        """
+        self._predictor = predictor
+        self.result_cache = result_cache
+        self.check_companies = check_companies
+        self.documents = documents
+
+        self._totals = {stage: [0, 0.0] for stage in self.STAGES}  # stage -> [items, seconds]
+        self._lock = threading.Lock()
+
+    @property
+    def predictor(self):
+        return self._predictor() if callable(self._predictor) else self._predictor
+
+    @contextmanager
+    def stage(self, name, items=1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._totals[name][0] += items
+                self._totals[name][1] += elapsed
+
+    def document(self, text):
+        """The Document for a text or Document, reusing a recent one"""
+        return self.documents.get(text) if self.documents else as_document(text)
+
+    def fetch_text(self, url, platform):
+        """
+        The posting text at `url`, '' if it could not be fetched (the
+        error is logged; boards often block automated access).
+        RateLimitExceeded is raised for the caller to answer 429
+        """
+        try:
+            return fetch_and_extract(url, platform.name, platform.extractor,
+                                     timeout=platform.timeout, stage=self.stage)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            print(f"{platform.label} extraction error: {str(e)}")
+            return ""
+
+    def respond(self, document, prediction_result):
+        """Combine a get_prediction_result tuple with the AI-powered analyses"""
+        result, confidence_score, icon, pattern_matches = prediction_result
+        text, features = document.raw, document.features
+
+        return {
+            'result': result,
+            'confidence_score': round(confidence_score, 1),
+            'icon': icon,
+            'pattern_matches': pattern_matches,
+            'word_count': features.word_count,
+            'salary_analysis': self.predictor.analyze_salary_range(text, features),
+            'internship_quality_score': self.predictor.analyze_internship_description_quality(text, features),
+            'interview_analysis': self.predictor.analyze_interview_process(text, features)
+        }
+
+    def analyze_texts(self, texts):
+        """
+        Full analysis of each text (or Document), served from the result
+        cache when the same posting was already analyzed with the current model
+        """
+        documents = [self.document(text) for text in texts]
+        version = self.predictor.cache_version
+        keys = [self.result_cache.make_key(document.raw, version) for document in documents] if self.result_cache else None
+        responses = [self.result_cache.get(key) for key in keys] if keys else [None] * len(documents)
+        missing = [i for i, response in enumerate(responses) if response is None]
+
+        if missing:
+            with self.stage('normalize', len(missing)):
+                for i in missing:
+                    documents[i].features
+            # Score all cache misses with one vectorizer/model call
+            with self.stage('score', len(missing)):
+                prediction_results = self.predictor.get_prediction_results([documents[i] for i in missing])
+
+            with self.stage('analyze', len(missing)):
+                for i, prediction_result in zip(missing, prediction_results):
+                    try:
+                        responses[i] = self.respond(documents[i], prediction_result)
+                    except Exception as e:
+                        responses[i] = {'error': str(e)}
+                        continue
+
+                    # Errors are not worth remembering
+                    if keys and prediction_result[0] != "Error":
+                        self.result_cache.set(keys[i], responses[i])
+
+        # Callers add their own fields, so never hand out the cached dict itself
+        responses = [dict(response) for response in responses]
+        if self.check_companies:
+            for document, response in zip(documents, responses):
+                if 'error' not in response:
+                    response['company_check'] = self.check_companies(document.raw)
+        return responses
+
+    def analyze_url(self, url, platform):
+        """The analysis of the posting at `url`, or None if no text could be extracted"""
+        text = self.fetch_text(url, platform)
+        if not text:
+            return None
+        # Extractors return clean text
+        return self.analyze_texts([Document(text, cleaned=text)])[0]
+
+    def stats(self):
+        """Items through each stage and their mean time in milliseconds"""
+        with self._lock:
+            return {stage: {'items': items, 'mean_ms': round(seconds / items * 1000, 3) if items else 0.0}
+                    for stage, (items, seconds) in self._totals.items()}
@@ -1,110 +1,51 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
 import os
-from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+import threading
 from ocr_utils import extract_text_from_image, is_valid_image, get_ocr_status
-from scraping_utils import extract_text_from_url, is_valid_url
+from scraping_utils import RateLimitExceeded, extract_text_from_url, is_valid_url, job_content_extractor
+from page_reader import fetch_stats
+from ocr_pool import OCRPoolFull, create_ocr_pool
+from result_cache import create_result_cache
+from bulk_analyzer import iter_analyze_urls
+from company_store import create_company_store
+from analysis_pipeline import AnalysisPipeline, PLATFORMS, register_platform
+from document import Document, create_recent_documents
 import json
 from datetime import datetime
 import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-import requests
-from bs4 import BeautifulSoup
-import re
+import math
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 
-# Initialize enhanced predictor
-predictor = EnhancedFakeInternshipPredictor()
-
-# Enhanced company database with more comprehensive information
-ENHANCED_COMPANY_DATABASE = {
-    # Fraudulent Companies
-    "fakecorp": {
-        "name": "FakeCorp Inc", 
-        "fraud_score": 95, 
-        "reports": 150, 
-        "last_updated": "2024-01-15",
-        "domain_age": "2 months",
-        "social_media": "Limited/None",
-        "contact_verification": "Failed",
-        "industry": "Technology",
-        "location": "Unknown",
-        "website": "fakecorp-scam.com",
-        "red_flags": ["No physical address", "Fake testimonials", "Payment required upfront"]
-    },
-    "scamtech": {
-        "name": "ScamTech Solutions", 
-        "fraud_score": 88, 
-        "reports": 89, 
-        "last_updated": "2024-01-10",
-        "domain_age": "3 months",
-        "social_media": "None",
-        "contact_verification": "Failed",
-        "industry": "IT Services",
-        "location": "Virtual",
-        "website": "scamtech-fake.net",
-        "red_flags": ["Virtual office only", "No employee reviews", "Suspicious payment methods"]
-    },
-    "phishco": {
-        "name": "PhishCo Ltd", 
-        "fraud_score": 92, 
-        "reports": 234, 
-        "last_updated": "2024-01-12",
-        "domain_age": "1 month",
-        "social_media": "Fake profiles",
-        "contact_verification": "Failed",
-        "industry": "Consulting",
-        "location": "International",
-        "website": "phishco-scam.org",
-        "red_flags": ["International scam", "Fake social media", "Data harvesting"]
-    },
+# The enhanced predictor is loaded on first use (get_predictor), or in the
+# gunicorn master before workers fork when preloading (gunicorn.conf.py)
+_predictor = None
+_predictor_lock = threading.Lock()
+
+def get_predictor():
+    """The EnhancedFakeInternshipPredictor, loading it on the first call"""
+    global _predictor
     
-    # Legitimate Companies
-    "google": {
-        "name": "Google", 
-        "fraud_score": 5, 
-        "reports": 2, 
-        "last_updated": "2024-01-15",
-        "domain_age": "25+ years",
-        "social_media": "Extensive presence",
-        "contact_verification": "Verified",
-        "industry": "Technology",
-        "location": "Mountain View, CA",
-        "website": "google.com",
-        "green_flags": ["Established company", "Verified contact info", "Positive reviews"]
-    },
-    "microsoft": {
-        "name": "Microsoft", 
-        "fraud_score": 3, 
-        "reports": 1, 
-        "last_updated": "2024-01-15",
-        "domain_age": "30+ years",
-        "social_media": "Extensive presence",
-        "contact_verification": "Verified",
-        "industry": "Technology",
-        "location": "Redmond, WA",
-        "website": "microsoft.com",
-        "green_flags": ["Fortune 500 company", "Verified contact info", "Excellent reputation"]
-    },
-    "amazon": {
-        "name": "Amazon", 
-        "fraud_score": 6, 
-        "reports": 5, 
-        "last_updated": "2024-01-15",
-        "domain_age": "25+ years",
-        "social_media": "Extensive presence",
-        "contact_verification": "Verified",
-        "industry": "E-commerce",
-        "location": "Seattle, WA",
-        "website": "amazon.com",
-        "green_flags": ["Global company", "Verified contact info", "Established reputation"]
-    }
-}
+    with _predictor_lock:
+        if _predictor is None:
+            from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+            _predictor = EnhancedFakeInternshipPredictor()
+        return _predictor
+
+# Cache of analysis results, shared across workers when SNIFTERN_CACHE_DB is set
+result_cache = create_result_cache()
+
+# Documents of recently seen texts, so /detect on the output of /extract_url
+# does not redo what was computed for it (SNIFTERN_DOCUMENT_CACHE_SIZE)
+recent_documents = create_recent_documents()
+
+# Company database: a memory-mapped file shared by all workers, reloaded
+# when import_companies.py updates it (SNIFTERN_COMPANY_STORE)
+company_store = create_company_store()
+
+# Most ranked matches /search_company returns
+MAX_COMPANY_MATCHES = 20
 
 # Multi-language support
 LANGUAGES = {
@@ -262,6 +203,44 @@ def index():
     lang = request.args.get('lang', 'en')
     return render_template('index.html', lang=lang, translations=LANGUAGES.get(lang, LANGUAGES['en']))
 
+# Largest number of postings accepted by a single /detect_batch call
+MAX_BATCH_SIZE = 1000
+
+def check_companies(text):
+    """
+    Known companies a posting names or links to, looked up in the same
+    request instead of a separate /search_company call
+    """
+    index = company_store.index
+    companies = []
+    for key in index.mentions(text)[:MAX_COMPANY_MATCHES]:
+        record = index.record(key)
+        companies.append({
+            'key': key,
+            'name': record['name'],
+            'fraud_score': record.get('fraud_score'),
+            'is_fraud': record.get('fraud_score', 0) > 50
+        })
+    return {
+        'companies': companies,
+        'known_fraud': any(company['is_fraud'] for company in companies)
+    }
+
+# Fetch -> extract -> normalize -> score -> analyze, timed per stage (/pipeline_stats)
+pipeline = AnalysisPipeline(get_predictor, result_cache, check_companies, recent_documents)
+
+def analyze_texts(texts):
+    """
+    Full analysis of each text (or Document), served from the result cache
+    when the same posting was already analyzed with the current model. The company check
+    is not cached, so store updates show up right away.
+    """
+    return pipeline.analyze_texts(texts)
+
+def analyze_text(text):
+    """Full analysis of a single text, see analyze_texts"""
+    return analyze_texts([text])[0]
+
 @app.route('/detect', methods=['POST'])
 def detect_internship():
     try:
@@ -272,225 +251,222 @@ def detect_internship():
             return jsonify({'error': 'No text provided'}), 400
         
         # Get prediction with pattern analysis
-        result, confidence_score, icon, pattern_matches = predictor.get_prediction_result(text)
-        
-        # AI-Powered Features
-        salary_analysis = predictor.analyze_salary_range(text)
-        job_quality_score = predictor.analyze_internship_description_quality(text)
-        interview_analysis = predictor.analyze_interview_process(text)
-        
-        return jsonify({
-            'result': result,
-            'confidence_score': round(confidence_score, 1),
-            'icon': icon,
-            'pattern_matches': pattern_matches,
-            'word_count': len(text.split()),
-            'salary_analysis': salary_analysis,
-            'internship_quality_score': job_quality_score,
-            'interview_analysis': interview_analysis
-        })
+        return jsonify(analyze_text(text))
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/search_company', methods=['POST'])
-def search_company():
+@app.route('/detect_batch', methods=['POST'])
+def detect_batch():
     try:
         data = request.get_json()
-        company_name = data.get('company_name', '').lower().strip()
         
-        if not company_name:
-            return jsonify({'error': 'No company name provided'}), 400
+        # Accept either a bare JSON array or {"texts": [...]}
+        texts = data.get('texts') if isinstance(data, dict) else data
         
-        # Search in enhanced company database
-        if company_name in ENHANCED_COMPANY_DATABASE:
-            company_data = ENHANCED_COMPANY_DATABASE[company_name]
-            return jsonify({
-                'found': True,
-                'is_fraud': company_data['fraud_score'] > 50,
-                'company_data': company_data
-            })
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'error': 'Expected a non-empty JSON array of texts'}), 400
         
-        # Search for partial matches
-        matches = {k: v for k, v in ENHANCED_COMPANY_DATABASE.items() 
-                  if company_name in k or company_name in v['name'].lower()}
+        if len(texts) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch too large (max {MAX_BATCH_SIZE} items)'}), 400
         
-        if matches:
-            first_match = list(matches.items())[0]
-            return jsonify({
-                'found': True,
-                'is_fraud': first_match[1]['fraud_score'] > 50,
-                'company_data': first_match[1],
-                'partial_match': True
-            })
+        # Items may be plain strings or {"text": ...} objects
+        texts = [item.get('text', '') if isinstance(item, dict) else item for item in texts]
+        valid = [i for i, text in enumerate(texts) if isinstance(text, str) and text.strip()]
         
-        # Company not found
-        return jsonify({
-            'found': False,
-            'message': 'Company not found in our database. This could be a new company or the name might be misspelled.'
-        })
+        results = [{'error': 'No text provided'} for _ in texts]
+        for i, response in zip(valid, analyze_texts([texts[i] for i in valid])):
+            results[i] = response
+        
+        return jsonify({'results': results, 'count': len(results)})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/extract_url', methods=['POST'])
-def extract_url():
+# Largest number of URLs accepted by a single /analyze_urls call
+MAX_BULK_URLS = 500
+
+@app.route('/analyze_urls', methods=['POST'])
+def analyze_urls():
     try:
         data = request.get_json()
-        url = data.get('url', '')
         
-        if not url:
-            return jsonify({'error': 'No URL provided'}), 400
+        # Accept either a bare JSON array or {"urls": [...]}
+        urls = data.get('urls') if isinstance(data, dict) else data
         
-        if not is_valid_url(url):
-            return jsonify({'error': 'Invalid URL format'}), 400
+        if not isinstance(urls, list) or not urls or not all(isinstance(url, str) for url in urls):
+            return jsonify({'error': 'Expected a non-empty JSON array of URLs'}), 400
         
-        extracted_text = extract_text_from_url(url)
+        if len(urls) > MAX_BULK_URLS:
+            return jsonify({'error': f'Too many URLs (max {MAX_BULK_URLS})'}), 400
         
-        if extracted_text:
-            return jsonify({
-                'success': True,
-                'text': extracted_text,
-                'word_count': len(extracted_text.split())
-            })
-        else:
-            return jsonify({'error': 'Could not extract text from URL'}), 400
+        # Stream one JSON line per URL as soon as it has been analyzed
+        def generate():
+            for result in iter_analyze_urls(urls, analyze_texts):
+                yield json.dumps(result, ensure_ascii=False) + '\n'
+        
+        return Response(generate(), mimetype='application/x-ndjson')
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/analyze_linkedin', methods=['POST'])
-def analyze_linkedin():
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+OCR_TIMEOUT = 60
+
+ocr_pool = create_ocr_pool()
+
+@app.route('/analyze_image', methods=['POST'])
+def analyze_image():
     try:
-        data = request.get_json()
-        linkedin_url = data.get('linkedin_url', '')
+        image = request.files.get('image')
         
-        if not linkedin_url:
-            return jsonify({'error': 'No LinkedIn URL provided'}), 400
+        if image is None or not image.filename:
+            return jsonify({'error': 'No image provided'}), 400
         
-        # Validate LinkedIn URL
-        if 'linkedin.com/jobs' not in linkedin_url:
-            return jsonify({'error': 'Please provide a valid LinkedIn job posting URL'}), 400
+        data = image.read(MAX_IMAGE_BYTES + 1)
+        if len(data) > MAX_IMAGE_BYTES:
+            return jsonify({'error': f'Image too large (max {MAX_IMAGE_BYTES // (1024 * 1024)} MB)'}), 413
         
-        # Extract text from LinkedIn job posting with enhanced scraping
-        extracted_text = extract_linkedin_job_content(linkedin_url)
+        if not is_valid_image(io.BytesIO(data)):
+            return jsonify({'error': 'Invalid image file'}), 400
+        
+        # OCR runs in the bounded worker pool; shed load when it is backed up
+        try:
+            extracted_text = ocr_pool.extract(data, timeout=OCR_TIMEOUT)
+        except OCRPoolFull:
+            response = jsonify({'error': 'Too many images are being processed, please retry shortly'})
+            response.headers['Retry-After'] = '5'
+            return response, 429
+        except TimeoutError:
+            return jsonify({'error': 'Text extraction from the image timed out'}), 504
         
         if extracted_text:
-            # Get prediction with pattern analysis
-            result, confidence_score, icon, pattern_matches = predictor.get_prediction_result(extracted_text)
-            
-            # AI-Powered Features
-            salary_analysis = predictor.analyze_salary_range(extracted_text)
-            job_quality_score = predictor.analyze_internship_description_quality(extracted_text)
-            interview_analysis = predictor.analyze_interview_process(extracted_text)
-            
-            return jsonify({
-                'success': True,
-                'result': result,
-                'confidence_score': round(confidence_score, 1),
-                'icon': icon,
-                'pattern_matches': pattern_matches,
-                'word_count': len(extracted_text.split()),
-                'salary_analysis': salary_analysis,
-                'internship_quality_score': job_quality_score,
-                'interview_analysis': interview_analysis,
-                'source': 'LinkedIn'
-            })
+            # OCR output is already clean
+            response = analyze_text(Document(extracted_text, cleaned=extracted_text))
+            response.update({'success': True, 'source': 'image', 'text': extracted_text})
+            return jsonify(response)
         else:
-            return jsonify({'error': 'Could not extract text from LinkedIn URL. LinkedIn may have blocked automated access.'}), 400
+            return jsonify({'error': 'Could not extract text from image'}), 400
     
     except Exception as e:
-        return jsonify({'error': f'LinkedIn analysis failed: {str(e)}'}), 500
+        return jsonify({'error': f'Image analysis failed: {str(e)}'}), 500
 
-@app.route('/analyze_indeed', methods=['POST'])
-def analyze_indeed():
+@app.route('/ocr_status', methods=['GET'])
+def ocr_status():
+    installed, message = get_ocr_status(refresh=request.args.get('refresh') == '1')
+    return jsonify({'installed': installed, 'message': message, 'pool': ocr_pool.stats()})
+
+@app.route('/search_company', methods=['POST'])
+def search_company():
     try:
         data = request.get_json()
-        indeed_url = data.get('indeed_url', '')
+        company_name = data.get('company_name', '').strip()
         
-        if not indeed_url:
-            return jsonify({'error': 'No Indeed URL provided'}), 400
+        if not company_name:
+            return jsonify({'error': 'No company name provided'}), 400
         
-        # Validate Indeed URL
-        if 'indeed.com' not in indeed_url:
-            return jsonify({'error': 'Please provide a valid Indeed job posting URL'}), 400
+        try:
+            limit = int(data.get('limit', 5))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'limit must be an integer'}), 400
+        limit = max(1, min(limit, MAX_COMPANY_MATCHES))
+        index = company_store.index
+        matches = index.search(company_name, k=limit)
         
-        # Extract text from Indeed job posting
-        extracted_text = extract_indeed_job_content(indeed_url)
+        if matches:
+            records = [index.record(key) for key, _ in matches]
+            best_score = matches[0][1]
+            company_data = records[0]
+            response = {
+                'found': True,
+                'is_fraud': company_data.get('fraud_score', 0) > 50,
+                'company_data': company_data,
+                'score': best_score,
+                'matches': [{
+                    'key': key,
+                    'name': record['name'],
+                    'score': score,
+                    'is_fraud': record.get('fraud_score', 0) > 50
+                } for (key, score), record in zip(matches, records)]
+            }
+            if best_score < 1.0:
+                response['partial_match'] = True
+            return jsonify(response)
         
-        if extracted_text:
-            # Get prediction with pattern analysis
-            result, confidence_score, icon, pattern_matches = predictor.get_prediction_result(extracted_text)
-            
-            # AI-Powered Features
-            salary_analysis = predictor.analyze_salary_range(extracted_text)
-            job_quality_score = predictor.analyze_internship_description_quality(extracted_text)
-            interview_analysis = predictor.analyze_interview_process(extracted_text)
-            
-            return jsonify({
-                'success': True,
-                'result': result,
-                'confidence_score': round(confidence_score, 1),
-                'icon': icon,
-                'pattern_matches': pattern_matches,
-                'word_count': len(extracted_text.split()),
-                'salary_analysis': salary_analysis,
-                'internship_quality_score': job_quality_score,
-                'interview_analysis': interview_analysis,
-                'source': 'Indeed'
-            })
-        else:
-            return jsonify({'error': 'Could not extract text from Indeed URL. Indeed may have blocked automated access.'}), 400
+        # Company not found
+        return jsonify({
+            'found': False,
+            'message': 'Company not found in our database. This could be a new company or the name might be misspelled.'
+        })
     
     except Exception as e:
-        return jsonify({'error': f'Indeed analysis failed: {str(e)}'}), 500
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    stats = result_cache.stats()
+    stats['model_version'] = get_predictor().model_version
+    stats['rules_version'] = get_predictor().rules_version
+    stats['documents'] = recent_documents.stats()
+    return jsonify(stats)
+
+@app.route('/scrape_stats', methods=['GET'])
+def scrape_stats():
+    return jsonify(fetch_stats.stats())
+
+@app.route('/pipeline_stats', methods=['GET'])
+def pipeline_stats():
+    return jsonify(pipeline.stats())
+
+@app.route('/company_stats', methods=['GET'])
+def company_stats():
+    return jsonify(company_store.stats())
 
-@app.route('/analyze_glassdoor', methods=['POST'])
-def analyze_glassdoor():
+def rate_limited(error):
+    """429 for a fetch the per-host rate limiter refused to queue"""
+    response = jsonify({'error': 'Too many requests to this site, please retry shortly'})
+    response.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return response, 429
+
+@app.route('/extract_url', methods=['POST'])
+def extract_url():
     try:
         data = request.get_json()
-        glassdoor_url = data.get('glassdoor_url', '')
+        url = data.get('url', '')
         
-        if not glassdoor_url:
-            return jsonify({'error': 'No Glassdoor URL provided'}), 400
+        if not url:
+            return jsonify({'error': 'No URL provided'}), 400
         
-        # Validate Glassdoor URL
-        if 'glassdoor.com' not in glassdoor_url:
-            return jsonify({'error': 'Please provide a valid Glassdoor job posting URL'}), 400
+        if not is_valid_url(url):
+            return jsonify({'error': 'Invalid URL format'}), 400
         
-        # Extract text from Glassdoor job posting
-        extracted_text = extract_glassdoor_job_content(glassdoor_url)
+        extracted_text = extract_text_from_url(url)
         
         if extracted_text:
-            # Get prediction with pattern analysis
-            result, confidence_score, icon, pattern_matches = predictor.get_prediction_result(extracted_text)
-            
-            # AI-Powered Features
-            salary_analysis = predictor.analyze_salary_range(extracted_text)
-            job_quality_score = predictor.analyze_internship_description_quality(extracted_text)
-            interview_analysis = predictor.analyze_interview_process(extracted_text)
-            
+            # Remembered for the /detect call that usually follows
+            document = recent_documents.get(Document(extracted_text, cleaned=extracted_text))
             return jsonify({
                 'success': True,
-                'result': result,
-                'confidence_score': round(confidence_score, 1),
-                'icon': icon,
-                'pattern_matches': pattern_matches,
-                'word_count': len(extracted_text.split()),
-                'salary_analysis': salary_analysis,
-                'internship_quality_score': job_quality_score,
-                'interview_analysis': interview_analysis,
-                'source': 'Glassdoor'
+                'text': document.cleaned,
+                'word_count': document.word_count
             })
         else:
-            return jsonify({'error': 'Could not extract text from Glassdoor URL. Glassdoor may have blocked automated access.'}), 400
+            return jsonify({'error': 'Could not extract text from URL'}), 400
     
+    except RateLimitExceeded as e:
+        return rate_limited(e)
     except Exception as e:
-        return jsonify({'error': f'Glassdoor analysis failed: {str(e)}'}), 500
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/export_pdf', methods=['POST'])
 def export_pdf():
     try:
+        # reportlab takes ~150 ms to import, so only PDF exports pay for it
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        
         data = request.get_json()
         analysis_data = data.get('analysis_data', {})
         
@@ -591,205 +567,59 @@ def export_pdf():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Platform-specific scraping functions
-def extract_linkedin_job_content(url):
-    """Enhanced LinkedIn job content extraction"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # LinkedIn job posting selectors (may need updates as LinkedIn changes)
-        job_selectors = [
-            '.job-description',
-            '.show-more-less-html__markup',
-            '.job-description__content',
-            '[data-job-description]',
-            '.job-description__text',
-            '.description__text',
-            '.job-description-content'
-        ]
-        
-        job_text = ""
-        for selector in job_selectors:
-            elements = soup.select(selector)
-            if elements:
-                job_text = ' '.join([elem.get_text(strip=True) for elem in elements])
-                break
-        
-        # Fallback: try to find any text content
-        if not job_text:
-            # Remove navigation, footer, and other non-content elements
-            for element in soup(['nav', 'footer', 'header', 'script', 'style', 'aside']):
-                element.decompose()
-            
-            # Try to extract main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='main')
-            if main_content:
-                job_text = main_content.get_text(strip=True)
-            else:
-                job_text = soup.get_text(strip=True)
-        
-        # Clean and return text
-        if job_text:
-            return clean_extracted_text(job_text)
-        else:
-            return ""
-            
-    except Exception as e:
-        print(f"LinkedIn extraction error: {str(e)}")
-        return ""
+# Job boards with an /analyze_<name> route; adding one is a register_platform
+# call (their selectors live in scraping_utils.JOB_CONTENT_EXTRACTORS)
+register_platform('linkedin', 'LinkedIn', 'linkedin.com/jobs', job_content_extractor('linkedin'))
+register_platform('indeed', 'Indeed', 'indeed.com', job_content_extractor('indeed'))
+register_platform('glassdoor', 'Glassdoor', 'glassdoor.com', job_content_extractor('glassdoor'))
 
-def extract_indeed_job_content(url):
-    """Enhanced Indeed job content extraction"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Indeed job posting selectors
-        job_selectors = [
-            '#jobDescriptionText',
-            '.job-description',
-            '[data-testid="job-description"]',
-            '.jobsearch-jobDescriptionText',
-            '.job-description-container'
-        ]
-        
-        job_text = ""
-        for selector in job_selectors:
-            elements = soup.select(selector)
-            if elements:
-                job_text = ' '.join([elem.get_text(strip=True) for elem in elements])
-                break
-        
-        # Fallback: try to find any text content
-        if not job_text:
-            # Remove navigation, footer, and other non-content elements
-            for element in soup(['nav', 'footer', 'header', 'script', 'style', 'aside']):
-                element.decompose()
+def platform_route(platform):
+    """The /analyze_<name> view for a registered platform"""
+    def analyze_platform():
+        try:
+            data = request.get_json()
+            url = data.get(f'{platform.name}_url', '')
             
-            # Try to extract main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='main')
-            if main_content:
-                job_text = main_content.get_text(strip=True)
-            else:
-                job_text = soup.get_text(strip=True)
-        
-        # Clean and return text
-        if job_text:
-            return clean_extracted_text(job_text)
-        else:
-            return ""
+            if not url:
+                return jsonify({'error': f'No {platform.label} URL provided'}), 400
             
-    except Exception as e:
-        print(f"Indeed extraction error: {str(e)}")
-        return ""
-
-def extract_glassdoor_job_content(url):
-    """Enhanced Glassdoor job content extraction"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Glassdoor job posting selectors
-        job_selectors = [
-            '.jobDescriptionContent',
-            '.job-description',
-            '[data-testid="job-description"]',
-            '.desc',
-            '.job-description-content'
-        ]
-        
-        job_text = ""
-        for selector in job_selectors:
-            elements = soup.select(selector)
-            if elements:
-                job_text = ' '.join([elem.get_text(strip=True) for elem in elements])
-                break
-        
-        # Fallback: try to find any text content
-        if not job_text:
-            # Remove navigation, footer, and other non-content elements
-            for element in soup(['nav', 'footer', 'header', 'script', 'style', 'aside']):
-                element.decompose()
+            if platform.url_marker not in url:
+                return jsonify({'error': f'Please provide a valid {platform.label} job posting URL'}), 400
+            
+            response = pipeline.analyze_url(url, platform)
             
-            # Try to extract main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_='main')
-            if main_content:
-                job_text = main_content.get_text(strip=True)
+            if response is not None:
+                response.update({'success': True, 'source': platform.label})
+                return jsonify(response)
             else:
-                job_text = soup.get_text(strip=True)
+                return jsonify({'error': f'Could not extract text from {platform.label} URL. '
+                                         f'{platform.label} may have blocked automated access.'}), 400
         
-        # Clean and return text
-        if job_text:
-            return clean_extracted_text(job_text)
-        else:
-            return ""
-            
-    except Exception as e:
-        print(f"Glassdoor extraction error: {str(e)}")
-        return ""
-
-def clean_extracted_text(text):
-    """Clean extracted text from job postings"""
-    if not text:
-        return ""
-    
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    # Remove common job site elements
-    remove_patterns = [
-        r'cookie|privacy|terms|conditions',
-        r'sign in|sign up|login|register',
-        r'apply now|apply for this job',
-        r'share|save|bookmark',
-        r'related jobs|similar jobs',
-        r'company reviews|employee reviews',
-        r'salary estimates|salary information',
-        r'job alerts|email alerts',
-        r'feedback|report|flag'
-    ]
+        except RateLimitExceeded as e:
+            return rate_limited(e)
+        except Exception as e:
+            return jsonify({'error': f'{platform.label} analysis failed: {str(e)}'}), 500
     
-    for pattern in remove_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-    
-    # Clean up extra whitespace again
-    text = ' '.join(text.split())
-    
-    return text
+    return analyze_platform
+
+for platform in PLATFORMS.values():
+    app.add_url_rule(f'/analyze_{platform.name}', f'analyze_{platform.name}', platform_route(platform), methods=['POST'])
+
+def warm_up():
+    """
+    Load what requests would otherwise load on first use: the model, the
+    PDF library, the page parsers, Pillow and the Tesseract probe (a
+    subprocess; OCR workers inherit its result, GET /ocr_status?refresh=1
+    probes again). gunicorn.conf.py runs this in the master when
+    preloading so every worker shares it.
+    """
+    get_predictor()
+    import reportlab.platypus
+    from scraping_utils import extract_main_text_from_html
+    extract_main_text_from_html(b'<main>warm up</main>')
+    import ocr_preprocessing
+    print(get_ocr_status()[1])
 
 if __name__ == '__main__':
+    warm_up()
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
@@ -0,0 +1,113 @@
+import os
+import random
+import sys
+import tempfile
+import time
+from company_index import CompanyIndex
+
+CONSONANTS = 'bcdfghjklmnprstvwxz'
+VOWELS = 'aeiouy'
+# Real names reuse a few popular stems a lot
+POPULAR = ['tech', 'soft', 'data', 'net', 'cloud', 'micro', 'info', 'sys', 'smart', 'hire', 'job', 'career']
+WORDS = ['Solutions', 'Systems', 'Global', 'Digital', 'Consulting', 'Labs', 'Group', 'Partners',
+         'Technologies', 'Services', 'Academy', 'Ventures']
+SUFFIXES = ['Inc', 'Ltd', 'LLC', 'Pvt Ltd', 'Corp', '']
+
+def make_companies(count, rng):
+    """Synthetic reported companies with realistic-looking, partly overlapping names"""
+    companies = {}
+    while len(companies) < count:
+        stem = ''.join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+        if rng.random() < 0.3:
+            stem += rng.choice(POPULAR)
+        name = f"{stem.title()} {rng.choice(WORDS)} {rng.choice(SUFFIXES)}".strip()
+        key = f"{stem}{len(companies)}"
+        companies[key] = {
+            'name': name,
+            'website': f"{stem}-{rng.choice(WORDS).lower()}.com",
+            'fraud_score': rng.randint(0, 100)
+        }
+    return companies
+
+def typo(text, rng):
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice('aeioustrn') + text[i + 1:]
+
+def linear_search(companies, name):
+    """The old /search_company: exact key, else the first substring match"""
+    name = name.lower().strip()
+    if name in companies:
+        return name
+    for key, data in companies.items():
+        if name in key or name in data['name'].lower():
+            return key
+    return None
+
+def timed(func, queries):
+    """Per-query latencies in microseconds, sorted"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return sorted(timings)
+
+def main():
+    """
+    Company search over N synthetic companies (default 100000, or the first
+    command line argument): index build time and per-query latency for
+    exact, misspelled, prefix and unknown names, against the linear scan
+    the endpoint used to do, and the scan for companies a posting names.
+    Queries run on the memory-mapped file, as
+    the app serves them.
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(7)
+    companies = make_companies(count, rng)
+    names = [data['name'] for data in rng.sample(list(companies.values()), 200)]
+
+    print("Company Index Benchmark")
+    print("=" * 72)
+    start = time.perf_counter()
+    builder = CompanyIndex(companies)
+    builder.search('warm up')
+    print(f"{count} companies indexed in {time.perf_counter() - start:.2f} s")
+
+    path = os.path.join(tempfile.mkdtemp(), 'companies.store')
+    start = time.perf_counter()
+    builder.save(path)
+    print(f"Saved in {time.perf_counter() - start:.2f} s, {os.path.getsize(path) / 1e6:.1f} MB")
+    start = time.perf_counter()
+    index = CompanyIndex.open(path)
+    print(f"Opened (memory-mapped) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    queries = {
+        'exact': names,
+        'misspelled': [typo(name, rng) for name in names],
+        'prefix': [name[:6] for name in names],
+        'unknown': [f"Qwzx{i} Holdings" for i in range(200)]
+    }
+    expected = rng.sample(list(companies), 200)
+    found = sum(key in [match for match, _ in index.search(typo(companies[key]['name'], rng))] for key in expected)
+
+    print(f"{'Query':<12} {'p50 (us)':>10} {'p99 (us)':>10} {'linear p50 (us)':>16}")
+    for kind, batch in queries.items():
+        timings = timed(index.search, batch)
+        linear = timed(lambda query: linear_search(companies, query), batch[:20])
+        print(f"{kind:<12} {timings[len(timings) // 2]:>10.0f} {timings[int(len(timings) * 0.99)]:>10.0f} "
+              f"{linear[len(linear) // 2]:>16.0f}")
+    print("-" * 72)
+    print(f"Misspelled names found in the top 5: {found}/200")
+
+    # A long posting naming a few of the companies among lots of filler
+    filler = "We are hiring interns for our global digital solutions team with tech and data skills. " * 30
+    posting = filler + " ".join(f"Work with {name}." for name in names[:5]) + filler
+    timings = timed(index.mentions, [posting] * 50)
+    print(f"Companies named in a {len(posting.split())}-word posting: {timings[len(timings) // 2] / 1000:.2f} ms p50")
+    # Worst case for the name scan: nearly every word continues a name
+    listing = " ".join(names)
+    timings = timed(index.mentions, [listing] * 50)
+    print(f"Companies named in a {len(listing.split())}-word list of names: {timings[len(timings) // 2] / 1000:.2f} ms p50")
+
+if __name__ == "__main__":
+    main()
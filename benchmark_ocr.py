@@ -0,0 +1,71 @@
+import glob
+import os
+import sys
+import time
+from ocr_backend import start_ocr_worker, tesseract_api, tesserocr
+from ocr_pool import OCRPool
+from ocr_utils import check_tesseract_installation, ocr_image_bytes
+
+IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+def main():
+    """
+    OCR the sample screenshots inline (what a Flask thread would do) with
+    each available backend, and through the worker pool; extra image
+    files or directories can be passed on the command line
+    """
+    print("OCR Benchmark")
+    print("=" * 60)
+
+    installed, message = check_tesseract_installation()
+    if not installed:
+        print(f"Tesseract is not available, nothing to measure: {message}")
+        return
+
+    paths = sorted(glob.glob(os.path.join(IMAGES, '*.png')))
+    for arg in sys.argv[1:]:
+        paths += sorted(glob.glob(os.path.join(arg, '*'))) if os.path.isdir(arg) else [arg]
+    images = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            images.append((os.path.basename(path), f.read()))
+
+    backends = ['pytesseract'] + (['tesserocr'] if tesserocr is not None else [])
+    print(f"{'Image':<16} {'KB':>6}" + ''.join(f" {b + ' (s)':>16}" for b in backends) + f" {'words':>7}")
+    inline_totals = dict.fromkeys(backends, 0.0)
+    for name, data in images:
+        timings = []
+        for backend in backends:
+            os.environ['SNIFTERN_OCR_BACKEND'] = backend
+            if backend == 'tesserocr':
+                start_ocr_worker()  # model loading is a one-off, like in a pool worker
+            start = time.perf_counter()
+            text = ocr_image_bytes(data)
+            elapsed = time.perf_counter() - start
+            inline_totals[backend] += elapsed
+            timings.append(elapsed)
+        del os.environ['SNIFTERN_OCR_BACKEND']
+        print(f"{name:<16} {len(data) // 1024:>6}" + ''.join(f" {t:>16.2f}" for t in timings) +
+              f" {len(text.split()):>7}")
+
+    # Workers load their own engine; never fork one that is already running
+    tesseract_api.close()
+    workers = min(len(images), os.cpu_count() or 1)
+    pool = OCRPool(workers=workers, max_pending=len(images), initializer=start_ocr_worker)
+    try:
+        pool.extract(images[0][1])  # start the workers outside the measurement
+        start = time.perf_counter()
+        futures = [pool.submit(data) for _, data in images]
+        for future in futures:
+            future.result()
+        pool_total = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+
+    print("-" * 60)
+    for backend, total in inline_totals.items():
+        print(f"Inline, {backend + ':':<12} {len(images) / total:.2f} images/s")
+    print(f"Pool ({workers} workers): {len(images) / pool_total:.2f} images/s")
+
+if __name__ == "__main__":
+    main()
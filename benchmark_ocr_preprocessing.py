@@ -0,0 +1,93 @@
+import glob
+import os
+import re
+import sys
+import time
+import pytesseract
+from PIL import Image
+from ocr_preprocessing import get_ocr_settings, preprocess_image
+from ocr_utils import check_tesseract_installation
+
+IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+WORD = re.compile(r'^[A-Za-z][A-Za-z\'-]*[A-Za-z]$')
+
+def load_images(paths):
+    """The screenshots as they are plus 2x copies, the size of a 3000px+ phone screenshot"""
+    images = []
+    for path in paths:
+        name = os.path.basename(path)
+        with Image.open(path) as img:
+            img.load()
+        images.append((name, img))
+        images.append((f"{name} x2", img.resize((img.width * 2, img.height * 2), Image.LANCZOS)))
+    return images
+
+def text_yield(text):
+    """Words found and the share of them that look like real words rather than noise"""
+    words = text.split()
+    clean = sum(1 for word in words if WORD.match(word.strip('.,:;!?()"')))
+    return len(words), clean / len(words) if words else 0.0
+
+def run(img, settings, ocr):
+    start = time.perf_counter()
+    prepared, config = preprocess_image(img, settings)
+    prepared.load()
+    prepare_time = time.perf_counter() - start
+    ocr_time, text = 0.0, ''
+    if ocr:
+        start = time.perf_counter()
+        text = pytesseract.image_to_string(prepared, config=config)
+        ocr_time = time.perf_counter() - start
+    return prepared, prepare_time, ocr_time, text
+
+def main():
+    """
+    OCR time and text yield on the sample screenshots without preprocessing
+    and with the configured pipeline (SNIFTERN_OCR_* settings), plus
+    cropping. Extra image files or directories can be passed on the
+    command line.
+    """
+    print("OCR Preprocessing Benchmark")
+    print("=" * 90)
+
+    installed, message = check_tesseract_installation()
+    if not installed:
+        print(f"Tesseract is not available, only preprocessing is measured: {message}")
+
+    paths = sorted(glob.glob(os.path.join(IMAGES, '*.png')))
+    for arg in sys.argv[1:]:
+        paths += sorted(glob.glob(os.path.join(arg, '*'))) if os.path.isdir(arg) else [arg]
+
+    configured = get_ocr_settings()
+    variants = {
+        'raw': dict(configured, preprocess=False),
+        'preprocessed': dict(configured, preprocess=True),
+        'cropped': dict(configured, preprocess=True, binarize=True, crop=True)
+    }
+
+    print(f"{'Image':<12} {'variant':<13} {'pixels':>12} {'prep (ms)':>10} {'OCR (s)':>8} {'words':>6} {'clean':>6}")
+    totals = {variant: [0.0, 0.0, 0, 0.0] for variant in variants}
+    images = load_images(paths)
+    for name, img in images:
+        for variant, settings in variants.items():
+            prepared, prepare_time, ocr_time, text = run(img, settings, installed)
+            words, clean = text_yield(text)
+            total = totals[variant]
+            total[0] += prepare_time
+            total[1] += ocr_time
+            total[2] += words
+            total[3] += clean
+            pixels = f"{prepared.width}x{prepared.height}"
+            ocr = f"{ocr_time:>8.2f} {words:>6} {clean:>6.0%}" if installed else f"{'-':>8} {'-':>6} {'-':>6}"
+            print(f"{name:<12} {variant:<13} {pixels:>12} {prepare_time * 1000:>10.1f} {ocr}")
+
+    print("-" * 90)
+    for variant, (prepare_time, ocr_time, words, clean) in totals.items():
+        line = f"{variant:<13} preprocessing {prepare_time / len(images) * 1000:6.1f} ms/image"
+        if installed:
+            line += (f", OCR {ocr_time / len(images):5.2f} s/image, {words / len(images):.0f} words/image, "
+                     f"{clean / len(images):.0%} clean")
+        print(line)
+
+if __name__ == "__main__":
+    main()
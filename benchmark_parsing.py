@@ -0,0 +1,71 @@
+import glob
+import os
+import sys
+import time
+from html_extractor import LXML_INSTALLED
+from scraping_utils import extract_job_content_from_html
+from test_html_extractor import FIXTURES, PLATFORM_SELECTORS, legacy_extract_with_selectors
+
+def best_of(func, repeat=5):
+    """Fastest of `repeat` runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def extract_with(backend, html, platform):
+    os.environ['SNIFTERN_HTML_PARSER'] = backend
+    try:
+        return extract_job_content_from_html(html, platform)
+    finally:
+        del os.environ['SNIFTERN_HTML_PARSER']
+
+def main():
+    """
+    Platform extraction over saved job pages: BeautifulSoup + soup.select
+    vs the single-pass extractor on each parser backend.
+    Extra HTML files or directories can be passed on the command line
+    (their platform is taken from the file name, else 'generic').
+    """
+    print("HTML Extraction Benchmark")
+    print("=" * 72)
+
+    paths = sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    for arg in sys.argv[1:]:
+        paths += sorted(glob.glob(os.path.join(arg, '*.html'))) if os.path.isdir(arg) else [arg]
+
+    backends = ['html.parser'] + (['lxml'] if LXML_INSTALLED else [])
+    print(f"{'Page':<22} {'KB':>6} {'bs4 (ms)':>10}" + ''.join(f" {b + ' (ms)':>17}" for b in backends) + "  same text")
+
+    totals = dict.fromkeys(['bs4'] + backends, 0.0)
+    total_bytes = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            html = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        platform = name if name in PLATFORM_SELECTORS else 'generic'
+        selectors = PLATFORM_SELECTORS[platform]
+
+        expected = legacy_extract_with_selectors(html, selectors)
+        timings = {'bs4': best_of(lambda: legacy_extract_with_selectors(html, selectors))}
+        same = []
+        for backend in backends:
+            same.append(extract_with(backend, html, platform) == expected)
+            timings[backend] = best_of(lambda: extract_with(backend, html, platform))
+
+        total_bytes += len(html)
+        for key, value in timings.items():
+            totals[key] += value
+        print(f"{name:<22} {len(html) // 1024:>6} {timings['bs4'] * 1000:>10.1f}" +
+              ''.join(f" {timings[b] * 1000:>17.1f}" for b in backends) +
+              f"  {'yes' if all(same) else 'NO'}")
+
+    megabytes = total_bytes / 1e6
+    print("-" * 72)
+    for key, value in totals.items():
+        print(f"{key:<12} {megabytes / value:>8.1f} MB/s  ({totals['bs4'] / value:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import random
+import time
+import numpy as np
+from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+from preprocessing import preprocess_text
+
+def percentile_us(samples, percentile):
+    """Percentile of a list of second timings, in microseconds"""
+    return float(np.percentile(samples, percentile)) * 1e6
+
+def time_each(func, vectors):
+    """Time func on every single-row vector"""
+    samples = []
+    for vector in vectors:
+        start = time.perf_counter()
+        func(vector)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    """Single-document scoring latency: predict_proba + predict vs LinearScorer"""
+    print("Scoring Benchmark (single documents)")
+    print("=" * 60)
+
+    predictor = EnhancedFakeInternshipPredictor()
+    model, scorer = predictor.model, predictor.scorer
+    vocabulary = list(predictor.vectorizer.vocabulary)
+    rng = random.Random(0)
+
+    documents = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(20, 400))) for _ in range(2000)]
+    vectors = [predictor.vectorizer.transform([preprocess_text(doc)]) for doc in documents]
+
+    # The labels must be bit-for-bit identical, the probabilities too
+    for vector in vectors:
+        labels, probas = scorer.score(vector)
+        assert np.array_equal(labels, model.predict(vector))
+        assert np.array_equal(probas, model.predict_proba(vector))
+
+    def legacy(vector):
+        model.predict_proba(vector)[0]
+        model.predict(vector)[0]
+
+    runs = {
+        'predict_proba + predict': time_each(legacy, vectors),
+        'LinearScorer.score': time_each(scorer.score, vectors)
+    }
+
+    print(f"{'Scoring path':<26} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for name, samples in runs.items():
+        print(f"{name:<26} {percentile_us(samples, 50):>10.1f} {percentile_us(samples, 99):>10.1f}")
+
+if __name__ == "__main__":
+    main()
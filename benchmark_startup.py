@@ -0,0 +1,104 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+WORKERS = 3
+
+# A worker that serves a few analyses, then reports its pid and waits to be measured
+SERVE = """
+import os, signal, sys
+import app
+app.analyze_texts(["Paid software internship, Python required. Interview process: coding test.",
+                   "Virtual internship! Pay $50 for the certificate, no experience required."])
+os.write(1, f"{os.getpid()}\\n".encode())  # one write: workers share the pipe
+signal.pause()
+"""
+
+# gunicorn without preload_app: every worker imports the app and loads the model itself
+SEPARATE = "import app\napp.warm_up()\n" + SERVE
+
+# gunicorn.conf.py with preload_app: the master loads everything, freezes the GC and forks
+PRELOADED = """
+import gc, os, signal, sys
+gc.disable()
+import app
+app.warm_up()
+gc.freeze()
+gc.enable()
+sys.stdout.flush()
+for _ in range({workers}):
+    if os.fork() == 0:
+        exec(compile({serve!r}, 'worker', 'exec'))
+signal.pause()
+"""
+
+def memory_mb(pid):
+    """Rss, Pss and private (USS) memory of a process in MB, from /proc/<pid>/smaps_rollup"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+def start(code, count):
+    """Run `code` and collect the pids of the `count` workers it reports"""
+    process = subprocess.Popen([sys.executable, '-W', 'ignore', '-c', code], stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, start_new_session=True)
+    pids = []
+    for line in process.stdout:
+        if line.strip().isdigit():
+            pids.append(int(line))
+            if len(pids) == count:
+                break
+    return process, pids
+
+def measure(name, runs):
+    """Memory of every worker once all have served their requests"""
+    processes, pids = [], []
+    for code, count in runs:
+        process, worker_pids = start(code, count)
+        processes.append(process)
+        pids += worker_pids
+    try:
+        rows = [memory_mb(pid) for pid in pids]
+    finally:
+        for process in processes:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+    rss, pss, private = (sum(column) / len(rows) for column in zip(*rows))
+    print(f"{name:<30} {rss:>9.1f} {pss:>9.1f} {private:>9.1f}")
+
+def best_time(code, repeat=5):
+    """Best wall time of running `code` in a fresh interpreter, in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, '-W', 'ignore', '-c', code], check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start_time)
+    return best * 1000
+
+def main():
+    """
+    Cold start of app.py (import, then the model on first use) and the
+    memory of each of WORKERS gunicorn-style workers, loading the model
+    separately or preloaded in a master and forked (gunicorn.conf.py)
+    """
+    print("Startup Benchmark")
+    print("=" * 60)
+
+    print(f"{'Fresh interpreter':<30} {'time (ms)':>9}")
+    print(f"{'python -c pass':<30} {best_time('pass'):>9.0f}")
+    print(f"{'import app':<30} {best_time('import app'):>9.0f}")
+    print(f"{'import app + load model':<30} {best_time('import app; app.get_predictor()'):>9.0f}")
+    print(f"{'import app + warm_up()':<30} {best_time('import app; app.warm_up()'):>9.0f}")
+
+    print(f"\n{'Per worker (MB)':<30} {'RSS':>9} {'PSS':>9} {'private':>9}")
+    measure(f"{WORKERS} separate workers", [(SEPARATE, 1)] * WORKERS)
+    measure(f"{WORKERS} preloaded + forked", [(PRELOADED.format(workers=WORKERS, serve=SERVE), WORKERS)])
+
+if __name__ == "__main__":
+    main()
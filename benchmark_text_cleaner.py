@@ -0,0 +1,39 @@
+import time
+from text_cleaner import clean_job_text, clean_text
+from test_text_cleaner import legacy_clean_job_text, legacy_clean_text, load_pages
+
+def throughput(func, texts, repeat=20):
+    """Best-of throughput in MB/s over all texts"""
+    size = sum(len(text.encode('utf-8')) for text in texts)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return size / best / 1e6
+
+def main():
+    """
+    Cleaning the visible text of the saved job pages: the nine re.sub
+    passes of app.clean_extracted_text and the regex passes of
+    preprocessing.clean_extracted_text, against the single-pass TextCleaner
+    """
+    print("Text Cleaner Benchmark")
+    print("=" * 60)
+
+    pages = load_pages()
+    for page in pages:
+        assert clean_job_text(page) == legacy_clean_job_text(page)
+        assert clean_text(page) == legacy_clean_text(page)
+    print(f"{len(pages)} pages, {sum(len(page) for page in pages) // len(pages)} characters on average")
+
+    print(f"{'Cleaner':<22} {'before (MB/s)':>14} {'after (MB/s)':>13} {'speedup':>9}")
+    for name, legacy, cleaner in [('job text', legacy_clean_job_text, clean_job_text),
+                                  ('whitespace only', legacy_clean_text, clean_text)]:
+        before = throughput(legacy, pages)
+        after = throughput(cleaner, pages)
+        print(f"{name:<22} {before:>14.1f} {after:>13.1f} {after / before:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
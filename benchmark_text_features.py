@@ -0,0 +1,41 @@
+import time
+from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+from test_text_features import analyses, legacy_analyses, load_corpus
+
+def best_of(func, texts, repeat=20):
+    """Best-of timing in microseconds per text"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+def main():
+    """
+    The salary, description quality and interview analyses on the test
+    corpus (sample postings and saved job pages): each lowercasing and
+    scanning the text itself, as before, against one shared TextFeatures pass
+    """
+    print("Text Features Benchmark")
+    print("=" * 60)
+
+    predictor = EnhancedFakeInternshipPredictor()
+    texts = load_corpus()
+    for text in texts:
+        assert analyses(predictor, text) == legacy_analyses(text)
+
+    print(f"{'Texts':<22} {'before (us)':>12} {'after (us)':>11} {'speedup':>9}")
+    groups = {
+        'short postings': [text for text in texts if len(text) < 1000],
+        'job pages': [text for text in texts if len(text) >= 1000]
+    }
+    for name, group in groups.items():
+        legacy_us = best_of(legacy_analyses, group)
+        features_us = best_of(lambda text: analyses(predictor, text), group)
+        average = sum(len(text) for text in group) // len(group)
+        print(f"{name + f' (~{average} B)':<22} {legacy_us:>12.1f} {features_us:>11.1f} {legacy_us / features_us:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import random
+import time
+import joblib
+from document import Document
+from fast_vectorizer import FastVectorizer, check_export
+from test_fast_vectorizer import load_vectorizer, vocabulary_texts
+from test_text_features import load_corpus
+
+def best_ms(func, repeat=20):
+    """Best-of wall time of func() in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    """
+    Loading and running the pickled TfidfVectorizer against the exported
+    FastVectorizer (model/fast_vectorizer.npz), on the test corpus and
+    random postings made of vocabulary terms
+    """
+    print("Vectorizer Benchmark")
+    print("=" * 60)
+
+    vectorizer = load_vectorizer()
+    path = os.path.join('model', 'fast_vectorizer.npz')
+    fast = FastVectorizer.load(path)
+
+    documents = [Document(text) for text in load_corpus() + vocabulary_texts(vectorizer, random.Random(0), 2000)]
+    texts = [document.processed for document in documents]
+    check_export(fast, vectorizer, texts)
+
+    print(f"{'Load':<34} {'time (ms)':>10}")
+    print(f"{'joblib tfidf_vectorizer.pkl':<34} {best_ms(lambda: joblib.load(os.path.join('model', 'tfidf_vectorizer.pkl'))):>10.2f}")
+    print(f"{'FastVectorizer.load':<34} {best_ms(lambda: FastVectorizer.load(path)):>10.2f}")
+
+    print(f"\n{'Transform':<34} {'per text (us)':>14}")
+    runs = {
+        'sklearn, one text per call': lambda: [vectorizer.transform([text]) for text in texts],
+        'fast, one text per call': lambda: [fast.transform([text]) for text in texts],
+        'sklearn, one batch': lambda: vectorizer.transform(texts),
+        'fast, one batch': lambda: fast.transform(texts),
+        'fast, one batch of Documents': lambda: fast.transform_documents(documents)
+    }
+    for name, run in runs.items():
+        print(f"{name:<34} {best_ms(run, repeat=5) / len(texts) * 1000:>14.1f}")
+
+if __name__ == "__main__":
+    main()
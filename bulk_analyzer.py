@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import queue
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+from scraping_client import get_client
+from page_reader import read_page
+from scraping_utils import (
+    fetch_and_extract,
+    fetch_page,
+    get_platform_from_url,
+    is_valid_url,
+    job_content_extractor,
+    store_page
+)
+
+def download(url, platform, extractor_name, timeout=25, client=None):
+    """
+    For parsing in another process: returns (cached text, None, None) or
+    (None, response, html) with the page body read up to the download
+    budget, since a response cannot be streamed across processes
+    """
+    text, response = fetch_page(url, platform, extractor_name, timeout=timeout, client=client)
+    if response is None:
+        return text, None, None
+    return None, response, read_page(response)
+
+# Executors shared by every bulk run in this process, by (kind, workers)
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Worker threads do not survive a fork (gunicorn workers): start afresh
+os.register_at_fork(after_in_child=_pools.clear)
+
+def get_pool(kind, workers):
+    """
+    Process-wide executor for 'fetch' or 'score' (threads) or 'parse'
+    (processes) with `workers` workers, created on first use. Concurrent
+    runs queue on the same workers instead of each starting its own.
+    """
+    with _pools_lock:
+        pool = _pools.get((kind, workers))
+        if pool is None:
+            executor = ProcessPoolExecutor if kind == 'parse' else ThreadPoolExecutor
+            pool = _pools[(kind, workers)] = executor(workers)
+        return pool
+
+class BulkAnalyzer:
+    def __init__(self, analyze, client=None, concurrency=16, per_host=2,
+                 parse_workers=4, parse_processes=False, batch_size=32,
+                 batch_wait=0.05, timeout=25):
+        """
+        Asyncio engine that fetches many posting URLs at once.
+        Fetches are bounded overall (`concurrency`) and per host (`per_host`)
+        and run on the pooled, rate-limited scraping client in a thread
+        pool. Each page is parsed by the platform's extractor while it
+        streams in, stopping the download early where the extractor
+        allows, so parsing overlaps the other downloads. With
+        `parse_processes` pages are read whole (up to the download budget)
+        and parsed in a pool of `parse_workers` processes instead.
+        Extracted texts are handed to `analyze(texts) -> [result, ...]` in
+        batches of up to `batch_size`, waiting at most `batch_wait` seconds
+        to fill a batch. The pools are shared by all runs in the process
+        (get_pool), so `concurrency` also caps the fetch threads of
+        concurrent runs with the same settings.
+        """
+        self.analyze = analyze
+        self.client = client or get_client()
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.parse_workers = parse_workers
+        self.parse_processes = parse_processes
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.timeout = timeout
+
+    async def run(self, urls):
+        """Yield one result dict per URL, in completion order (each carries its index)"""
+        loop = asyncio.get_running_loop()
+        results = asyncio.Queue()
+        to_score = asyncio.Queue()
+        overall = asyncio.Semaphore(self.concurrency)
+        per_host = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+
+        fetch_pool = get_pool('fetch', self.concurrency)
+        parse_pool = get_pool('parse', self.parse_workers) if self.parse_processes else None
+        score_pool = get_pool('score', 1)
+
+        async def process(index, url):
+            """Fetch and extract one URL, then queue its text for scoring"""
+            if not is_valid_url(url):
+                await results.put({'index': index, 'url': url, 'error': 'Invalid URL format'})
+                return
+
+            platform = get_platform_from_url(url)
+            extractor = job_content_extractor(platform)
+            try:
+                # Take the host slot first so one busy host cannot hog the overall slots
+                async with per_host[urlsplit(url).netloc.lower()], overall:
+                    if parse_pool is None:
+                        text = await loop.run_in_executor(fetch_pool, functools.partial(
+                            fetch_and_extract, url, platform, extractor,
+                            timeout=self.timeout,
+                            client=self.client
+                        ))
+                    else:
+                        text, response, html = await loop.run_in_executor(fetch_pool, functools.partial(
+                            download, url, platform, extractor.name,
+                            timeout=self.timeout,
+                            client=self.client
+                        ))
+                # Cached (or 304 Not Modified) pages skip the parse entirely
+                if parse_pool is not None and response is not None:
+                    text = await loop.run_in_executor(parse_pool, extractor, html)
+                    await loop.run_in_executor(fetch_pool, store_page, url, extractor.name, response, text)
+            except Exception as e:
+                await results.put({'index': index, 'url': url, 'platform': platform, 'error': str(e)})
+                return
+
+            if not text:
+                await results.put({'index': index, 'url': url, 'platform': platform,
+                                   'error': 'Could not extract text from URL'})
+                return
+
+            await to_score.put((index, url, platform, text))
+
+        async def score():
+            """Score extracted texts in batches while fetching continues"""
+            finished = False
+            while not finished:
+                item = await to_score.get()
+                if item is None:
+                    break
+
+                batch = [item]
+                deadline = loop.time() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    try:
+                        item = await asyncio.wait_for(to_score.get(), max(0, deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                # Every URL of the batch gets a result, even when analyze()
+                # fails or returns too few: run() waits for one per URL
+                try:
+                    responses = await loop.run_in_executor(score_pool, self.analyze, [b[3] for b in batch])
+                    if len(responses) != len(batch):
+                        raise ValueError(f"analyze returned {len(responses)} results for {len(batch)} texts")
+                    responses = [dict(response, index=index, url=url, platform=platform)
+                                 for (index, url, platform, _), response in zip(batch, responses)]
+                except Exception as e:
+                    responses = [{'index': index, 'url': url, 'platform': platform, 'error': str(e)}
+                                 for index, url, platform, _ in batch]
+
+                for response in responses:
+                    await results.put(response)
+
+        async def fetch_all():
+            await asyncio.gather(*(process(index, url) for index, url in enumerate(urls)))
+            await to_score.put(None)
+
+        fetcher = asyncio.create_task(fetch_all())
+        scorer = asyncio.create_task(score())
+
+        try:
+            for _ in range(len(urls)):
+                yield await results.get()
+            await fetcher
+            await scorer
+        finally:
+            # Also reached when the consumer stops early (aclose()): drop the
+            # queued work instead of finishing it for nobody. Cancelling the
+            # tasks cancels their calls still waiting in the shared pools.
+            fetcher.cancel()
+            scorer.cancel()
+
+_DONE = object()
+
+def iter_analyze_urls(urls, analyze, **options):
+    """
+    Synchronous wrapper for Flask and the CLI: runs the engine on its own
+    event loop in a background thread and yields results as they arrive.
+    Closing this generator early (a streaming client disconnecting)
+    cancels the engine.
+    """
+    results = queue.Queue()
+    started = threading.Event()
+    engine = {}
+
+    async def collect():
+        engine['loop'], engine['task'] = asyncio.get_running_loop(), asyncio.current_task()
+        started.set()
+        async with contextlib.aclosing(BulkAnalyzer(analyze, **options).run(urls)) as stream:
+            async for result in stream:
+                results.put(result)
+
+    def runner():
+        try:
+            asyncio.run(collect())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            results.put({'error': f'Bulk analysis failed: {str(e)}'})
+        finally:
+            started.set()
+            results.put(_DONE)
+
+    threading.Thread(target=runner, daemon=True).start()
+
+    finished = False
+    try:
+        while True:
+            result = results.get()
+            if result is _DONE:
+                finished = True
+                break
+            yield result
+    finally:
+        if not finished:
+            started.wait()
+            try:
+                engine['loop'].call_soon_threadsafe(engine['task'].cancel)
+            except (KeyError, RuntimeError):
+                pass  # the engine never started or has already stopped
+
+def main():
+    """Analyze a list of posting URLs and stream the results as JSON lines"""
+    parser = argparse.ArgumentParser(description="Bulk-analyze job posting URLs")
+    parser.add_argument('url_file', help="File with one URL per line ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file (default: stdout)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Fetches in flight overall")
+    parser.add_argument('--per-host', type=int, default=2, help="Fetches in flight per host")
+    parser.add_argument('--parse-workers', type=int, default=4, help="HTML parsing processes (with --parse-processes)")
+    parser.add_argument('--parse-processes', action='store_true',
+                        help="Read pages whole and parse them in processes instead of while they stream in")
+    parser.add_argument('--batch-size', type=int, default=32, help="Texts per scoring batch")
+    args = parser.parse_args()
+
+    url_file = sys.stdin if args.url_file == '-' else open(args.url_file)
+    with url_file:
+        urls = [line.strip() for line in url_file if line.strip() and not line.startswith('#')]
+
+    # Same analysis (and result cache) as the web app; keep its startup
+    # messages out of the JSONL stream
+    with contextlib.redirect_stdout(sys.stderr):
+        from app import analyze_texts
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    with output:
+        for result in iter_analyze_urls(
+            urls, analyze_texts,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            parse_workers=args.parse_workers,
+            parse_processes=args.parse_processes,
+            batch_size=args.batch_size
+        ):
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            output.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+import numpy as np
+from company_matcher import MIN_WORD_NAME, build_phrase_trie, domain_mentions, scan_words
+
+# Legal forms that do not tell companies apart: "FakeCorp Inc." == "fakecorp"
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'ltd', 'limited', 'llc', 'llp', 'corp', 'corporation', 'co',
+    'company', 'plc', 'gmbh', 'ag', 'sa', 'pvt', 'private', 'pte', 'pty', 'bv', 'nv'
+}
+
+WORD = re.compile(r'[^\W_]+')
+DOMAIN = re.compile(r'^(?:[a-z]+://)?(?:[\w-]+\.)+[a-z]{2,}(?:[:/]\S*)?$', re.I)
+
+# Trigrams in more than this share of names ("sol", "tec", ...) only add
+# to the score of candidates found through rarer ones
+COMMON_GRAM_SHARE = 0.005
+
+# Candidates sharing the most rare trigrams with a query that get scored
+CANDIDATE_LIMIT = 512
+
+# Aliases are indexed by their first 64 bytes (UTF-8), so the sorted
+# tables have a fixed, small row width
+MAX_ALIAS_BYTES = 64
+
+# Bumped whenever the arrays a file must hold change (2: the name words
+# and trie for mentions()); older files are rebuilt, not half read
+FILE_FORMAT = 2
+FILE_MAGIC = b'SNIFTERN-COMPANY-INDEX %d\n' % FILE_FORMAT
+ALIGNMENT = 64
+
+class OutdatedIndexError(ValueError):
+    """A company index file written in an older format, which has to be rebuilt"""
+
+def name_words(text):
+    """Lowercase words without accents or punctuation, '&' read as 'and'"""
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return WORD.findall(text.lower().replace('&', ' and '))
+
+def normalize_company_name(name):
+    """
+    Lowercase words without accents, punctuation or trailing legal forms,
+    e.g. 'Acme Café, Inc.' -> 'acme cafe'
+    """
+    words = name_words(name)
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def website_name(website):
+    """The name part of a website, e.g. 'https://www.fakecorp-scam.com/jobs' -> 'fakecorp scam'"""
+    host = re.sub(r'^[a-z]+://', '', website.strip().lower()).split('/')[0].split(':')[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    labels = host.split('.')
+    return normalize_company_name(' '.join(labels[:-1] if len(labels) > 1 else labels))
+
+def company_key(name):
+    """Spaces dropped too, so 'Scam Tech' and 'ScamTech' share a key"""
+    return normalize_company_name(name).replace(' ', '')
+
+def query_key(text):
+    """Key for a user's query, which may be a name or a website"""
+    text = text.strip()
+    if DOMAIN.match(text):
+        return website_name(text).replace(' ', '')
+    return company_key(text)
+
+def alias_bytes(alias):
+    """UTF-8 form of an alias as stored, cut at a character boundary"""
+    return alias.encode('utf-8')[:MAX_ALIAS_BYTES].decode('utf-8', 'ignore').encode('utf-8')
+
+def trigrams(key):
+    padded = f'${key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def company_aliases(key, data):
+    """The names a company is found under: its key, its name and its website"""
+    names = {company_key(key), company_key(data.get('name', ''))}
+    if data.get('website'):
+        names.add(website_name(data['website']).replace(' ', ''))
+    names.discard('')
+    return names
+
+def company_phrases(key, data):
+    """The word sequences that name a company in running text"""
+    phrases = {(company_key(key),), tuple(normalize_company_name(data.get('name', '')).split())}
+    if data.get('website'):
+        phrases.add(tuple(website_name(data['website']).split()))
+    return {phrase for phrase in phrases
+            if phrase and phrase != ('',) and (len(phrase) > 1 or len(phrase[0]) >= MIN_WORD_NAME)}
+
+def sorted_table(strings):
+    """Fixed-width bytes array, searchable with np.searchsorted"""
+    return np.array(strings, dtype=f'S{max((len(s) for s in strings), default=1) or 1}')
+
+def table_range(table, low, high=None):
+    """Row range of the sorted `table` holding values in [low, high), or equal to `low`"""
+    if high is None:
+        return int(np.searchsorted(table, low, 'left')), int(np.searchsorted(table, low, 'right'))
+    return int(np.searchsorted(table, low, 'left')), int(np.searchsorted(table, high, 'left'))
+
+def table_rows(table, values):
+    """Rows of the sorted `table` holding each of `values` that it has"""
+    values = [value for value in values if len(value) <= table.itemsize]
+    if not len(table) or not values:
+        return np.zeros(0, dtype=np.int64)
+    values = np.array(values, dtype=table.dtype)
+    rows = np.minimum(np.searchsorted(table, values), len(table) - 1)
+    return rows[table[rows] == values]
+
+def table_ids(table, values):
+    """Row of each of `values` in the sorted `table`, -1 where it has none"""
+    if not len(table) or not values:
+        return np.full(len(values), -1, dtype=np.int64)
+    fits = np.array([len(value) <= table.itemsize for value in values])
+    encoded = np.array(values, dtype=table.dtype)
+    rows = np.minimum(np.searchsorted(table, encoded), len(table) - 1)
+    return np.where(fits & (table[rows] == encoded), rows, -1)
+
+class CompanyIndex:
+    def __init__(self, companies=None, min_score=0.3):
+        """
+        Company lookup: exact matches on normalized names, a sorted table
+        for prefix (autocomplete) matches and a trigram inverted index for
+        ranked fuzzy matches. Every company is indexed under its key, its
+        display name and its website's name.
+        `companies` maps a key to the company record (a dict with 'name'
+        and optionally 'website'). The search structures are flat numpy
+        arrays, built on first search; save() writes them to a file that
+        CompanyIndex.open() memory-maps, so processes opening the same
+        file share one copy through the OS page cache.
+        """
+        self.min_score = min_score
+        self.companies = {}
+        self.metadata = {}
+        self._arrays = None
+        self._lock = threading.Lock()
+
+        for key, data in (companies or {}).items():
+            self.add(key, data)
+
+    @classmethod
+    def open(cls, path, min_score=0.3, any_format=False):
+        """
+        Read-only index over a file written by save(), memory-mapped.
+        Files in an older format raise OutdatedIndexError unless
+        `any_format` is set, which opens them for their records only,
+        e.g. to rebuild them.
+        """
+        with open(path, 'rb') as f:
+            magic = f.readline()
+            if magic != FILE_MAGIC:
+                prefix, _, version = magic.rstrip(b'\n').rpartition(b' ')
+                if prefix != FILE_MAGIC.rsplit(b' ', 1)[0] or not version.isdigit():
+                    raise ValueError(f"{path} is not a company index file")
+                if not any_format:
+                    raise OutdatedIndexError(f"{path} is in company index format {int(version)}, "
+                                             f"not {FILE_FORMAT}, and has to be rebuilt")
+            header = json.loads(f.readline())
+
+        arrays = {}
+        for name, (dtype, shape, offset) in header['arrays'].items():
+            if shape[0]:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=header['data_offset'] + offset, shape=tuple(shape))
+            else:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+
+        index = cls(min_score=min_score)
+        index.companies = None
+        index.metadata = header.get('metadata', {})
+        index._arrays = arrays
+        return index
+
+    def __len__(self):
+        return len(self.companies) if self.companies is not None else len(self._arrays['keys'])
+
+    def add(self, key, data):
+        """Index (or replace) a company record; the arrays are rebuilt on the next search"""
+        if self.companies is None:
+            raise TypeError("Memory-mapped company indexes are read-only")
+        self.companies[key] = data
+        self._arrays = None
+
+    def keys(self):
+        if self.companies is not None:
+            return list(self.companies)
+        return [key.decode('utf-8') for key in self._arrays['keys'].tolist()]
+
+    def items(self):
+        """(key, record) pairs, e.g. to merge a feed into a saved index"""
+        return [(key, self.record(key)) for key in self.keys()]
+
+    def record(self, key):
+        """The record stored under `key`, or None"""
+        if self.companies is not None:
+            return self.companies.get(key)
+        arrays = self._arrays
+        rows = table_rows(arrays['keys'], [key.encode('utf-8')])
+        if not len(rows):
+            return None
+        start, end = arrays['record_offsets'][rows[0]:rows[0] + 2]
+        return json.loads(arrays['records'][start:end].tobytes())
+
+    def _build(self):
+        """
+        The search arrays: sorted company keys; sorted aliases with their
+        owner, length and trigram ids (flattened, with offsets); sorted
+        trigrams with their posting lists (alias rows, flattened); the
+        words of company names and a trie of the names over them for mentions()
+        """
+        keys = sorted(self.companies)
+        owners = {key: row for row, key in enumerate(keys)}
+        aliases = sorted({(alias_bytes(alias), owners[key])
+                          for key in keys for alias in company_aliases(key, self.companies[key])})
+
+        alias_grams = [trigrams(alias.decode('utf-8')) for alias, _ in aliases]
+        gram_table = sorted_table(sorted({gram.encode('utf-8') for grams in alias_grams for gram in grams}))
+        gram_rows = {gram.decode('utf-8'): row for row, gram in enumerate(gram_table.tolist())}
+
+        grams = np.fromiter((gram_rows[gram] for row_grams in alias_grams for gram in row_grams), dtype=np.int32)
+        counts = np.array([len(row_grams) for row_grams in alias_grams], dtype=np.int64)
+        alias_rows = np.repeat(np.arange(len(aliases), dtype=np.int32), counts)
+        # Invert alias -> trigrams into trigram -> aliases (stable, so each list stays sorted)
+        by_gram = np.argsort(grams, kind='stable')
+
+        phrases = [(key, phrase) for key in keys for phrase in company_phrases(key, self.companies[key])]
+        vocabulary = sorted_table(sorted({word.encode('utf-8') for _, phrase in phrases for word in phrase}))
+        word_rows = {word.decode('utf-8'): row for row, word in enumerate(vocabulary.tolist())}
+
+        return {
+            'keys': sorted_table([key.encode('utf-8') for key in keys]),
+            'aliases': sorted_table([alias for alias, _ in aliases]),
+            'alias_owners': np.array([owner for _, owner in aliases], dtype=np.int32),
+            'alias_lengths': np.array([len(alias.decode('utf-8')) for alias, _ in aliases], dtype=np.float32),
+            'alias_gram_offsets': np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            'alias_grams': grams,
+            'grams': gram_table,
+            'posting_offsets': np.concatenate(([0], np.cumsum(np.bincount(grams, minlength=len(gram_table))))).astype(np.int64),
+            'postings': alias_rows[by_gram],
+            'words': vocabulary,
+            **build_phrase_trie([([word_rows[word] for word in phrase], owners[key]) for key, phrase in phrases],
+                              vocabulary)
+        }
+
+    def _freeze(self):
+        with self._lock:
+            if self._arrays is None:
+                self._arrays = self._build()
+            return self._arrays
+
+    def save(self, path, metadata=None):
+        """
+        Write the index and its records to `path` for CompanyIndex.open(),
+        with `metadata` (JSON) in the header, read back as index.metadata.
+        The file is replaced atomically, so processes that have the old
+        one open keep reading a consistent copy.
+        """
+        arrays = dict(self._freeze())
+        records = [json.dumps(self.record(key.decode('utf-8')), ensure_ascii=False).encode('utf-8')
+                   for key in arrays['keys'].tolist()]
+        arrays['records'] = np.frombuffer(b''.join(records), dtype=np.uint8)
+        arrays['record_offsets'] = np.concatenate(([0], np.cumsum([len(r) for r in records]))).astype(np.int64)
+
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, list(array.shape), offset]
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header = {'arrays': layout, 'metadata': metadata or {}, 'data_offset': 0}
+        data_offset = -(-(len(FILE_MAGIC) + len(json.dumps(header)) + 64) // ALIGNMENT) * ALIGNMENT
+        header = json.dumps(dict(header, data_offset=data_offset)).encode('utf-8')
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.companies-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(FILE_MAGIC + header + b'\n')
+                for name, array in arrays.items():
+                    f.seek(data_offset + layout[name][2])
+                    f.write(np.ascontiguousarray(array).tobytes())
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def lookup(self, name):
+        """The key of the company whose normalized name, key or website matches `name` exactly, or None"""
+        key = alias_bytes(query_key(name))
+        arrays = self._freeze()
+        start, end = table_range(arrays['aliases'], key)
+        if start == end:
+            return None
+        return arrays['keys'][arrays['alias_owners'][start]].decode('utf-8')
+
+    def get(self, name):
+        """The record whose normalized name, key or website matches `name` exactly, or None"""
+        key = self.lookup(name)
+        return None if key is None else self.record(key)
+
+    def mentions(self, text):
+        """
+        Keys of the companies a text names, in order of first mention: by
+        name, in one scan over its words, or by website (including email
+        addresses)
+        """
+        arrays = self._freeze()
+        words = [word.encode('utf-8') for word in name_words(text)]
+        owners = scan_words(arrays, table_ids(arrays['words'], words))
+        keys = [arrays['keys'][owner].decode('utf-8') for owner in dict.fromkeys(owners)]
+        keys += [self.lookup(domain) for domain in domain_mentions(text)]
+        return [key for key in dict.fromkeys(keys) if key is not None]
+
+    def search(self, query, k=5, min_score=None):
+        """
+        Up to `k` (key, score) pairs, best first. Score is 1.0 for an exact
+        match; otherwise the better of the trigram similarity (Dice) and,
+        for queries that start a name, the share of the name typed so far.
+        A query that looks like a website is matched by its name part.
+        """
+        key = query_key(query)
+        if not key or k <= 0:
+            return []
+        min_score = self.min_score if min_score is None else min_score
+        arrays = self._freeze()
+        encoded = alias_bytes(key)
+        spare = 4 * k  # several aliases can belong to one company
+        scores = {}
+
+        if len(key) >= 2:
+            # Names starting with the query (exact matches first in the
+            # range), shortest, i.e. most completely typed, first
+            start, end = table_range(arrays['aliases'], encoded, encoded + b'\xff')
+            lengths = arrays['alias_lengths'][start:end]
+            if len(lengths) > spare:
+                shortest = np.argpartition(lengths, spare)[:spare]
+            else:
+                shortest = np.arange(len(lengths))
+            for row, length in zip((start + shortest).tolist(), lengths[shortest].tolist()):
+                scores[row] = 1.0 if arrays['aliases'][row] == encoded else len(key) / length
+        else:
+            start, end = table_range(arrays['aliases'], encoded)
+            scores.update(dict.fromkeys(range(start, end), 1.0))
+
+        for row, score in self._fuzzy_matches(key, arrays, min_score, spare):
+            if score > scores.get(row, 0.0):
+                scores[row] = score
+
+        best = {}
+        for row, score in scores.items():
+            if score < min_score:
+                continue
+            owner = int(arrays['alias_owners'][row])
+            if score > best.get(owner, 0.0):
+                best[owner] = score
+        ranked = sorted(((arrays['keys'][owner].decode('utf-8'), score) for owner, score in best.items()),
+                        key=lambda item: (-item[1], item[0]))
+        return [(owner, round(score, 3)) for owner, score in ranked[:k]]
+
+    def _fuzzy_matches(self, key, arrays, min_score, limit):
+        """
+        Up to `limit` (alias row, Dice similarity) pairs above `min_score`.
+        Candidates are the aliases sharing the most of the query's rarer
+        trigrams (the rarest one if it has none); their overlap with the
+        whole query is then counted over their own trigrams, so the long
+        posting lists of common trigrams are never read.
+        """
+        grams = trigrams(key)
+        known = table_rows(arrays['grams'], [gram.encode('utf-8') for gram in grams])
+        if not len(known):
+            return []
+
+        offsets = arrays['posting_offsets']
+        lists = sorted((arrays['postings'][offsets[row]:offsets[row + 1]] for row in known.tolist()), key=len)
+        common = max(50, int(len(arrays['aliases']) * COMMON_GRAM_SHARE))
+        rare = [ids for ids in lists if len(ids) <= common] or lists[:1]
+        # Count how many rare lists each alias is in (np.unique is far slower
+        # than sorting on arrays this small) and score the best candidates
+        ids = np.sort(np.concatenate(rare))
+        first = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+        candidates = ids[first]
+        if len(candidates) > CANDIDATE_LIMIT:
+            hits = np.diff(np.append(first, len(ids)))
+            candidates = candidates[np.argpartition(-hits, CANDIDATE_LIMIT)[:CANDIDATE_LIMIT]]
+
+        # Gather the candidates' trigram ids as one flat array
+        starts = arrays['alias_gram_offsets'][candidates]
+        lengths = arrays['alias_gram_offsets'][candidates + 1] - starts
+        bounds = np.cumsum(lengths) - lengths
+        flat = np.repeat(starts - bounds, lengths) + np.arange(lengths.sum())
+
+        in_query = np.zeros(len(arrays['grams']), dtype=np.int32)
+        in_query[known] = 1
+        overlap = np.add.reduceat(in_query[arrays['alias_grams'][flat]], bounds)
+
+        dice = 2 * overlap / (len(grams) + lengths)
+        keep = dice >= min_score
+        candidates, dice = candidates[keep], dice[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-dice, limit)[:limit]
+            candidates, dice = candidates[top], dice[top]
+        return zip(candidates.tolist(), dice.tolist())
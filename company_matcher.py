@@ -0,0 +1,101 @@
+import re
+import numpy as np
+
+# Website-looking tokens in a posting: 'fakecorp-scam.com', 'hr@phishco-scam.org'
+DOMAIN_MENTION = re.compile(r'(?<![\w.-])(?:[a-z]+://)?(?:www\.)?((?:[a-z0-9-]+\.)+[a-z]{2,})(?![\w-])', re.I)
+
+# Single-word names shorter than this are too likely to be ordinary words
+MIN_WORD_NAME = 4
+
+def build_phrase_trie(phrases, vocabulary):
+    """
+    Trie over word sequences. `phrases` is a list of (word ids, owner)
+    pairs, with ids into the sorted `vocabulary` table. Returns flat
+    arrays: transitions out of the root by word id, the other transitions
+    keyed by state * len(vocabulary) + word, and the owners of the
+    phrases ending in each state.
+    """
+    size = len(vocabulary)
+    goto = {}
+    owners = [[]]
+    for words, owner in phrases:
+        state = 0
+        for word in words:
+            child = goto.get((state, word))
+            if child is None:
+                child = goto[(state, word)] = len(owners)
+                owners.append([])
+            state = child
+        if owner not in owners[state]:
+            owners[state].append(owner)
+
+    root_next = np.zeros(size, dtype=np.int32)
+    inner = []
+    for (parent, word), child in goto.items():
+        if parent == 0:
+            root_next[word] = child
+        else:
+            inner.append((parent * size + word, child))
+    inner.sort()
+
+    counts = [len(state_owners) for state_owners in owners]
+    return {
+        'root_next': root_next,
+        'transition_keys': np.array([key for key, _ in inner], dtype=np.int64),
+        'transition_next': np.array([child for _, child in inner], dtype=np.int32),
+        'output_offsets': np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+        'outputs': np.array([owner for state_owners in owners for owner in state_owners], dtype=np.int32)
+    }
+
+def scan_words(arrays, ids):
+    """
+    Owners of every phrase occurring in a text, as a list in order of
+    appearance (with repeats), from its word ids (-1 for words not in the
+    vocabulary, which no phrase continues through).
+    Instead of stepping an automaton word by word, every position of the
+    text is advanced at once: the states reached by the one-word suffixes,
+    then by the two-word ones, and so on, each level one searchsorted over
+    all positions. That is one NumPy pass per word of the longest phrase
+    found, and every phrase ending at a position is reached by the suffix
+    of its own length, so no Aho-Corasick failure links are needed.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    size = len(arrays['root_next'])
+    keys = arrays['transition_keys']
+    offsets = arrays['output_offsets']
+
+    known = ids >= 0
+    state = np.where(known, arrays['root_next'][np.where(known, ids, 0)], 0)
+    ends, depths, states = [], [], []
+    depth = 1
+    while True:
+        live = np.flatnonzero(state)
+        if not len(live):
+            break
+        ending = live[offsets[state[live] + 1] > offsets[state[live]]]
+        ends.append(ending)
+        depths.append(np.full(len(ending), depth))
+        states.append(state[ending])
+
+        # Extend each suffix by the word after it
+        live = live[live + 1 < len(ids)]
+        live = live[known[live + 1]]
+        wanted = state[live].astype(np.int64) * size + ids[live + 1]
+        rows = np.minimum(np.searchsorted(keys, wanted), max(len(keys) - 1, 0))
+        hit = keys[rows] == wanted if len(keys) else np.zeros(len(live), dtype=bool)
+        state = np.zeros(len(ids), dtype=np.int32)
+        state[live[hit] + 1] = arrays['transition_next'][rows[hit]]
+        depth += 1
+
+    if not ends:
+        return []
+    ends, depths, states = np.concatenate(ends), np.concatenate(depths), np.concatenate(states)
+    # By end position, longest phrase first, like the output links would list them
+    order = np.lexsort((-depths, ends))
+    first, counts = offsets[states[order]], np.diff(offsets)[states[order]]
+    rows = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    return arrays['outputs'][rows].tolist()
+
+def domain_mentions(text):
+    """Lowercase domains named in a text, including those of email addresses"""
+    return list(dict.fromkeys(domain.lower() for domain in DOMAIN_MENTION.findall(text)))
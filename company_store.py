@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from company_index import CompanyIndex, OutdatedIndexError
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# The companies shipped with the app, used to build a store that does not
+# exist yet and merged into one built from an older copy
+SEED_PATH = os.path.join(DATA_DIR, 'companies.json')
+
+def file_version(path):
+    """What changes when the file is replaced or rewritten, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def seed_version(seed_path):
+    """Hash of the seed file, recorded in the stores built from it, or None if there is none"""
+    if not seed_path or not os.path.exists(seed_path):
+        return None
+    with open(seed_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def read_seed(seed_path):
+    if not seed_path or not os.path.exists(seed_path):
+        return {}
+    with open(seed_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def merge_seed(companies, seed):
+    """The seed's companies added to `companies`, its fields taking precedence over theirs"""
+    merged = dict(companies)
+    for key, record in seed.items():
+        merged[key] = dict(merged.get(key, {}), **record)
+    return merged
+
+class CompanyStore:
+    def __init__(self, path, seed_path=SEED_PATH, check_interval=2.0):
+        """
+        The company database as a memory-mapped CompanyIndex file, shared
+        read-only by every worker on the host. The file is checked for
+        changes at most every `check_interval` seconds and reopened when
+        it is replaced (import_companies.py writes a new file and renames
+        it over the old one), so updates need no restart. A missing file
+        is built from `seed_path`, and one in an older format is rebuilt
+        from its own records.
+        The store records the hash of the seed it was built from. When
+        the seed changes (a new release), it is merged into the store on
+        start: its companies are added or updated, while companies and
+        fields that only imported feeds provide are kept. Feed updates
+        to seed companies are overwritten until the feed is imported
+        again. Stores built with `import_companies.py --replace` have no
+        seed and are left alone.
+        """
+        self.path = path
+        self.seed_path = seed_path
+        self.check_interval = check_interval
+        self.reloads = 0
+
+        self._index = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+        if file_version(path) is None:
+            self._build_from_seed()
+        else:
+            self._rebuild_outdated()
+            self._merge_new_seed()
+        self._reload()
+
+    def _build_from_seed(self):
+        companies = read_seed(self.seed_path)
+        print(f"Building company store {self.path} from {len(companies)} seed companies")
+        CompanyIndex(companies).save(self.path, metadata={'seed': seed_version(self.seed_path)})
+
+    def _rebuild_outdated(self):
+        try:
+            CompanyIndex.open(self.path)
+        except OutdatedIndexError as e:
+            # Older stores did not record their seed; take them as built from this one
+            print(f"{e}: rebuilding it")
+            companies = dict(CompanyIndex.open(self.path, any_format=True).items())
+            CompanyIndex(companies).save(self.path, metadata={'seed': seed_version(self.seed_path)})
+        except (OSError, ValueError):
+            pass  # reported by _reload()
+
+    def _merge_new_seed(self):
+        try:
+            index = CompanyIndex.open(self.path)
+        except (OSError, ValueError):
+            return
+        built_from, version = index.metadata.get('seed'), seed_version(self.seed_path)
+        if built_from is None or version is None or built_from == version:
+            return
+        seed = read_seed(self.seed_path)
+        print(f"Seed {self.seed_path} has changed: merging its {len(seed)} companies into company store {self.path}")
+        CompanyIndex(merge_seed(dict(index.items()), seed)).save(self.path, metadata={'seed': version})
+
+    def _reload(self):
+        version = file_version(self.path)
+        if version is None or version == self._version:
+            return
+        try:
+            self._index = CompanyIndex.open(self.path)
+        except (OSError, ValueError) as e:
+            # Keep serving the copy already open
+            print(f"Could not reload company store {self.path}: {e}")
+            return
+        if self._version is not None:
+            self.reloads += 1
+            print(f"Reloaded company store: {len(self._index)} companies")
+        self._version = version
+
+    @property
+    def index(self):
+        """The current index, reopened first if the file has changed"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if now - self._checked_at >= self.check_interval:
+                    self._checked_at = now
+                    self._reload()
+        return self._index
+
+    def __len__(self):
+        return len(self.index)
+
+    def search(self, query, k=5, min_score=None):
+        return self.index.search(query, k=k, min_score=min_score)
+
+    def get(self, name):
+        return self.index.get(name)
+
+    def record(self, key):
+        return self.index.record(key)
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'companies': len(self.index),
+            'reloads': self.reloads
+        }
+
+def default_store_path():
+    return os.environ.get('SNIFTERN_COMPANY_STORE') or os.path.join(DATA_DIR, 'companies.store')
+
+def create_company_store():
+    """
+    Open the store from SNIFTERN_COMPANY_STORE (default data/companies.store);
+    SNIFTERN_COMPANY_RELOAD sets how often, in seconds, it checks for updates
+    """
+    return CompanyStore(
+        default_store_path(),
+        check_interval=float(os.environ.get('SNIFTERN_COMPANY_RELOAD', 2.0))
+    )
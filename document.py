@@ -0,0 +1,123 @@
+import os
+import threading
+from collections import OrderedDict
+from preprocessing import preprocess_text
+from text_cleaner import clean_text
+from text_features import TextFeatures
+
+class memoized:
+    """
+    Like functools.cached_property, without the lock it shares between all
+    instances before Python 3.12: two threads racing on one Document at
+    worst compute the same value twice
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+class Document:
+    def __init__(self, raw, cleaned=None):
+        """
+        A posting's text in every form the analyses read, each computed the
+        first time something asks for it and kept from then on:
+        cleaned    whitespace collapsed (text_cleaner.clean_text)
+        processed  preprocess_text output, what the model and patterns see
+        tokens     the words of `processed` the vectorizer counts
+        word_count words in the raw text
+        features   TextFeatures for the salary, quality and interview analyses
+        Scrapers and OCR already return clean text and say so with `cleaned`.
+        """
+        self.raw = raw
+        if cleaned is not None:
+            self.cleaned = cleaned
+
+    def __repr__(self):
+        return f"Document({self.raw[:40]!r}, {len(self.raw)} chars)"
+
+    @memoized
+    def cleaned(self):
+        return clean_text(self.raw)
+
+    @memoized
+    def processed(self):
+        return preprocess_text(self.raw)
+
+    @memoized
+    def tokens(self):
+        # The vectorizer's default token pattern (\b\w\w+\b) on text that is
+        # only [a-z0-9] words and single spaces
+        return [word for word in self.processed.split(' ') if len(word) > 1]
+
+    @memoized
+    def word_count(self):
+        return len(self.raw.split())
+
+    @memoized
+    def features(self):
+        return TextFeatures(self.raw, self.word_count)
+
+def as_document(text):
+    """`text` itself if it is a Document, else a new Document of it"""
+    return text if isinstance(text, Document) else Document(text)
+
+class RecentDocuments:
+    def __init__(self, max_size=128):
+        """
+        LRU of the Documents of recently seen texts, so a text that comes
+        back in a later request (/extract_url, then /detect on its output)
+        reuses the forms already computed for it
+        """
+        self.max_size = max_size
+
+        self._documents = OrderedDict()  # raw text -> Document
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text):
+        """
+        The Document for `text` (a str or a Document), remembered as the
+        most recent. A Document passed in for a known text hands its
+        computed forms over to the remembered one.
+        """
+        document = as_document(text)
+        if self.max_size <= 0:
+            return document
+
+        with self._lock:
+            known = self._documents.get(document.raw)
+            if known is not None:
+                self._documents.move_to_end(document.raw)
+                self.hits += 1
+                if known is not document:
+                    for name, value in vars(document).items():
+                        vars(known).setdefault(name, value)
+                return known
+
+            self.misses += 1
+            self._documents[document.raw] = document
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+        return document
+
+    def stats(self):
+        """Hit/miss counters for the stats endpoint"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._documents),
+                'max_size': self.max_size
+            }
+
+def create_recent_documents():
+    """Build the LRU from SNIFTERN_DOCUMENT_CACHE_SIZE (0 disables it)"""
+    return RecentDocuments(max_size=int(os.environ.get('SNIFTERN_DOCUMENT_CACHE_SIZE', 128)))
@@ -1,7 +1,23 @@
-import joblib
-from preprocessing import preprocess_text
+import hashlib
+import json
+from document import as_document
+from pattern_matcher import PatternMatcher
+from linear_scorer import LinearScorer
+from fast_vectorizer import FastVectorizer
+from text_features import (
+    LEGITIMATE_INTERVIEW_TERMS,
+    PROFESSIONAL_TERMS,
+    SALARY_PATTERNS,
+    SUSPICIOUS_INTERVIEW_TERMS,
+    SUSPICIOUS_SALARY_TERMS,
+    UNPROFESSIONAL_TERMS
+)
 import os
-import re
+
+# Part of every result cache key. The rule and term lists are hashed into
+# the key already; bump this when a change to the analysis code itself
+# (thresholds, messages, response fields) changes what a posting gets
+ANALYSIS_VERSION = 1
 
 class EnhancedFakeInternshipPredictor:
     def __init__(self, model_dir='model'):
@@ -10,16 +26,22 @@ class EnhancedFakeInternshipPredictor:
         """
         self.model_path = os.path.join(model_dir, 'fake_job_model.pkl')
         self.vectorizer_path = os.path.join(model_dir, 'tfidf_vectorizer.pkl')
+        self.scorer_path = os.path.join(model_dir, 'linear_scorer.npz')
+        self.fast_vectorizer_path = os.path.join(model_dir, 'fast_vectorizer.npz')
         
-        # Load model and vectorizer
+        # Load the exported weights and vocabulary; the pickled model (and
+        # scikit-learn with it) is only loaded when they are out of date
+        self._model = None
         try:
-            self.model = joblib.load(self.model_path)
-            self.vectorizer = joblib.load(self.vectorizer_path)
+            self.vectorizer = self.load_vectorizer()
+            self.scorer = self.load_scorer()
+            self.model_version = self.get_model_version()
             print("Model loaded successfully!")
         except FileNotFoundError:
             print("Model files not found. Please run train_model.py first.")
-            self.model = None
             self.vectorizer = None
+            self.scorer = None
+            self.model_version = 'none'
         
         # Define fake internship patterns (for preprocessed text - no punctuation)
         self.fake_internship_patterns = {
@@ -91,6 +113,66 @@ class EnhancedFakeInternshipPredictor:
                 r'commission.*work'
             ]
         }
+        
+        # Compile the rule set once instead of running ~55 regexes per request
+        self.pattern_matcher = PatternMatcher(self.fake_internship_patterns)
+        
+        # Cached results are only reused by the same model and the same rules
+        self.rules_version = self.get_rules_version()
+        self.cache_version = f"{self.model_version}-{self.rules_version}"
+    
+    @property
+    def model(self):
+        """The pickled LogisticRegression, unpickled on first access (None without model files)"""
+        if self._model is None and os.path.exists(self.model_path):
+            import joblib
+            self._model = joblib.load(self.model_path)
+        return self._model
+    
+    def load_scorer(self):
+        """
+        Use the exported weights when they are at least as new as the
+        pickled model, otherwise export them from the loaded model
+        """
+        if (os.path.exists(self.scorer_path)
+                and os.path.getmtime(self.scorer_path) >= os.path.getmtime(self.model_path)):
+            return LinearScorer.load(self.scorer_path)
+        return LinearScorer.from_model(self.model)
+    
+    def load_vectorizer(self):
+        """
+        Use the exported vocabulary and IDF weights when they are at least
+        as new as the pickled vectorizer, otherwise export them from it
+        """
+        if (os.path.exists(self.fast_vectorizer_path)
+                and os.path.getmtime(self.fast_vectorizer_path) >= os.path.getmtime(self.vectorizer_path)):
+            return FastVectorizer.load(self.fast_vectorizer_path)
+        import joblib
+        return FastVectorizer.from_vectorizer(joblib.load(self.vectorizer_path))
+    
+    def get_model_version(self):
+        """
+        Short hash of the loaded vocabulary, IDF and model weights, used to
+        key cached results; hashing what was loaded reads no file again
+        """
+        vectorizer, scorer = self.vectorizer, self.scorer
+        settings = [vectorizer.token_pattern, vectorizer.lowercase, vectorizer.binary,
+                    vectorizer.sublinear_tf, vectorizer.norm, scorer.classes.tolist()]
+        digest = hashlib.sha256(json.dumps(settings).encode())
+        digest.update('\0'.join(vectorizer.terms).encode('utf-8'))
+        for array in (vectorizer.idf, scorer.coef, scorer.intercept):
+            if array is not None:
+                digest.update(array.tobytes())
+        return digest.hexdigest()[:12]
+    
+    def get_rules_version(self):
+        """Short hash of the pattern rules, the indicator term lists and ANALYSIS_VERSION"""
+        rules = [
+            ANALYSIS_VERSION, self.fake_internship_patterns, SALARY_PATTERNS,
+            SUSPICIOUS_SALARY_TERMS, PROFESSIONAL_TERMS, UNPROFESSIONAL_TERMS,
+            SUSPICIOUS_INTERVIEW_TERMS, LEGITIMATE_INTERVIEW_TERMS
+        ]
+        return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
     
     def check_fake_patterns(self, text):
         """
@@ -98,14 +180,8 @@ class EnhancedFakeInternshipPredictor:
         Returns: (is_fake, pattern_matches, confidence_boost)
         """
         # Text is already preprocessed (lowercase, no punctuation)
-        pattern_matches = []
-        confidence_boost = 0
-        
-        for pattern_type, patterns in self.fake_internship_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    pattern_matches.append(f"{pattern_type}: {pattern}")
-                    confidence_boost += 15  # Boost confidence for each pattern match
+        pattern_matches = self.pattern_matcher.scan(text)
+        confidence_boost = 15 * len(pattern_matches)  # Boost confidence for each pattern match
         
         # Special boost for certificate payment patterns
         certificate_matches = [p for p in pattern_matches if 'certificate_payment' in p]
@@ -122,32 +198,79 @@ class EnhancedFakeInternshipPredictor:
         Enhanced prediction combining ML and rule-based detection
         Returns: (prediction, confidence_score, is_fake, pattern_matches)
         """
-        if self.model is None or self.vectorizer is None:
-            return None, 0, False, []
+        return self.predict_many([text], threshold)[0]
+    
+    def predict_many(self, texts, threshold=0.6):
+        """
+        Batch version of predict: every text that needs the ML model is
+        vectorized and scored in a single sparse-matrix call.
+        Returns one (prediction, confidence_score, is_fake, pattern_matches)
+        tuple per text, in the same order. A failing item gets the same
+        error tuple predict returns without affecting the rest of the batch.
+        Texts may be Documents, whose preprocessed form is reused.
+        """
+        if self.scorer is None or self.vectorizer is None:
+            return [(None, 0, False, []) for _ in texts]
         
-        try:
-            # Preprocess the text
-            processed_text = preprocess_text(text)
-            
-            if not processed_text.strip():
-                return "No text to analyze", 0, False, []
-            
-            # Check for fake patterns first (use processed text for consistency)
-            pattern_fake, pattern_matches, confidence_boost = self.check_fake_patterns(processed_text)
-            
-            # If strong pattern matches, classify as fake
-            if pattern_fake and confidence_boost >= 30:
-                return 1, 85 + confidence_boost, True, pattern_matches
-            
-            # Vectorize the text
-            text_vector = self.vectorizer.transform([processed_text])
-            
-            # Get prediction probability
-            proba = self.model.predict_proba(text_vector)[0]
+        results = [None] * len(texts)
+        pending = []  # (index, document, pattern_matches, confidence_boost)
+        
+        for index, text in enumerate(texts):
+            try:
+                # Preprocess the text (once per Document)
+                document = as_document(text)
+                processed_text = document.processed
+                
+                if not processed_text.strip():
+                    results[index] = ("No text to analyze", 0, False, [])
+                    continue
+                
+                # Check for fake patterns first (use processed text for consistency)
+                pattern_fake, pattern_matches, confidence_boost = self.check_fake_patterns(processed_text)
+                
+                # If strong pattern matches, classify as fake
+                if pattern_fake and confidence_boost >= 30:
+                    results[index] = (1, 85 + confidence_boost, True, pattern_matches)
+                    continue
+                
+                pending.append((index, document, pattern_matches, confidence_boost))
             
-            # Get prediction (0 = real, 1 = fake)
-            prediction = self.model.predict(text_vector)[0]
+            except Exception as e:
+                print(f"Error making prediction: {str(e)}")
+                results[index] = (None, 0, False, [])
+        
+        if pending:
+            try:
+                scored = self._score_batch(pending)
+            except Exception as e:
+                # Retry one by one so a single bad item cannot fail the whole batch
+                print(f"Batch scoring failed, scoring items individually: {str(e)}")
+                scored = []
+                for item in pending:
+                    try:
+                        scored.extend(self._score_batch([item]))
+                    except Exception as item_error:
+                        print(f"Error making prediction: {str(item_error)}")
+                        scored.append((item[0], (None, 0, False, [])))
             
+            for index, result in scored:
+                results[index] = result
+        
+        return results
+    
+    def _score_batch(self, pending):
+        """
+        Run the ML model over the pending items of predict_many
+        Returns: [(index, (prediction, confidence_score, is_fake, pattern_matches)), ...]
+        """
+        # Vectorize all texts at once, from the tokens of their Documents
+        text_vectors = self.vectorizer.transform_documents([item[1] for item in pending])
+        
+        # One weights product gives both predictions (0 = real, 1 = fake) and probabilities
+        predictions, probas = self.scorer.score(text_vectors)
+        
+        scored = []
+        for (index, _, pattern_matches, confidence_boost), proba, prediction in zip(pending, probas, predictions):
             # Calculate confidence score
             if prediction == 0:  # Real
                 confidence_score = proba[0] * 100
@@ -167,54 +290,42 @@ class EnhancedFakeInternshipPredictor:
                         is_fake = True
                         prediction = 1
             
-            return prediction, confidence_score, is_fake, pattern_matches
-            
-        except Exception as e:
-            print(f"Error making prediction: {str(e)}")
-            return None, 0, False, []
+            scored.append((index, (prediction, confidence_score, is_fake, pattern_matches)))
+        
+        return scored
     
     def get_prediction_result(self, text, threshold=0.4):
         """
         Get formatted prediction result with pattern analysis
         """
-        prediction, confidence_score, is_fake, pattern_matches = self.predict(text, threshold)
-        
-        if prediction is None:
-            return "Error", 0, "❌", []
-        
-        # Determine if it's likely fake based on threshold
-        if is_fake and confidence_score > (threshold * 100):
-            result = "Likely FAKE ❌"
-        else:
-            result = "Likely REAL ✅"
+        return self.get_prediction_results([text], threshold)[0]
+    
+    def get_prediction_results(self, texts, threshold=0.4):
+        """
+        Batch version of get_prediction_result, one formatted result per text
+        """
+        results = []
+        for prediction, confidence_score, is_fake, pattern_matches in self.predict_many(texts, threshold):
+            if prediction is None:
+                results.append(("Error", 0, "❌", []))
+                continue
+            
+            # Determine if it's likely fake based on threshold
+            if is_fake and confidence_score > (threshold * 100):
+                result = "Likely FAKE ❌"
+            else:
+                result = "Likely REAL ✅"
+            
+            results.append((result, confidence_score, "❌" if is_fake else "✅", pattern_matches))
         
-        return result, confidence_score, "❌" if is_fake else "✅", pattern_matches
+        return results
 
-    def analyze_salary_range(self, text):
+    def analyze_salary_range(self, text, features=None):
         """Analyze salary ranges for unrealistic promises"""
-        text_lower = text.lower()
-        
-        # Look for salary patterns
-        salary_patterns = [
-            r'\$\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?\s*(?:per\s+)?(?:hour|day|week|month|year)',
-            r'\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?\s*(?:dollars?|usd|inr|rupees?)\s*(?:per\s+)?(?:hour|day|week|month|year)',
-            r'(?:salary|pay|compensation|earnings?)\s*(?:of\s+)?\$\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?'
-        ]
+        features = features or as_document(text).features
         
-        suspicious_indicators = [
-            'no experience required',
-            'work from home',
-            'immediate start',
-            'quick money',
-            'fast cash',
-            'easy money',
-            'high salary',
-            'excellent pay',
-            'great compensation'
-        ]
-        
-        salary_found = any(re.search(pattern, text_lower) for pattern in salary_patterns)
-        suspicious_terms = sum(1 for term in suspicious_indicators if term in text_lower)
+        salary_found = features.salary_found
+        suspicious_terms = features.count(SUSPICIOUS_SALARY_TERMS)
         
         if salary_found and suspicious_terms >= 3:
             return "⚠️ HIGH RISK: Unrealistic salary promises detected"
@@ -225,30 +336,14 @@ class EnhancedFakeInternshipPredictor:
         else:
             return "ℹ️ INFO: No specific salary mentioned"
 
-    def analyze_internship_description_quality(self, text):
+    def analyze_internship_description_quality(self, text, features=None):
         """Rate the professionalism of internship descriptions"""
-        text_lower = text.lower()
+        features = features or as_document(text).features
         
-        # Professional indicators
-        professional_indicators = [
-            'requirements', 'qualifications', 'responsibilities', 'duties',
-            'experience', 'skills', 'education', 'degree', 'certification',
-            'team', 'collaboration', 'leadership', 'management',
-            'project', 'development', 'analysis', 'strategy'
-        ]
+        professional_count = features.count(PROFESSIONAL_TERMS)
+        unprofessional_count = features.count(UNPROFESSIONAL_TERMS)
         
-        # Unprofessional indicators
-        unprofessional_indicators = [
-            'urgent', 'immediate', 'quick', 'fast', 'easy',
-            'no experience needed', 'anyone can apply', 'everyone welcome',
-            'work from anywhere', 'flexible hours', 'no pressure',
-            'commission only', 'no salary', 'payment required'
-        ]
-        
-        professional_count = sum(1 for term in professional_indicators if term in text_lower)
-        unprofessional_count = sum(1 for term in unprofessional_indicators if term in text_lower)
-        
-        total_words = len(text.split())
+        total_words = features.word_count
         professional_ratio = professional_count / max(total_words, 1) * 100
         unprofessional_ratio = unprofessional_count / max(total_words, 1) * 100
         
@@ -261,43 +356,12 @@ class EnhancedFakeInternshipPredictor:
         else:
             return "ℹ️ AVERAGE: Standard internship description"
 
-    def analyze_interview_process(self, text):
+    def analyze_interview_process(self, text, features=None):
         """Identify suspicious interview procedures"""
-        text_lower = text.lower()
-        
-        # Suspicious interview patterns
-        suspicious_patterns = [
-            'no interview required',
-            'immediate hiring',
-            'quick hiring process',
-            'no background check',
-            'no verification needed',
-            'start immediately',
-            'no questions asked',
-            'automatic approval',
-            'instant approval',
-            'no formal interview',
-            'chat interview only',
-            'text interview',
-            'whatsapp interview'
-        ]
-        
-        # Legitimate interview patterns
-        legitimate_patterns = [
-            'interview process',
-            'multiple rounds',
-            'technical interview',
-            'behavioral interview',
-            'background check',
-            'reference check',
-            'skill assessment',
-            'coding test',
-            'presentation',
-            'case study'
-        ]
+        features = features or as_document(text).features
         
-        suspicious_count = sum(1 for pattern in suspicious_patterns if pattern in text_lower)
-        legitimate_count = sum(1 for pattern in legitimate_patterns if pattern in text_lower)
+        suspicious_count = features.count(SUSPICIOUS_INTERVIEW_TERMS)
+        legitimate_count = features.count(LEGITIMATE_INTERVIEW_TERMS)
         
         if suspicious_count >= 2:
             return "🚨 HIGH RISK: Suspicious interview process detected"
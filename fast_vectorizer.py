@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import re
+from itertools import chain, repeat
+import numpy as np
+import scipy.sparse as sp
+
+# TfidfVectorizer's default; Document.tokens are this pattern applied to preprocessed text
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+class FastVectorizer:
+    def __init__(self, terms, idf=None, token_pattern=DEFAULT_TOKEN_PATTERN, lowercase=True,
+                 binary=False, sublinear_tf=False, norm='l2'):
+        """
+        Inference-only form of a fitted unigram TfidfVectorizer: the
+        vocabulary as a list of terms in column order, the IDF weights
+        and the few settings transform() reads.
+        Stop words need no table of their own: they never made it into
+        the vocabulary, so they are dropped like any unknown token.
+        """
+        if norm not in ('l1', 'l2', None):
+            raise ValueError(f"Unsupported norm: {norm!r}")
+        self.terms = [str(term) for term in terms]
+        self.idf = None if idf is None else np.ascontiguousarray(idf, dtype=np.float64)
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+
+        self.vocabulary = dict(zip(self.terms, range(len(self.terms))))
+        self.tokenize = re.compile(token_pattern).findall
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        """Export a fitted TfidfVectorizer that only counts words"""
+        if (vectorizer.analyzer != 'word' or tuple(vectorizer.ngram_range) != (1, 1)
+                or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None
+                or vectorizer.strip_accents is not None or vectorizer.input != 'content'
+                or vectorizer.dtype not in (np.float64, float)):
+            raise ValueError("FastVectorizer only supports word unigram vectorizers with default preprocessing")
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, column in vectorizer.vocabulary_.items():
+            terms[column] = term
+        idf = vectorizer.idf_ if vectorizer.use_idf else None
+        return cls(terms, idf, vectorizer.token_pattern, vectorizer.lowercase, vectorizer.binary,
+                   vectorizer.sublinear_tf, vectorizer.norm)
+
+    @classmethod
+    def load(cls, path):
+        """Load a vectorizer written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            settings = json.loads(data['settings'].item())
+            terms = data['terms'].tobytes().decode('utf-8').split('\0') if data['terms'].size else []
+            return cls(terms, data['idf'] if 'idf' in data else None, **settings)
+
+    def save(self, path):
+        """
+        Write the vectorizer as an uncompressed .npz archive, the terms as
+        one NUL-separated UTF-8 string
+        """
+        if any('\0' in term for term in self.terms):
+            raise ValueError("Terms containing NUL cannot be saved")
+        settings = {
+            'token_pattern': self.token_pattern,
+            'lowercase': self.lowercase,
+            'binary': self.binary,
+            'sublinear_tf': self.sublinear_tf,
+            'norm': self.norm
+        }
+        terms = np.frombuffer('\0'.join(self.terms).encode('utf-8'), dtype=np.uint8)
+        arrays = {'terms': terms, 'settings': np.array(json.dumps(settings))}
+        if self.idf is not None:
+            arrays['idf'] = self.idf
+        np.savez(path, **arrays)
+
+    def transform(self, texts):
+        """TF-IDF rows of raw texts, identical to the exported vectorizer's transform"""
+        if self.lowercase:
+            return self.transform_tokens(self.tokenize(text.lower()) for text in texts)
+        return self.transform_tokens(self.tokenize(text) for text in texts)
+
+    def transform_documents(self, documents):
+        """
+        transform() of each Document's preprocessed text, reusing the
+        Document's tokens when this vectorizer would find the same ones
+        """
+        if self.token_pattern == DEFAULT_TOKEN_PATTERN:
+            return self.transform_tokens(document.tokens for document in documents)
+        return self.transform([document.processed for document in documents])
+
+    def transform_tokens(self, token_lists):
+        """TF-IDF rows of already tokenized texts: tokens go straight to column indices"""
+        token_lists = list(token_lists)
+        lengths = [len(tokens) for tokens in token_lists]
+        n_terms = len(self.terms)
+
+        # Column of every token (-1 if unknown), then one sort counts them per (row, column)
+        columns = np.fromiter(map(self.vocabulary.get, chain.from_iterable(token_lists), repeat(-1)),
+                              dtype=np.int64, count=sum(lengths))
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        known = columns >= 0
+        cells, counts = np.unique(rows[known] * n_terms + columns[known], return_counts=True)
+        rows, columns = np.divmod(cells, n_terms)
+        indptr = np.searchsorted(rows, np.arange(len(lengths) + 1)).astype(np.int32)
+
+        indices = columns.astype(np.int32)
+        data = counts.astype(np.float64)
+        if self.binary:
+            data[:] = 1.0
+        if self.sublinear_tf:
+            np.log(data, data)
+            data += 1.0
+        if self.idf is not None:
+            data *= self.idf[indices]
+        if self.norm:
+            normalize_rows(data, indptr, self.norm)
+
+        return sp.csr_matrix((data, indices, indptr), shape=(len(lengths), n_terms))
+
+def normalize_rows(data, indptr, norm):
+    """
+    Scale each CSR row to unit norm in place, summing in index order like
+    sklearn's normalize() so every value is bit for bit the same
+    """
+    magnitudes = np.abs(data) if norm == 'l1' else data * data
+    bounds = indptr.tolist()
+    for start, end in zip(bounds, bounds[1:]):
+        if start == end:
+            continue
+        total = np.add.accumulate(magnitudes[start:end])[-1]
+        if total == 0.0:
+            continue
+        data[start:end] /= total if norm == 'l1' else np.sqrt(total)
+
+def same_vectors(a, b):
+    """Whether two CSR matrices hold the same entries, bit for bit, in the same layout"""
+    return (a.shape == b.shape and a.dtype == b.dtype
+            and np.array_equal(a.indptr, b.indptr)
+            and np.array_equal(a.indices, b.indices)
+            and np.array_equal(a.data, b.data))
+
+def check_export(fast, vectorizer, texts, batch_size=1000):
+    """Raise ValueError unless `fast` vectorizes every text exactly like `vectorizer`"""
+    texts = list(texts)
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        if not same_vectors(fast.transform(batch), vectorizer.transform(batch)):
+            raise ValueError(f"Exported vectorizer differs on texts {start}-{start + len(batch) - 1}")
+    return len(texts)
+
+def export_vectorizer(model_dir='model', texts=None):
+    """
+    Export model/tfidf_vectorizer.pkl to model/fast_vectorizer.npz,
+    after checking it against the pickled vectorizer on `texts`
+    """
+    import joblib
+
+    vectorizer = joblib.load(os.path.join(model_dir, 'tfidf_vectorizer.pkl'))
+    fast = FastVectorizer.from_vectorizer(vectorizer)
+    if texts is not None:
+        check_export(fast, vectorizer, texts)
+    fast.save(os.path.join(model_dir, 'fast_vectorizer.npz'))
+    return fast
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the TF-IDF vectorizer for inference")
+    parser.add_argument('--data', default=None, help="Training CSV to check the export against")
+    args = parser.parse_args()
+    
+    texts = None
+    if args.data:
+        from train_model import CACHE_DIR, load_and_preprocess_data
+        texts = load_and_preprocess_data(args.data, cache_dir=CACHE_DIR)['full_text']
+    
+    export_vectorizer(texts=texts)
+    if texts is not None:
+        print(f"Identical vectors on all {len(texts)} training postings")
+    print("Fast vectorizer exported to model/fast_vectorizer.npz")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import gc
+import os
+
+# gunicorn -c gunicorn.conf.py app:app
+bind = os.environ.get('SNIFTERN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('SNIFTERN_WORKERS', 2 * (os.cpu_count() or 1) + 1))
+
+# Preload-and-fork (SNIFTERN_PRELOAD=0 turns it off): the master imports
+# the app and loads the model once, then forks the workers, which share
+# those pages copy-on-write instead of each loading its own copy
+preload_app = os.environ.get('SNIFTERN_PRELOAD', '1') != '0'
+
+if preload_app:
+    # No collections while the master loads, so the long-lived objects
+    # are packed together instead of spread between freed holes
+    gc.disable()
+
+def when_ready(server):
+    """Runs in the master after the app is imported, before any worker is forked"""
+    if not preload_app:
+        return
+    from app import warm_up
+
+    warm_up()
+    # Park everything loaded so far in the permanent generation: workers'
+    # collections would otherwise write to (and so copy) the shared pages
+    gc.freeze()
+    gc.enable()
@@ -0,0 +1,385 @@
+import os
+import re
+from html.parser import HTMLParser
+from importlib.util import find_spec
+from preprocessing import EMPTY_ELEMENT_TAGS, HIDDEN_TEXT_TAGS, decode_charref, decode_entityref
+
+# lxml and bs4's encoding detection are imported on the first page parsed,
+# not at startup; finding out whether lxml is installed is enough here
+LXML_INSTALLED = find_spec('lxml') is not None
+
+# Part of the page cache key: bump it when a change here, to the platform
+# selectors or to the text cleanup changes the text extracted from a page
+EXTRACTOR_VERSION = 2
+
+# Non-content subtrees the scrapers throw away before falling back to the page body
+SKIP_TAGS = ('nav', 'footer', 'header', 'script', 'style', 'aside', 'iframe')
+
+# tag, #id, .class and [attr] / [attr="value"] parts, e.g. div.main or [data-testid="x"]
+SELECTOR_PART = re.compile(r'''([.#]?)([\w-]+)|\[\s*([\w-]+)\s*(?:=\s*(?:"([^"]*)"|'([^']*)'|([\w-]+))\s*)?\]''')
+
+def parse_selector(selector):
+    """
+    Compile a simple CSS selector (no combinators) to
+    (tag, id, classes, attrs) where attrs maps a name to a value or None
+    """
+    tag, element_id, classes, attrs = None, None, [], {}
+    position = 0
+    selector = selector.strip()
+    while position < len(selector):
+        match = SELECTOR_PART.match(selector, position)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector}")
+        prefix, name, attr = match.group(1), match.group(2), match.group(3)
+        if attr:
+            value = next((v for v in match.group(4, 5, 6) if v is not None), None)
+            attrs[attr.lower()] = value
+        elif prefix == '#':
+            element_id = name
+        elif prefix == '.':
+            classes.append(name)
+        else:
+            tag = name.lower()
+        position = match.end()
+    return tag, element_id, tuple(classes), attrs
+
+def selector_matches(selector, tag, attrs):
+    wanted_tag, element_id, classes, wanted_attrs = selector
+    if wanted_tag and wanted_tag != tag:
+        return False
+    if element_id is not None and attrs.get('id') != element_id:
+        return False
+    if classes:
+        present = (attrs.get('class') or '').split()
+        if any(name not in present for name in classes):
+            return False
+    for name, value in wanted_attrs.items():
+        if name not in attrs or (value is not None and attrs[name] != value):
+            return False
+    return True
+
+class Match:
+    """
+    One element matched by a selector, holding the stripped strings inside
+    it as (text, skipped, container) where container is the innermost
+    HIDDEN_TEXT_TAGS element around the string, or None
+    """
+    __slots__ = ('container', 'skipped', 'strings')
+
+    def __init__(self, container, skipped):
+        self.container = container
+        self.skipped = skipped
+        self.strings = []
+
+    def text(self, separator='', include_skipped=True):
+        """Same as Tag.get_text(separator, strip=True), optionally without SKIP_TAGS subtrees"""
+        # Like BeautifulSoup, a <script> (or <rt>, ...) only yields its own
+        # strings and every other element only the visible ones
+        return separator.join(
+            text for text, skipped, container in self.strings
+            if container == self.container and (include_skipped or not skipped)
+        )
+
+class PageScan:
+    def __init__(self, selectors, skip_tags=SKIP_TAGS, stop_index=None):
+        """
+        Single-pass replacement for parsing a page into a BeautifulSoup tree,
+        running soup.select() for every selector and decompose()-ing the
+        non-content tags: one walk over the parser events records the
+        matches of all `selectors` and tags every string that sits inside
+        a `skip_tags` subtree, so callers can ask for the text with or
+        without them.
+        `finished` turns True once the first match of selector
+        `stop_index` outside the skip_tags subtrees has closed, so a
+        streaming reader can stop downloading. `retained` counts the
+        characters of the strings kept so far.
+        """
+        self.selectors = [parse_selector(s) for s in selectors]
+        self.skip_tags = frozenset(skip_tags)
+        self.stop_index = stop_index
+        self.stop_match = None
+        self.finished = False
+        self.retained = 0
+
+        # Index each selector under its most specific part so a start tag
+        # only checks selectors that could possibly match it
+        self.by_id, self.by_class, self.by_attr, self.by_tag = {}, {}, {}, {}
+        for index, (tag, element_id, classes, attrs) in enumerate(self.selectors):
+            if element_id is not None:
+                self.by_id.setdefault(element_id, []).append(index)
+            elif classes:
+                self.by_class.setdefault(classes[0], []).append(index)
+            elif attrs:
+                self.by_attr.setdefault(next(iter(attrs)), []).append(index)
+            else:
+                self.by_tag.setdefault(tag, []).append(index)
+        self.matches = [[] for _ in self.selectors]
+        self.document = Match(None, False)
+        self.open_tags = []
+        self.captures = [self.document.strings]
+        self.containers = [None]
+        self.buffer = []
+        self.skip_depth = 0
+
+    def start(self, tag, attrs):
+        self.flush()
+        if tag in self.skip_tags:
+            self.skip_depth += 1
+        if tag in HIDDEN_TEXT_TAGS:
+            self.containers.append(tag)
+
+        stopping = []
+        self.open_tags.append((tag, len(self.captures), stopping))
+        for index in self.candidates(tag, attrs):
+            if selector_matches(self.selectors[index], tag, attrs):
+                match = Match(tag if tag in HIDDEN_TEXT_TAGS else None, self.skip_depth > 0)
+                self.matches[index].append(match)
+                self.captures.append(match.strings)
+                if index == self.stop_index and self.stop_match is None and not match.skipped:
+                    self.stop_match = match
+                    stopping.append(match)
+
+    def candidates(self, tag, attrs):
+        candidates = list(self.by_tag.get(tag, ()))
+        if attrs:
+            if self.by_id and 'id' in attrs:
+                candidates.extend(self.by_id.get(attrs['id'], ()))
+            if self.by_class and 'class' in attrs:
+                for name in set(attrs['class'].split()):
+                    candidates.extend(self.by_class.get(name, ()))
+            for name, indexes in self.by_attr.items():
+                if name in attrs:
+                    candidates.extend(indexes)
+        return candidates
+
+    def end(self, tag):
+        self.flush()
+        tag, captures, stopping = self.open_tags.pop()
+        del self.captures[captures:]
+        if stopping:
+            self.finished = True
+        if tag in self.skip_tags:
+            self.skip_depth -= 1
+        if tag in HIDDEN_TEXT_TAGS:
+            self.containers.pop()
+
+    def data(self, text):
+        self.buffer.append(text)
+
+    def flush(self, visible=False):
+        """Finish the current string, as BeautifulSoup does at every markup event"""
+        if not self.buffer:
+            return
+        text = ''.join(self.buffer).strip()
+        self.buffer = []
+        if text:
+            self.retained += len(text)
+            item = (text, self.skip_depth > 0, None if visible else self.containers[-1])
+            for strings in self.captures:
+                strings.append(item)
+
+    def cdata(self, text):
+        # A CDATA section is a string of its own, visible even in a <template>
+        self.flush()
+        self.data(text)
+        self.flush(visible=True)
+
+    def close(self):
+        self.flush()
+        while self.open_tags:
+            self.end(self.open_tags[-1][0])
+
+    def first(self, index, include_skipped=True):
+        """First match of selector `index` in document order, like soup.select_one()"""
+        for match in self.matches[index]:
+            if include_skipped or not match.skipped:
+                return match
+        return None
+
+class HTMLParserDriver(HTMLParser):
+    """
+    Feeds html.parser events to a PageScan with the tree-building rules of
+    BeautifulSoup's html.parser builder, so matches and strings come out
+    exactly as they would from the soup
+    """
+    def __init__(self, scan):
+        super().__init__(convert_charrefs=False)
+        self.scan = scan
+        self.open_tags = []
+        self.already_closed = []
+
+    def handle_starttag(self, tag, attrs, handle_empty_element=True):
+        attributes = {}
+        for name, value in attrs:
+            attributes[name] = '' if value is None else value
+        self.scan.start(tag, attributes)
+        self.open_tags.append(tag)
+        if tag in EMPTY_ELEMENT_TAGS and handle_empty_element:
+            # Void elements close at once; a later </br> is then ignored
+            self.handle_endtag(tag, check_already_closed=False)
+            self.already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, handle_empty_element=False)
+        self.handle_endtag(tag, check_already_closed=False)
+
+    def handle_endtag(self, tag, check_already_closed=True):
+        if check_already_closed and tag in self.already_closed:
+            self.already_closed.remove(tag)
+            return
+
+        # Every end tag ends the current string; then close everything up
+        # to the most recent matching tag, ignoring strays
+        self.scan.flush()
+        if tag not in self.open_tags:
+            return
+        while True:
+            closed = self.open_tags.pop()
+            self.scan.end(closed)
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        self.scan.data(data)
+
+    def handle_charref(self, name):
+        self.scan.data(decode_charref(name))
+
+    def handle_entityref(self, name):
+        self.scan.data(decode_entityref(name))
+
+    def handle_comment(self, data):
+        self.scan.flush()
+
+    def handle_decl(self, decl):
+        self.scan.flush()
+
+    def handle_pi(self, data):
+        self.scan.flush()
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self.scan.cdata(data[len('CDATA['):])
+        else:
+            self.scan.flush()
+
+    def close(self):
+        super().close()
+        self.scan.close()
+
+class LxmlTarget:
+    """lxml parser target feeding libxml2's HTML parser events to a PageScan"""
+    def __init__(self, scan):
+        self.scan = scan
+
+    def start(self, tag, attrib):
+        self.scan.start(tag, attrib)
+
+    def end(self, tag):
+        self.scan.end(tag)
+
+    def data(self, data):
+        self.scan.data(data)
+
+    def comment(self, text):
+        self.scan.flush()
+
+    def close(self):
+        self.scan.close()
+
+class LxmlDriver:
+    """Same feed()/close() interface as HTMLParserDriver on top of lxml"""
+    def __init__(self, scan):
+        from lxml import etree
+
+        self.scan = scan
+        self.syntax_error = etree.XMLSyntaxError
+        self.parser = etree.HTMLParser(target=LxmlTarget(scan), recover=True, no_network=True)
+
+    def feed(self, data):
+        self.parser.feed(data)
+
+    def close(self):
+        try:
+            self.parser.close()
+        except self.syntax_error:
+            # Nothing that libxml2 considers a document was fed
+            self.scan.close()
+
+def decode_html(markup):
+    """
+    Decode a fetched page: byte order mark or <meta> charset first, then
+    UTF-8, and BeautifulSoup's full encoding detection as the last resort
+    """
+    if isinstance(markup, str):
+        return markup
+    from bs4.dammit import EncodingDetector, UnicodeDammit
+
+    data, encoding = EncodingDetector.strip_byte_order_mark(markup)
+    encoding = encoding or EncodingDetector.find_declared_encoding(data, is_html=True)
+    for candidate in (encoding, 'utf-8'):
+        if candidate:
+            try:
+                return data.decode(candidate)
+            except (LookupError, UnicodeDecodeError):
+                pass
+    return UnicodeDammit(markup, is_html=True).unicode_markup
+
+def get_parser_backend():
+    """
+    SNIFTERN_HTML_PARSER picks the backend: 'lxml', 'html.parser', or
+    'auto' (the default) for lxml when it is installed
+    """
+    backend = os.environ.get('SNIFTERN_HTML_PARSER', 'auto')
+    if backend == 'auto':
+        return 'lxml' if LXML_INSTALLED else 'html.parser'
+    if backend == 'lxml' and not LXML_INSTALLED:
+        print("lxml is not installed, using html.parser")
+        return 'html.parser'
+    return backend
+
+def create_parser(scan, backend=None):
+    """Incremental parser for `scan`: call feed(text) then close()"""
+    backend = backend or get_parser_backend()
+    if backend == 'lxml':
+        return LxmlDriver(scan)
+    return HTMLParserDriver(scan)
+
+def parse_into(scan, markup, backend=None):
+    """Feed a whole page (bytes or text) to `scan`"""
+    parser = create_parser(scan, backend)
+    text = decode_html(markup)
+    if text:
+        parser.feed(text)
+    parser.close()
+    return scan
+
+def scan_html(markup, selectors, skip_tags=SKIP_TAGS, backend=None):
+    """Walk a page once and return the PageScan for `selectors`"""
+    return parse_into(PageScan(selectors, skip_tags), markup, backend)
+
+class PageExtractor:
+    """
+    A page extraction strategy: the selectors to match in one pass and
+    finish(scan) turning the finished scan into text. Calling it with a
+    page runs both; page_reader.read_page() instead feeds the scan while
+    the page downloads and stops once the first match of `stop_selector`
+    outside the skipped subtrees has closed. Only pass one when that match
+    alone decides the output, whatever the rest of the page holds.
+    `name` keys the page cache, so it must change when the output does.
+    """
+    skip_tags = SKIP_TAGS
+
+    def __init__(self, name, selectors, stop_selector=None):
+        self.name = name
+        self.selectors = list(selectors)
+        self.stop_index = None if stop_selector is None else self.selectors.index(stop_selector)
+
+    def new_scan(self):
+        return PageScan(self.selectors, self.skip_tags, self.stop_index)
+
+    def finish(self, scan):
+        raise NotImplementedError
+
+    def __call__(self, markup, platform=None, backend=None):
+        return self.finish(parse_into(self.new_scan(), markup, backend))
@@ -0,0 +1,98 @@
+import argparse
+import csv
+import json
+import os
+import time
+from company_index import CompanyIndex, company_key
+from company_store import SEED_PATH, default_store_path, read_seed, seed_version
+
+# CSV columns holding lists, written as 'flag one; flag two'
+LIST_FIELDS = ('red_flags', 'green_flags')
+INT_FIELDS = ('fraud_score', 'reports')
+
+def clean_record(record):
+    """A feed row as a company record: empty fields dropped, numbers and flag lists parsed"""
+    cleaned = {}
+    for field, value in record.items():
+        if field is None or value is None or value == '':
+            continue
+        field = field.strip()
+        if field in LIST_FIELDS and isinstance(value, str):
+            value = [flag.strip() for flag in value.split(';') if flag.strip()]
+        elif field in INT_FIELDS:
+            value = int(float(value))
+        elif isinstance(value, str):
+            value = value.strip()
+        cleaned[field] = value
+    return cleaned
+
+def read_feed(path):
+    """
+    (key, record) pairs from a CSV file (one company per row, with at least
+    a 'name' column) or a JSON file (a list of records, or an object of
+    records by key). Records without a key are keyed by their normalized name.
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        if isinstance(records, dict):
+            records = [dict(record, key=key) for key, record in records.items()]
+
+    for record in records:
+        record = clean_record(record)
+        key = record.pop('key', None) or company_key(record.get('name', ''))
+        if not key or 'name' not in record:
+            print(f"Skipping record without a name in {path}: {record}")
+            continue
+        yield key, record
+
+def import_feeds(paths, store_path, replace=False):
+    """
+    Merge feeds into the company store: new companies are added and the
+    fields of known ones updated (or the store is rebuilt from the feeds
+    alone with `replace`, which also detaches it from the seed). The new
+    file is renamed over the old one, so running servers pick it up on
+    their next reload check.
+    """
+    companies, metadata = {}, {}
+    if not replace:
+        if os.path.exists(store_path):
+            index = CompanyIndex.open(store_path, any_format=True)
+            companies = dict(index.items())
+            metadata = {'seed': index.metadata.get('seed', seed_version(SEED_PATH))}
+        else:
+            companies = read_seed(SEED_PATH)
+            metadata = {'seed': seed_version(SEED_PATH)}
+    existing = len(companies)
+
+    added = updated = 0
+    for path in paths:
+        for key, record in read_feed(path):
+            if key in companies:
+                companies[key] = dict(companies[key], **record)
+                updated += 1
+            else:
+                companies[key] = record
+                added += 1
+
+    CompanyIndex(companies).save(store_path, metadata=metadata)
+    return {'existing': existing, 'added': added, 'updated': updated, 'total': len(companies)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Import company feeds (CSV or JSON) into the company store")
+    parser.add_argument('feeds', nargs='+', help="CSV or JSON files to import")
+    parser.add_argument('--store', default=default_store_path(), help="Store file (default: SNIFTERN_COMPANY_STORE or data/companies.store)")
+    parser.add_argument('--replace', action='store_true',
+                        help="Replace the store's companies instead of merging into them; the store then no longer follows the seed")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = import_feeds(args.feeds, args.store, replace=args.replace)
+    print(f"Imported into {args.store} in {time.perf_counter() - start:.1f} s: "
+          f"{result['added']} added, {result['updated']} updated, {result['total']} companies")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import joblib
+import os
+from scipy.special import expit
+
+class LinearScorer:
+    def __init__(self, coef, intercept, classes):
+        """
+        Inference-only form of a binary LogisticRegression: a dense weight
+        column, the intercept and the class labels as plain NumPy arrays
+        """
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).reshape(-1, 1)
+        self.intercept = np.asarray(intercept, dtype=np.float64).reshape(1)
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_model(cls, model):
+        """Export the weights of a fitted binary LogisticRegression"""
+        if model.coef_.shape[0] != 1:
+            raise ValueError("LinearScorer only supports binary classifiers")
+        return cls(model.coef_.T, model.intercept_, model.classes_)
+
+    @classmethod
+    def load(cls, path):
+        """Load weights written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['coef'], data['intercept'], data['classes'])
+
+    def save(self, path):
+        """Write the weights as an uncompressed .npz archive"""
+        np.savez(path, coef=self.coef, intercept=self.intercept, classes=self.classes)
+
+    def decision_function(self, X):
+        """One sparse matrix-vector product per batch: X . w + b"""
+        return (X @ self.coef).ravel() + self.intercept
+
+    def score(self, X):
+        """
+        Score a batch of TF-IDF rows
+        Returns: (labels, probabilities) matching model.predict / model.predict_proba
+        """
+        scores = self.decision_function(X)
+        labels = self.classes[(scores > 0).astype(int)]
+        positive = expit(scores)
+        return labels, np.vstack([1 - positive, positive]).T
+
+def export_scorer(model_dir='model'):
+    """Export model/fake_job_model.pkl to model/linear_scorer.npz"""
+    model = joblib.load(os.path.join(model_dir, 'fake_job_model.pkl'))
+    scorer = LinearScorer.from_model(model)
+    scorer.save(os.path.join(model_dir, 'linear_scorer.npz'))
+    return scorer
+
+if __name__ == "__main__":
+    export_scorer()
+    print("Linear scorer exported to model/linear_scorer.npz")
@@ -0,0 +1,101 @@
+import os
+import re
+import threading
+
+# pytesseract is imported where it is used: importing it takes a few hundred
+# ms (it pulls in pandas when that is installed) and most processes never OCR
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# The pytesseract config options the tesserocr backend understands
+CONFIG_OPTION = re.compile(r'--(psm|dpi)\s+(\d+)')
+
+def get_ocr_backend():
+    """
+    SNIFTERN_OCR_BACKEND picks the OCR engine: 'tesserocr' (Tesseract
+    loaded once per process through its C API), 'pytesseract' (runs the
+    tesseract binary per image), or 'auto' (the default) for tesserocr
+    when it is installed
+    """
+    backend = os.environ.get('SNIFTERN_OCR_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'tesserocr' if tesserocr is not None else 'pytesseract'
+    if backend == 'tesserocr' and tesserocr is None:
+        print("tesserocr is not installed, using pytesseract")
+        return 'pytesseract'
+    return backend
+
+class TesseractAPI:
+    def __init__(self, lang='eng'):
+        """
+        A resident Tesseract engine. The language model is loaded once,
+        on first use, instead of by a new tesseract process per image, and
+        images are handed over in memory rather than through temp files.
+        Tesseract's API is not thread-safe, so calls are serialized.
+        """
+        self.lang = lang
+        self._api = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Start the engine (loads the language model) if it is not running"""
+        with self._lock:
+            if self._api is None:
+                self._api = tesserocr.PyTessBaseAPI(lang=self.lang)
+            return self._api
+
+    def version(self):
+        """Tesseract's version, checking the language model is there without loading it"""
+        path, languages = tesserocr.get_languages()
+        if self.lang not in languages:
+            raise RuntimeError(f"No '{self.lang}' language data in {path}")
+        return tesserocr.tesseract_version().split()[1]
+
+    def image_to_string(self, img, config=''):
+        api = self.load()
+        options = dict(CONFIG_OPTION.findall(config))
+        with self._lock:
+            try:
+                api.SetPageSegMode(int(options.get('psm', tesserocr.PSM.AUTO)))
+                api.SetImage(img)
+                if 'dpi' in options:
+                    api.SetSourceResolution(int(options['dpi']))
+                return api.GetUTF8Text()
+            finally:
+                api.Clear()
+
+    def close(self):
+        with self._lock:
+            if self._api is not None:
+                self._api.End()
+                self._api = None
+
+# One engine per process; OCR worker processes each load their own
+tesseract_api = TesseractAPI()
+
+def tesseract_version():
+    """Version of the Tesseract the configured backend runs"""
+    if get_ocr_backend() == 'tesserocr':
+        return tesseract_api.version()
+    import pytesseract
+    return pytesseract.get_tesseract_version()
+
+def image_to_string(img, config=''):
+    """OCR a PIL image; `config` takes pytesseract-style options (--psm, --dpi)"""
+    if get_ocr_backend() == 'tesserocr':
+        return tesseract_api.image_to_string(img, config)
+    import pytesseract
+    return pytesseract.image_to_string(img, config=config)
+
+def start_ocr_worker():
+    """
+    OCR worker process initializer: load the model before the first image
+    arrives so no request pays for it
+    """
+    if get_ocr_backend() == 'tesserocr':
+        try:
+            tesseract_api.load()
+        except Exception as e:
+            print(f"Could not start Tesseract: {e}")
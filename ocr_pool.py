@@ -0,0 +1,92 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ocr_backend import start_ocr_worker
+from ocr_utils import ocr_image_bytes
+
+class OCRPoolFull(Exception):
+    """Too many images are already queued; the caller should retry later"""
+
+class OCRPool:
+    def __init__(self, workers=2, max_pending=8, ocr=ocr_image_bytes, initializer=None):
+        """
+        Bounded pool of OCR worker processes so Tesseract never runs in a
+        web request thread. At most `max_pending` images are queued or
+        running at once; past that submit() raises OCRPoolFull and the app
+        answers 429 instead of letting requests pile up.
+        `ocr(image_bytes) -> text` runs in the workers, `initializer`
+        once per worker process.
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ocr = ocr
+        self.initializer = initializer
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, data):
+        """Queue an image (bytes) for OCR and return its Future"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise OCRPoolFull(f"{self.pending} images already queued for OCR")
+            self.pending += 1
+
+            # Worker processes start with the first image, not at import
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=self.initializer)
+            executor = self._executor
+
+        try:
+            future = executor.submit(self.ocr, data)
+        except Exception:
+            self._release(broken=True)
+            raise
+
+        future.add_done_callback(self._done)
+        return future
+
+    def extract(self, data, timeout=None):
+        """OCR an image and wait for the text"""
+        return self.submit(data).result(timeout)
+
+    def _done(self, future):
+        self._release(broken=isinstance(future.exception(), BrokenProcessPool))
+
+    def _release(self, broken=False):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            if broken and self._executor is not None:
+                # A worker died (e.g. killed for memory): start a fresh pool next time
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self.pending,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def create_ocr_pool():
+    """
+    OCR pool sized from SNIFTERN_OCR_WORKERS (default: 2, at most the CPU
+    count) and SNIFTERN_OCR_QUEUE (default: 4 images per worker)
+    """
+    workers = int(os.environ.get('SNIFTERN_OCR_WORKERS', min(2, os.cpu_count() or 1)))
+    max_pending = int(os.environ.get('SNIFTERN_OCR_QUEUE', 4 * workers))
+    return OCRPool(workers=workers, max_pending=max_pending, initializer=start_ocr_worker)
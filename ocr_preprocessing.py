@@ -0,0 +1,169 @@
+import os
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+def env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+def get_ocr_settings():
+    """
+    OCR preprocessing settings from the environment:
+    SNIFTERN_OCR_PREPROCESS  run the steps below at all (default on)
+    SNIFTERN_OCR_DPI         resolution to downscale high-DPI images to (default 300)
+    SNIFTERN_OCR_MAX_SIDE    longest side in pixels, for images without DPI info (default 2000)
+    SNIFTERN_OCR_BINARIZE    black text on white via a local threshold (default on)
+    SNIFTERN_OCR_CROP        crop to the area that holds text, after binarizing (default off)
+    SNIFTERN_OCR_PSM         Tesseract page segmentation mode (default 3, Tesseract's own;
+                             4 = one column, 6 = one block of text, 11 = sparse text)
+    """
+    psm = int(os.environ.get('SNIFTERN_OCR_PSM', 3))
+    if not 0 <= psm <= 13:
+        raise ValueError(f"SNIFTERN_OCR_PSM must be 0-13, got {psm}")
+    return {
+        'preprocess': env_flag('SNIFTERN_OCR_PREPROCESS', True),
+        'dpi': int(os.environ.get('SNIFTERN_OCR_DPI', 300)),
+        'max_side': int(os.environ.get('SNIFTERN_OCR_MAX_SIDE', 2000)),
+        'binarize': env_flag('SNIFTERN_OCR_BINARIZE', True),
+        'crop': env_flag('SNIFTERN_OCR_CROP', False),
+        'psm': psm
+    }
+
+def source_dpi(img):
+    """Horizontal DPI recorded in the file, or None (screenshots rarely have one)"""
+    dpi = img.info.get('dpi')
+    try:
+        return float(dpi[0]) if dpi and dpi[0] > 1 else None
+    except (TypeError, ValueError):
+        return None
+
+def target_size(img, dpi=300, max_side=2000):
+    """
+    Size to shrink the image to so it is at most `dpi` (if it records a
+    resolution) and its longest side at most `max_side`, or None if it is
+    small enough already; never upscales. Also returns the resolution to
+    tell Tesseract.
+    """
+    original = source_dpi(img)
+    scale = 1.0
+    if original and original > dpi:
+        scale = dpi / original
+    if max_side and max(img.size) * scale > max_side:
+        scale = max_side / max(img.size)
+
+    effective = round(original * scale) if original else dpi
+    if scale >= 1.0:
+        return None, effective
+    return (max(1, round(img.width * scale)), max(1, round(img.height * scale))), effective
+
+def to_grayscale(img):
+    """8-bit grayscale, with transparent areas flattened onto white"""
+    if img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info):
+        img = img.convert('RGBA')
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    return img.convert('L')
+
+def otsu_threshold(histogram):
+    """Grey level that best separates a 256-bin histogram into two classes"""
+    total = sum(histogram)
+    if not total:
+        return 128
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+
+    best_level, best_variance = 0, -1.0
+    background = 0
+    weighted_background = 0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+# Local background window (radius in pixels), sized for text up to ~40px
+# high after downscaling
+CONTRAST_RADIUS = 12
+
+# Text polarity is decided on a 1/8 size copy over a ~56px window
+POLARITY_REDUCE = 8
+POLARITY_WINDOW = 7
+
+# Smallest difference from the surroundings that counts as ink
+MIN_CONTRAST = 16
+
+def light_text_mask(gray):
+    """
+    White where text is lighter than its background. Text is the minority
+    of a neighbourhood, so it pulls the mean away from the median (the
+    background colour): a mean above the median means light text.
+    """
+    small = gray.reduce(POLARITY_REDUCE) if min(gray.size) >= POLARITY_REDUCE * POLARITY_WINDOW else gray
+    median = small.filter(ImageFilter.MedianFilter(POLARITY_WINDOW))
+    mean = small.filter(ImageFilter.BoxBlur(POLARITY_WINDOW // 2))
+    mask = ImageChops.subtract(mean, median).point([255 if level > 0 else 0 for level in range(256)])
+    return mask.resize(gray.size)
+
+def binarize(gray):
+    """
+    Black text on white via a local threshold: a pixel is ink when it
+    stands out from its neighbourhood in the direction text does there,
+    lighter in dark mode and on coloured buttons, darker on light
+    backgrounds. A single global threshold loses white text on light
+    buttons and the gradients screenshots are full of.
+    """
+    background = gray.filter(ImageFilter.BoxBlur(CONTRAST_RADIUS))
+    lighter = ImageChops.subtract(gray, background)
+    darker = ImageChops.subtract(background, gray)
+    contrast = Image.composite(lighter, darker, light_text_mask(gray))
+
+    threshold = max(otsu_threshold(contrast.histogram()), MIN_CONTRAST)
+    return contrast.point([255 if level <= threshold else 0 for level in range(256)])
+
+def crop_to_text(img, margin=10):
+    """
+    Crop a black-on-white image to the box around its dark pixels (plus a
+    margin), dropping empty borders Tesseract would otherwise scan
+    """
+    box = ImageOps.invert(img).getbbox()
+    if box is None:
+        return img
+    left, top, right, bottom = box
+    box = (max(0, left - margin), max(0, top - margin),
+           min(img.width, right + margin), min(img.height, bottom + margin))
+    return img.crop(box)
+
+def preprocess_image(img, settings=None):
+    """
+    Prepare an image for Tesseract: downscale, grayscale, binarize and
+    optionally crop, as configured. Returns the image and the
+    pytesseract config string (page segmentation mode and resolution).
+    """
+    settings = settings or get_ocr_settings()
+    config = f"--psm {settings['psm']}"
+    if not settings['preprocess']:
+        return img, config
+
+    size, dpi = target_size(img, settings['dpi'], settings['max_side'])
+    if size:
+        # JPEGs can be decoded straight at 1/2, 1/4 or 1/8 size; no-op otherwise
+        img.draft('L', size)
+    # Grayscale first so the resize only has one channel to filter
+    img = to_grayscale(img)
+    if size:
+        # reducing_gap does the bulk of a large shrink with cheap box averaging
+        img = img.resize(size, Image.LANCZOS, reducing_gap=2.0)
+    if settings['binarize']:
+        img = binarize(img)
+        if settings['crop']:
+            img = crop_to_text(img)
+    return img, f"{config} --dpi {dpi}"
@@ -1,26 +1,43 @@
-import pytesseract
-from PIL import Image
 import io
-from preprocessing import clean_extracted_text
+import struct
+import threading
+from text_cleaner import clean_text
+from ocr_backend import image_to_string, tesseract_version
 import os
 
-def check_tesseract_installation():
+# Pillow (and ocr_preprocessing, built on it) is imported where images are
+# decoded: the app only needs it once someone uploads one
+
+# Result of the last Tesseract probe, shared by every OCR call in the process
+_tesseract_status = None
+_tesseract_status_lock = threading.Lock()
+
+def check_tesseract_installation(refresh=False):
     """
-    Check if Tesseract is properly installed
+    Check if Tesseract is properly installed.
+    The probe spawns a subprocess, so it runs once per process and is
+    cached; pass refresh=True to probe again (e.g. after installing it).
     """
-    try:
-        # Try to get Tesseract version
-        version = pytesseract.get_tesseract_version()
-        return True, f"Tesseract {version} is installed"
-    except Exception as e:
-        return False, str(e)
+    global _tesseract_status
+    
+    with _tesseract_status_lock:
+        if _tesseract_status is None or refresh:
+            try:
+                # Try to get Tesseract version
+                version = tesseract_version()
+                _tesseract_status = (True, f"Tesseract {version} is installed")
+            except Exception as e:
+                _tesseract_status = (False, str(e))
+        return _tesseract_status
 
-def extract_text_from_image(image):
+def extract_text_from_image(image, settings=None):
     """
-    Extract text from an uploaded image using OCR
+    Extract text from an uploaded image using OCR.
+    The image is downscaled, converted to black and white etc. first, see
+    ocr_preprocessing.get_ocr_settings() for `settings` and their defaults.
     """
     try:
-        # First check if Tesseract is installed
+        # First check if Tesseract is installed (probed once, then cached)
         tesseract_installed, message = check_tesseract_installation()
         
         if not tesseract_installed:
@@ -37,17 +54,23 @@ def extract_text_from_image(image):
             """)
             return ""
         
+        from PIL import Image
+        from ocr_preprocessing import preprocess_image
+        
         # Convert streamlit uploaded file to PIL Image
         if hasattr(image, 'read'):
             img = Image.open(io.BytesIO(image.read()))
         else:
             img = Image.open(image)
         
-        # Extract text using pytesseract
-        text = pytesseract.image_to_string(img)
+        # Smaller, high-contrast input is faster and less noisy to OCR
+        img, config = preprocess_image(img, settings)
+        
+        # Extract text with the resident engine, else the tesseract binary
+        text = image_to_string(img, config)
         
         # Clean the extracted text
-        cleaned_text = clean_extracted_text(text)
+        cleaned_text = clean_text(text)
         
         if not cleaned_text.strip():
             print("⚠️ No text could be extracted from the image. Please ensure the image contains clear, readable text.")
@@ -66,29 +89,137 @@ def extract_text_from_image(image):
         """)
         return ""
 
-def is_valid_image(image):
+def ocr_image_bytes(data):
     """
-    Check if the uploaded file is a valid image
+    OCR an image given as bytes; runs in the OCR worker processes
     """
-    try:
-        if hasattr(image, 'read'):
-            img = Image.open(io.BytesIO(image.read()))
+    return extract_text_from_image(io.BytesIO(data))
+
+# Magic bytes and dimensions are read from at most this many header bytes
+# (JPEG is walked segment by segment instead)
+HEADER_BYTES = 32
+
+def sniff_image_size(stream):
+    """
+    Return (format, width, height) from the image header alone, without
+    decoding any pixels, or None if the header is not a known image format
+    """
+    header = stream.read(HEADER_BYTES)
+    
+    if header.startswith(b'\x89PNG\r\n\x1a\n') and header[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', header[16:24])
+        return 'PNG', width, height
+    
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<HH', header[6:10])
+        return 'GIF', width, height
+    
+    if header.startswith(b'BM') and len(header) >= 26:
+        if struct.unpack('<I', header[14:18])[0] == 12:
+            width, height = struct.unpack('<HH', header[18:22])
         else:
-            img = Image.open(image)
+            width, height = struct.unpack('<ii', header[18:26])
+        return 'BMP', abs(width), abs(height)
+    
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP' and len(header) >= 30:
+        chunk = header[12:16]
+        if chunk == b'VP8X':
+            width = int.from_bytes(header[24:27], 'little') + 1
+            height = int.from_bytes(header[27:30], 'little') + 1
+            return 'WEBP', width, height
+        if chunk == b'VP8L' and header[20] == 0x2f:
+            bits = int.from_bytes(header[21:25], 'little')
+            return 'WEBP', (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+            width, height = struct.unpack('<HH', header[26:30])
+            return 'WEBP', width & 0x3fff, height & 0x3fff
+        return None
+    
+    if header.startswith(b'\xff\xd8'):
+        stream.seek(-len(header) + 2, io.SEEK_CUR)
+        size = sniff_jpeg_size(stream)
+        return ('JPEG',) + size if size else None
+    
+    return None
+
+# Start-of-frame markers, the segments that carry a JPEG's dimensions
+JPEG_SOF_MARKERS = {0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7, 0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf}
+
+def sniff_jpeg_size(stream):
+    """Walk JPEG segment headers (seeking over their payloads) up to the frame header"""
+    while True:
+        byte = stream.read(1)
+        if byte != b'\xff':
+            return None
+        while byte == b'\xff':
+            byte = stream.read(1)
+        if not byte:
+            return None
         
-        # Reset file pointer
-        if hasattr(image, 'seek'):
-            image.seek(0)
+        marker = byte[0]
+        if marker == 0x01 or 0xd0 <= marker <= 0xd7:
+            continue
+        if marker in (0xd9, 0xda):
+            # End of image or start of scan before any frame header
+            return None
         
-        return True
+        length = stream.read(2)
+        if len(length) < 2:
+            return None
+        if marker in JPEG_SOF_MARKERS:
+            frame = stream.read(5)
+            if len(frame) < 5:
+                return None
+            _, height, width = struct.unpack('>BHH', frame)
+            return width, height
+        stream.seek(struct.unpack('>H', length)[0] - 2, io.SEEK_CUR)
+
+def image_info(image):
+    """
+    (format, width, height) of an uploaded image or None if it is not one.
+    PNG, JPEG, GIF, BMP and WebP are recognised from their headers; other
+    formats fall back to Pillow, which also only parses the header here.
+    The stream position is left where it was.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, 'rb') as f:
+            return image_info(f)
+    
+    from PIL import Image
+    
+    stream = getattr(image, 'stream', image)
+    position = stream.tell()
+    try:
+        info = sniff_image_size(stream)
+        if info is None:
+            stream.seek(position)
+            with Image.open(stream) as img:
+                info = (img.format, img.width, img.height)
     except Exception:
-        return False
+        info = None
+    finally:
+        stream.seek(position)
+    
+    if info is None:
+        return None
+    
+    _, width, height = info
+    # Reject empty images and decompression bombs before anyone decodes them
+    if width <= 0 or height <= 0 or width * height > Image.MAX_IMAGE_PIXELS:
+        return None
+    return info
+
+def is_valid_image(image):
+    """
+    Check if the uploaded file is a valid image
+    """
+    return image_info(image) is not None
 
-def get_ocr_status():
+def get_ocr_status(refresh=False):
     """
     Get the current OCR status and provide helpful information
     """
-    installed, message = check_tesseract_installation()
+    installed, message = check_tesseract_installation(refresh)
     
     if installed:
         return True, f"✅ {message}"
@@ -0,0 +1,139 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from html_extractor import EXTRACTOR_VERSION
+
+CachedPage = namedtuple('CachedPage', ['text', 'etag', 'last_modified', 'fresh'])
+
+class PageCache:
+    def __init__(self, db_path, ttl=3600, max_bytes=64 * 1024 * 1024, version=EXTRACTOR_VERSION):
+        """
+        On-disk cache of extracted page text plus the HTTP validators
+        (ETag / Last-Modified) needed to revalidate it once `ttl` seconds
+        have passed. Total stored text is capped at `max_bytes`, evicting
+        least recently used pages first. Pages are keyed on the URL, the
+        extractor and `version`, so text from older extraction code is
+        never served (it ages out through the LRU).
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.version = version
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection()
+
+    def _connection(self):
+        # One connection per thread, never shared across a fork
+        if getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT NOT NULL, extractor TEXT NOT NULL, text TEXT NOT NULL, "
+                "etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL, "
+                "last_access REAL NOT NULL, size INTEGER NOT NULL, "
+                "PRIMARY KEY (url, extractor))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return self._local.conn
+
+    def _key(self, extractor):
+        return f'{extractor}/v{self.version}'
+
+    def get(self, url, extractor):
+        """Return a CachedPage (fresh or needing revalidation) or None"""
+        extractor = self._key(extractor)
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ? AND extractor = ?",
+                (url, extractor)
+            ).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            conn.execute("UPDATE pages SET last_access = ? WHERE url = ? AND extractor = ?", (now, url, extractor))
+            return CachedPage(row[0], row[1], row[2], now - row[3] < self.ttl)
+        except sqlite3.Error as e:
+            print(f"Page cache read error: {str(e)}")
+            return None
+
+    def put(self, url, extractor, text, etag=None, last_modified=None):
+        """Store freshly extracted text and its validators"""
+        extractor = self._key(extractor)
+        now = time.time()
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, extractor, text, etag, last_modified, now, now, size)
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"Page cache write error: {str(e)}")
+
+    def touch(self, url, extractor):
+        """The server answered 304 Not Modified: the cached text is fresh again"""
+        extractor = self._key(extractor)
+        now = time.time()
+        try:
+            self._connection().execute(
+                "UPDATE pages SET fetched_at = ?, last_access = ? WHERE url = ? AND extractor = ?",
+                (now, now, url, extractor)
+            )
+        except sqlite3.Error as e:
+            print(f"Page cache write error: {str(e)}")
+
+    def total_bytes(self):
+        return self._connection().execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def _evict(self, conn):
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+
+        # Walk pages from least recently used until enough bytes are freed
+        doomed = []
+        for url, extractor, size in conn.execute("SELECT url, extractor, size FROM pages ORDER BY last_access"):
+            doomed.append((url, extractor))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM pages WHERE url = ? AND extractor = ?", doomed)
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """
+    Process-wide page cache configured from SNIFTERN_PAGE_CACHE_* variables.
+    Off unless SNIFTERN_PAGE_CACHE_DB names the SQLite file to use
+    """
+    global _page_cache
+
+    db_path = os.environ.get('SNIFTERN_PAGE_CACHE_DB', '')
+    if not db_path:
+        return None
+
+    with _page_cache_lock:
+        if _page_cache is None or _page_cache.db_path != db_path:
+            _page_cache = PageCache(
+                db_path,
+                ttl=float(os.environ.get('SNIFTERN_PAGE_CACHE_TTL', 3600)),
+                max_bytes=int(float(os.environ.get('SNIFTERN_PAGE_CACHE_MB', 64)) * 1024 * 1024)
+            )
+        return _page_cache
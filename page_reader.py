@@ -0,0 +1,166 @@
+import codecs
+import os
+import re
+import threading
+import time
+from collections import deque
+from html_extractor import create_parser
+
+CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+# The HTML spec looks for <meta charset> within the first 1024 bytes
+SNIFF_BYTES = 1024
+
+class FetchStats:
+    def __init__(self, recent=100):
+        """Counters for streamed page downloads plus the most recent fetches"""
+        self.fetches = 0
+        self.bytes_read = 0
+        self.truncated = 0
+        self.stopped_early = 0
+        self.peak_buffered_chars = 0
+        self.recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def record(self, fetch):
+        with self._lock:
+            self.fetches += 1
+            self.bytes_read += fetch['bytes_read']
+            self.truncated += fetch['truncated']
+            self.stopped_early += fetch['stopped_early']
+            self.peak_buffered_chars = max(self.peak_buffered_chars, fetch['peak_buffered_chars'])
+            self.recent.append(fetch)
+
+    def stats(self):
+        """Totals and per-fetch records for the stats endpoint"""
+        with self._lock:
+            return {
+                'fetches': self.fetches,
+                'bytes_read': self.bytes_read,
+                'truncated': self.truncated,
+                'stopped_early': self.stopped_early,
+                'peak_buffered_chars': self.peak_buffered_chars,
+                'recent': list(self.recent)
+            }
+
+fetch_stats = FetchStats()
+
+def get_max_bytes():
+    """Download budget per page, from SNIFTERN_SCRAPER_MAX_BYTES (default 5 MB)"""
+    return int(os.environ.get('SNIFTERN_SCRAPER_MAX_BYTES', 5 * 1024 * 1024))
+
+def choose_encoding(response, head):
+    """
+    Byte order mark, then the Content-Type charset, then <meta charset>,
+    else UTF-8. Returns the codec name and `head` without its BOM.
+    """
+    from bs4.dammit import EncodingDetector
+
+    head, encoding = EncodingDetector.strip_byte_order_mark(head)
+    if not encoding:
+        match = CHARSET.search(response.headers.get('Content-Type', ''))
+        encoding = match.group(1) if match else None
+    if not encoding:
+        encoding = EncodingDetector.find_declared_encoding(head[:SNIFF_BYTES], is_html=True)
+
+    try:
+        return codecs.lookup(encoding or 'utf-8').name, head
+    except LookupError:
+        return 'utf-8', head
+
+def incremental_decoder(response, head):
+    encoding, head = choose_encoding(response, head)
+    return codecs.getincrementaldecoder(encoding)('replace'), head
+
+def read_page(response, max_bytes=None, extractor=None, chunk_size=64 * 1024):
+    """
+    Stream a response body instead of loading response.content.
+    At most `max_bytes` are read (after content decoding, so compressed
+    bombs are capped too) and decoded incrementally. Without an
+    `extractor` the decoded text is returned. With a
+    html_extractor.PageExtractor the chunks are parsed as they arrive,
+    so only the page's strings are held, and the download stops as soon
+    as the extractor's main content container has closed; its text is
+    returned. Every fetch is recorded in `fetch_stats`, with the most
+    decoded text held at once (peak_buffered_chars): the chunk being
+    consumed plus the text kept so far, by the caller's buffer or by the
+    extractor's scan. The bytes held back for encoding sniffing and the
+    parser's own lookahead are left out.
+    """
+    max_bytes = get_max_bytes() if max_bytes is None else max_bytes
+    start = time.perf_counter()
+
+    if extractor is not None:
+        scan = extractor.new_scan()
+        parser = create_parser(scan)
+        consume = parser.feed
+    else:
+        scan = None
+        pieces = []
+        consume = pieces.append
+
+    def held(text):
+        """Decoded characters held after consuming `text`"""
+        if scan is None:
+            nonlocal retained
+            retained += len(text)
+            return retained
+        return len(text) + scan.retained
+
+    bytes_read = 0
+    retained = 0
+    peak = 0
+    truncated = False
+    completed = False
+    head = b''
+    decoder = None
+
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+                truncated = True
+            bytes_read += len(chunk)
+
+            # Hold back the first bytes until the encoding can be sniffed
+            if decoder is None:
+                head += chunk
+                if len(head) < SNIFF_BYTES and not truncated:
+                    continue
+                decoder, chunk = incremental_decoder(response, head)
+                head = b''
+
+            text = decoder.decode(chunk)
+            if text:
+                consume(text)
+            peak = max(peak, held(text))
+
+            if truncated or (scan is not None and scan.finished):
+                break
+
+        if decoder is None:
+            decoder, head = incremental_decoder(response, head)
+        text = decoder.decode(head, final=True)
+        if text:
+            consume(text)
+        peak = max(peak, held(text))
+        completed = True
+    finally:
+        stopped_early = scan is not None and scan.finished
+        if truncated or stopped_early or not completed:
+            # Unread bytes cannot be drained cheaply: drop the connection
+            response.close()
+
+    fetch_stats.record({
+        'url': response.url,
+        'bytes_read': bytes_read,
+        'peak_buffered_chars': peak,
+        'truncated': truncated,
+        'stopped_early': stopped_early,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+    })
+
+    if scan is None:
+        return ''.join(pieces)
+    parser.close()
+    return extractor.finish(scan)
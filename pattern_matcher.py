@@ -0,0 +1,67 @@
+import re
+
+# Patterns made only of literal words joined by ".*" (e.g. r'pay.*for.*certificate')
+# can be answered with plain substring searches instead of the regex engine
+LITERAL_CHAIN = re.compile(r'^[\w ]+(?:\.\*[\w ]+)*$')
+
+class PatternMatcher:
+    def __init__(self, pattern_groups):
+        """
+        Compile a {pattern_type: [regex, ...]} rule set into a matcher that
+        scans a text once per distinct literal instead of once per regex
+        """
+        self.rules = []
+        self.literals = set()
+
+        for pattern_type, patterns in pattern_groups.items():
+            for pattern in patterns:
+                label = f"{pattern_type}: {pattern}"
+                if LITERAL_CHAIN.match(pattern):
+                    chain = tuple(pattern.split('.*'))
+                    self.rules.append((label, chain, None))
+                    self.literals.update(chain)
+                else:
+                    # Anything fancier than a literal chain keeps using re
+                    self.rules.append((label, None, re.compile(pattern)))
+
+    def scan(self, text):
+        """
+        Return the "pattern_type: pattern" labels matching the text, in rule order
+        """
+        # '.' never matches a newline, so a chain has to be found within one line
+        lines = text.split('\n') if '\n' in text else [text]
+
+        # Drop the literals that never occur; every chain using them is dead
+        present = {literal for literal in self.literals
+                   if any(literal in line for line in lines)}
+
+        # (line index, literal, start) -> position, shared by all chains
+        positions = {}
+        matches = []
+
+        for label, chain, regex in self.rules:
+            if regex is not None:
+                if regex.search(text):
+                    matches.append(label)
+            elif all(literal in present for literal in chain):
+                if any(self._chain_in_line(line, i, chain, positions) for i, line in enumerate(lines)):
+                    matches.append(label)
+
+        return matches
+
+    @staticmethod
+    def _chain_in_line(line, line_index, chain, positions):
+        """
+        Equivalent to re.search('a.*b.*c', line): taking the leftmost occurrence
+        of each literal after the previous one is always optimal
+        """
+        start = 0
+        for literal in chain:
+            key = (line_index, literal, start)
+            found = positions.get(key)
+            if found is None:
+                found = positions[key] = line.find(literal, start)
+            if found < 0:
+                return False
+            start = found + len(literal)
+        return True
@@ -1,25 +1,145 @@
 import re
 import html
-import pandas as pd
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+
+# BeautifulSoup is imported where it is used: the app never needs the parser
+# itself (only as a fallback) and importing bs4 costs ~100 ms at startup
+
+# Tags whose strings BeautifulSoup leaves out of get_text()
+HIDDEN_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Void elements BeautifulSoup closes as soon as they open
+EMPTY_ELEMENT_TAGS = {
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed',
+    'frame', 'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link',
+    'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr'
+}
+
+NUMERIC_CHARREF = re.compile(r'([0-9]+)(.*)', re.S)
+HEX_CHARREF = re.compile(r'([0-9a-fA-F]+)(.*)', re.S)
+
+def decode_charref(name):
+    """
+    Decode a numeric character reference as the HTML spec (and
+    BeautifulSoup) does: windows-1252 fixes for &#128;-&#159;, U+FFFD for
+    invalid code points, and any trailing non-digits kept as text
+    """
+    base, pattern = 10, NUMERIC_CHARREF
+    if name[:1] in 'xX':
+        name, base, pattern = name[1:], 16, HEX_CHARREF
+    
+    match = pattern.match(name)
+    if not match:
+        return name
+    number = int(match.group(1), base)
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        character = '\ufffd'
+    elif 0x80 <= number <= 0x9F:
+        # C1 controls were most likely meant as windows-1252 ("&#150;" for "–")
+        try:
+            character = bytes([number]).decode('cp1252')
+        except UnicodeDecodeError:
+            character = chr(number)
+    else:
+        character = chr(number)
+    return character + match.group(2)
+
+def decode_entityref(name):
+    """Decode a named entity; unknown names stay literal text"""
+    from bs4.dammit import EntitySubstitution
+    return EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, '&' + name)
+
+class TagStripper(HTMLParser):
+    """
+    Streaming equivalent of BeautifulSoup(text, 'html.parser').get_text():
+    it sees the same html.parser events but only keeps the visible strings
+    instead of building a tree
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.parts = []
+        self.open_tags = []
+        self.hidden_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in EMPTY_ELEMENT_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth += 1
+    
+    def handle_startendtag(self, tag, attrs):
+        pass
+    
+    def handle_endtag(self, tag):
+        # Like BeautifulSoup, close everything up to the most recent matching tag
+        if tag not in self.open_tags:
+            return
+        while True:
+            closed = self.open_tags.pop()
+            if closed in HIDDEN_TEXT_TAGS:
+                self.hidden_depth -= 1
+            if closed == tag:
+                break
+    
+    def handle_data(self, data):
+        if not self.hidden_depth:
+            self.parts.append(data)
+    
+    def handle_charref(self, name):
+        self.handle_data(decode_charref(name))
+    
+    def handle_entityref(self, name):
+        self.handle_data(decode_entityref(name))
+    
+    def unknown_decl(self, data):
+        # CDATA sections are the only declarations that count as text;
+        # BeautifulSoup turns an empty one into a single space
+        if data.upper().startswith('CDATA['):
+            self.parts.append(data[len('CDATA['):] or ' ')
+    
+    def get_text(self):
+        return ''.join(self.parts)
+
+def strip_html(text):
+    """
+    Return the visible text of an HTML fragment.
+    Plain text skips parsing entirely, markup goes through the streaming
+    TagStripper and BeautifulSoup is only used if that parser gives up.
+    """
+    if '<' not in text and '&' not in text:
+        return text
+    
+    try:
+        stripper = TagStripper()
+        stripper.feed(text)
+        stripper.close()
+        return stripper.get_text()
+    except Exception:
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(text, 'html.parser').get_text()
 
 def preprocess_text(text):
     """
     Clean and preprocess text by removing HTML tags, punctuation, 
     special characters, and converting to lowercase
     """
-    if pd.isna(text) or text == '':
-        return ''
+    # Convert to string if not already (training data can have NaN cells;
+    # pandas is only imported for those, the app always passes strings)
+    if not isinstance(text, str):
+        import pandas as pd
+        if pd.isna(text):
+            return ''
+        text = str(text)
     
-    # Convert to string if not already
-    text = str(text)
+    if text == '':
+        return ''
     
     # Decode HTML entities
     text = html.unescape(text)
     
-    # Remove HTML tags using BeautifulSoup
-    soup = BeautifulSoup(text, 'html.parser')
-    text = soup.get_text()
+    # Remove HTML tags
+    text = strip_html(text)
     
     # Convert to lowercase
     text = text.lower()
@@ -34,19 +154,3 @@ def preprocess_text(text):
     text = text.strip()
     
     return text
-
-def clean_extracted_text(text):
-    """
-    Clean text extracted from OCR or web scraping
-    """
-    if not text or text.strip() == '':
-        return ''
-    
-    # Basic cleaning
-    text = text.strip()
-    
-    # Remove excessive newlines and spaces
-    text = re.sub(r'\n+', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip() 
\ No newline at end of file
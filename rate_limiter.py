@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+# (requests per second, burst) per platform from scraping_utils.get_platform_from_url
+PLATFORM_RATES = {
+    'linkedin': (0.5, 2),
+    'indeed': (1.0, 3),
+    'glassdoor': (0.5, 2),
+    'unknown': (2.0, 5)
+}
+
+class RateLimitExceeded(Exception):
+    """The host's queue is longer than the caller may wait; retry after `retry_after` seconds"""
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.monotonic, max_wait=None):
+        """
+        Refills `rate` tokens per second up to `capacity`. Reservations
+        that would wait longer than `max_wait` seconds are refused
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.max_wait = max_wait
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token and return how long the caller must wait before using
+        it (0 while the bucket has budget). The balance may go negative so
+        concurrent callers queue up instead of racing for the next token,
+        but only up to max_wait: past that the token is handed back and
+        RateLimitExceeded raised.
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            if self.max_wait is not None and wait > self.max_wait:
+                self.tokens += 1
+                raise RateLimitExceeded(f"Rate limited: next slot in {wait:.1f}s", wait - self.max_wait)
+            return wait
+
+class HostRateLimiter:
+    def __init__(self, rates=None, clock=time.monotonic, sleep=time.sleep, max_wait=None):
+        """
+        One token bucket per host, sized by the host's platform; callers
+        never wait more than `max_wait` seconds (see TokenBucket)
+        """
+        self.rates = dict(PLATFORM_RATES)
+        self.rates.update(rates or {})
+        self.clock = clock
+        self.sleep = sleep
+        self.max_wait = max_wait
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url, platform='unknown'):
+        host = urlsplit(url).netloc.lower()
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, capacity = self.rates.get(platform, self.rates['unknown'])
+                bucket = self._buckets[host] = TokenBucket(rate, capacity, self.clock, self.max_wait)
+            return bucket
+
+    def acquire(self, url, platform='unknown'):
+        """
+        Block only while the host's budget is exhausted; returns the seconds
+        waited. Raises RateLimitExceeded instead of waiting past max_wait
+        """
+        wait = self.bucket_for(url, platform).reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+def rates_from_environment():
+    """
+    Per-platform overrides such as SNIFTERN_RATE_LINKEDIN=0.2:1
+    (requests per second, burst)
+    """
+    rates = {}
+    for platform in PLATFORM_RATES:
+        value = os.environ.get(f'SNIFTERN_RATE_{platform.upper()}')
+        if value:
+            rate, _, burst = value.partition(':')
+            rates[platform] = (float(rate), float(burst or 1))
+    return rates
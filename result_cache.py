@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    def __init__(self, max_size=2048, ttl=3600, db_path=None, db_max_size=100000):
+        """
+        Cache of analysis results keyed by text hash and model version.
+        Entries live in a per-process LRU (bounded by max_size, expiring after
+        ttl seconds); with db_path set they are also written to a SQLite file
+        so every gunicorn worker on the host can reuse them.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.db_path = db_path
+        self.db_max_size = db_max_size
+
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self._connect()
+
+    @staticmethod
+    def normalize(text):
+        """
+        Only normalize what cannot change a verdict: surrounding whitespace
+        and line endings
+        """
+        return text.replace('\r\n', '\n').strip()
+
+    def make_key(self, text, version):
+        """Content address of a text for a given model version"""
+        digest = hashlib.sha256()
+        digest.update(version.encode())
+        digest.update(b'\0')
+        digest.update(self.normalize(text).encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached value or None, counting hits and misses"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        value = self._db_get(key, now) if self.db_path else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.shared_hits += 1
+                self._store(key, value, now)
+
+        return value
+
+    def set(self, key, value):
+        """Cache a JSON-serializable value"""
+        now = time.time()
+
+        with self._lock:
+            self._store(key, value, now)
+
+        if self.db_path:
+            self._db_set(key, value, now)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+        if self.db_path:
+            self._connection().execute("DELETE FROM results")
+
+    def stats(self):
+        """Hit/miss counters for the stats endpoint"""
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'shared_backend': self.db_path
+            }
+
+    def _store(self, key, value, now):
+        # Caller holds the lock
+        self._entries[key] = (now + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _connect(self):
+        """Open (and on first use create) this thread's SQLite connection"""
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _connection(self):
+        # SQLite connections must not cross a fork, so each worker opens its own
+        if getattr(self._local, 'pid', None) != os.getpid():
+            return self._connect()
+        return self._local.conn
+
+    def _db_get(self, key, now):
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT value, expires_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            print(f"Result cache read error: {str(e)}")
+            return None
+
+    def _db_set(self, key, value, now):
+        try:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl, now)
+            )
+            # Every so often trim least recently used rows beyond the cap
+            self._local.writes = getattr(self._local, 'writes', 0) + 1
+            if self._local.writes % 100:
+                return
+            count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.db_max_size:
+                conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY last_access LIMIT ?)",
+                    (count - self.db_max_size,)
+                )
+        except sqlite3.Error as e:
+            print(f"Result cache write error: {str(e)}")
+
+def create_result_cache():
+    """Build the cache from SNIFTERN_CACHE_* environment variables"""
+    return ResultCache(
+        max_size=int(os.environ.get('SNIFTERN_CACHE_SIZE', 2048)),
+        ttl=float(os.environ.get('SNIFTERN_CACHE_TTL', 3600)),
+        db_path=os.environ.get('SNIFTERN_CACHE_DB') or None
+    )
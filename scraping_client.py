@@ -0,0 +1,114 @@
+import os
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from rate_limiter import HostRateLimiter, RateLimitExceeded, rates_from_environment
+
+# Statuses worth retrying with backoff: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class CappedRetry(Retry):
+    def __init__(self, *args, max_retry_after=10, **kwargs):
+        """
+        Retry that honours Retry-After only up to max_retry_after seconds:
+        the wait happens inline in the request thread, so a server asking
+        for an hour must not park it for an hour
+        """
+        super().__init__(*args, **kwargs)
+        self.max_retry_after = max_retry_after
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def get_retry_after(self, response):
+        seconds = super().get_retry_after(response)
+        if seconds is None:
+            return None
+        return min(seconds, self.max_retry_after)
+
+class ScrapingClient:
+    def __init__(self, pool_size=10, retries=3, backoff_factor=0.5, rate_limiter=None, max_retry_after=10):
+        """
+        HTTP client for the scrapers: one keep-alive requests.Session per
+        host, with a bounded connection pool, retries with exponential
+        backoff on 429/5xx (Retry-After is honoured up to max_retry_after
+        seconds) and an optional per-host rate limiter
+        """
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_retry_after = max_retry_after
+        self.rate_limiter = rate_limiter
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the pooled session for the URL's scheme and host"""
+        parts = urlsplit(url)
+        host = f'{parts.scheme}://{parts.netloc}'.lower()
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = self._create_session()
+            return session
+
+    def _create_session(self):
+        retry = CappedRetry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+            max_retry_after=self.max_retry_after
+        )
+        # A few pools per session so redirects to sibling hosts are pooled too
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get(self, url, headers=None, timeout=20, platform='unknown', **kwargs):
+        """GET through the host's pooled session, waiting only if the host is over budget"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url, platform)
+        return self.session_for(url).get(url, headers=headers, timeout=timeout, **kwargs)
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def get_client():
+    """Process-wide client configured from SNIFTERN_SCRAPER_* environment variables"""
+    global _default_client
+
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = ScrapingClient(
+                pool_size=int(os.environ.get('SNIFTERN_SCRAPER_POOL_SIZE', 10)),
+                retries=int(os.environ.get('SNIFTERN_SCRAPER_RETRIES', 3)),
+                backoff_factor=float(os.environ.get('SNIFTERN_SCRAPER_BACKOFF', 0.5)),
+                max_retry_after=float(os.environ.get('SNIFTERN_SCRAPER_MAX_RETRY_AFTER', 10)),
+                rate_limiter=HostRateLimiter(rates_from_environment(),
+                                             max_wait=float(os.environ.get('SNIFTERN_RATE_MAX_WAIT', 30)))
+            )
+        return _default_client
+
+def fetch(url, headers=None, timeout=20, platform='unknown', **kwargs):
+    """GET a page through the shared, rate-limited scraping client"""
+    return get_client().get(url, headers=headers, timeout=timeout, platform=platform, **kwargs)
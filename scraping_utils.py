@@ -1,79 +1,24 @@
 import requests
-from bs4 import BeautifulSoup
-from preprocessing import clean_extracted_text
-import time
-import random
+from contextlib import nullcontext
+from text_cleaner import clean_text
+from scraping_client import fetch, ACCEPT_ENCODING, RateLimitExceeded
+from page_cache import get_page_cache
+from html_extractor import PageExtractor
+from page_reader import read_page
 
 def extract_text_from_url(url):
     """
     Extract text from a webpage URL with enhanced scraping capabilities
     """
     try:
-        # Enhanced headers to mimic a real browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        }
-        
-        # Add a small delay to be respectful
-        time.sleep(random.uniform(1, 3))
-        
-        # Make the request with longer timeout
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-        
-        # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script, style, and other non-content elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe']):
-            element.decompose()
-        
-        # Try to find main content area
-        main_content = None
-        
-        # Common selectors for main content
-        content_selectors = [
-            'main',
-            'article',
-            '.main-content',
-            '.content',
-            '.post-content',
-            '.entry-content',
-            '#content',
-            '#main',
-            '.job-description',
-            '.job-content'
-        ]
-        
-        for selector in content_selectors:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        # If no main content found, use body
-        if not main_content:
-            main_content = soup.find('body')
-        
-        # Extract text
-        if main_content:
-            text = main_content.get_text(separator=' ', strip=True)
-        else:
-            text = soup.get_text(separator=' ', strip=True)
-        
-        # Clean the extracted text
-        cleaned_text = clean_extracted_text(text)
-        
-        return cleaned_text
+        # Browser-like headers for the detected platform, pooled and rate
+        # limited per host; unchanged pages come from the page cache
+        platform = get_platform_from_url(url)
+        return fetch_and_extract(url, platform, MAIN_TEXT_EXTRACTOR, timeout=20)
     
+    except RateLimitExceeded:
+        # Not a fetch failure: the caller answers 429 and the client retries
+        raise
     except requests.exceptions.RequestException as e:
         print(f"Error fetching URL: {str(e)}")
         return ""
@@ -81,6 +26,114 @@ def extract_text_from_url(url):
         print(f"Error extracting text from URL: {str(e)}")
         return ""
 
+# Common selectors for main content
+CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '.main-content',
+    '.content',
+    '.post-content',
+    '.entry-content',
+    '#content',
+    '#main',
+    '.job-description',
+    '.job-content'
+]
+
+class MainTextExtractor(PageExtractor):
+    """Main content area of any page, else its body, else the whole page"""
+    def __init__(self):
+        # The first <main> outside nav/header/... wins over everything
+        # after it, so the download can stop once it has closed
+        super().__init__('main_text', CONTENT_SELECTORS + ['body'], stop_selector=CONTENT_SELECTORS[0])
+    
+    def finish(self, scan):
+        # Script, style, and other non-content elements are left out
+        main_content = None
+        for index in range(len(self.selectors)):
+            main_content = scan.first(index, include_skipped=False)
+            if main_content:
+                break
+        
+        if not main_content:
+            main_content = scan.document
+        
+        # Extract and clean the text
+        text = main_content.text(separator=' ', include_skipped=False)
+        return clean_text(text)
+
+MAIN_TEXT_EXTRACTOR = MainTextExtractor()
+
+def extract_main_text_from_html(html, platform=None):
+    """
+    Extract the main text content from an already fetched page
+    """
+    return MAIN_TEXT_EXTRACTOR(html)
+
+def fetch_page(url, platform, extractor, timeout=25, client=None):
+    """
+    Fetch a page through the page cache.
+    Returns (text, None) when the cached text can be used as is (fresh, or
+    the server answered 304 Not Modified) and (None, response) when the
+    page still has to be read and extracted
+    """
+    cache = get_page_cache()
+    cached = cache.get(url, extractor) if cache else None
+    if cached and cached.fresh:
+        return cached.text, None
+    
+    headers = get_platform_headers(platform)
+    if cached:
+        if cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+    
+    get = client.get if client else fetch
+    # Streamed: the body is read (and capped) by page_reader.read_page
+    response = get(url, headers=headers, timeout=timeout, platform=platform, stream=True)
+    if cached and response.status_code == 304:
+        response.close()
+        cache.touch(url, extractor)
+        return cached.text, None
+    
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    return None, response
+
+def store_page(url, extractor, response, text):
+    """Remember the extracted text of a downloaded page with its validators"""
+    cache = get_page_cache()
+    if cache and text:
+        cache.put(url, extractor, text,
+                  etag=response.headers.get('ETag'),
+                  last_modified=response.headers.get('Last-Modified'))
+
+def fetch_and_extract(url, platform, extract, timeout=25, client=None, stage=None):
+    """
+    Fetch `url` and extract its text with `extract`: a PageExtractor, which
+    parses the page while it streams in and may stop the download early,
+    or a plain extract(html, platform) function. Both the download and the
+    parse are skipped when the page cache already holds the result.
+    `stage`, if given, is called with 'fetch' and 'extract' for a context
+    manager around each step (AnalysisPipeline.stage times them).
+    """
+    stage = stage or (lambda name: nullcontext())
+    name = getattr(extract, 'name', None) or extract.__name__
+    with stage('fetch'):
+        text, response = fetch_page(url, platform, name, timeout=timeout, client=client)
+    if response is None:
+        return text
+    
+    with stage('extract'):
+        if isinstance(extract, PageExtractor):
+            text = read_page(response, extractor=extract)
+        else:
+            text = extract(read_page(response), platform)
+        store_page(url, name, response, text)
+    return text
+
 def is_valid_url(url):
     """
     Enhanced URL validation
@@ -152,31 +205,26 @@ def extract_job_content_enhanced(url):
     platform = get_platform_from_url(url)
     
     try:
-        # Platform-specific headers
-        headers = get_platform_headers(platform)
-        
-        # Add delay for rate limiting
-        time.sleep(random.uniform(2, 4))
-        
-        response = requests.get(url, headers=headers, timeout=25)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Platform-specific content extraction
-        if platform == 'linkedin':
-            return extract_linkedin_content(soup)
-        elif platform == 'indeed':
-            return extract_indeed_content(soup)
-        elif platform == 'glassdoor':
-            return extract_glassdoor_content(soup)
-        else:
-            return extract_generic_content(soup)
+        # Platform-specific headers, rate limited per host by the scraping
+        # client; unchanged pages come from the page cache
+        return fetch_and_extract(url, platform, job_content_extractor(platform))
             
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         print(f"Enhanced extraction error for {platform}: {str(e)}")
         return ""
 
+def extract_job_content_from_html(html, platform):
+    """
+    Platform-specific content extraction from an already fetched page
+    """
+    return job_content_extractor(platform)(html)
+
+def job_content_extractor(platform):
+    """The PageExtractor for a platform's job postings"""
+    return JOB_CONTENT_EXTRACTORS.get(platform, JOB_CONTENT_EXTRACTORS['generic'])
+
 def get_platform_headers(platform):
     """
     Get platform-specific headers
@@ -185,7 +233,8 @@ def get_platform_headers(platform):
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
+        # Only advertise encodings urllib3 can actually decode (br needs brotli)
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
         'Sec-Fetch-Dest': 'document',
@@ -213,77 +262,97 @@ def get_platform_headers(platform):
     
     return base_headers
 
-def extract_linkedin_content(soup):
-    """Extract content from LinkedIn job postings"""
-    selectors = [
-        '.job-description',
-        '.show-more-less-html__markup',
-        '.job-description__content',
-        '[data-job-description]',
-        '.job-description__text',
-        '.description__text',
-        '.job-description-content',
-        '.job-description__content--rich-text'
-    ]
+LINKEDIN_SELECTORS = [
+    '.job-description',
+    '.show-more-less-html__markup',
+    '.job-description__content',
+    '[data-job-description]',
+    '.job-description__text',
+    '.description__text',
+    '.job-description-content',
+    '.job-description__content--rich-text'
+]
+
+INDEED_SELECTORS = [
+    '#jobDescriptionText',
+    '.job-description',
+    '[data-testid="job-description"]',
+    '.jobsearch-jobDescriptionText',
+    '.job-description-container',
+    '.jobsearch-jobDescriptionText--container'
+]
+
+GLASSDOOR_SELECTORS = [
+    '.jobDescriptionContent',
+    '.job-description',
+    '[data-testid="job-description"]',
+    '.desc',
+    '.job-description-content',
+    '.job-description__content'
+]
+
+GENERIC_SELECTORS = [
+    '.job-description',
+    '.job-content',
+    '.post-content',
+    '.entry-content',
+    '.content',
+    'main',
+    'article'
+]
+
+class SelectorExtractor(PageExtractor):
+    """
+    Text of the first selector with substantial content, else the main
+    content without navigation, scripts, and other non-content elements
+    """
+    fallback_selectors = ['main', 'article', 'body']
+    
+    def __init__(self, name, selectors):
+        # No early stop: every match of a selector is joined, and a later
+        # match can still change which selector wins
+        super().__init__(name, selectors + self.fallback_selectors)
+        self.count = len(selectors)
     
-    return extract_with_selectors(soup, selectors)
+    def finish(self, scan):
+        for index in range(self.count):
+            elements = scan.matches[index]
+            if elements:
+                text = ' '.join([elem.text() for elem in elements])
+                if text and len(text) > 100:  # Ensure we have substantial content
+                    return clean_text(text)
+        
+        # Fallback: try to find any substantial text content
+        for index in range(self.count, len(self.selectors)):
+            main_content = scan.first(index, include_skipped=False)
+            if main_content:
+                return clean_text(main_content.text(include_skipped=False))
+        
+        return ""
 
-def extract_indeed_content(soup):
+JOB_CONTENT_EXTRACTORS = {
+    'linkedin': SelectorExtractor('linkedin_content', LINKEDIN_SELECTORS),
+    'indeed': SelectorExtractor('indeed_content', INDEED_SELECTORS),
+    'glassdoor': SelectorExtractor('glassdoor_content', GLASSDOOR_SELECTORS),
+    'generic': SelectorExtractor('generic_content', GENERIC_SELECTORS)
+}
+
+def extract_linkedin_content(html):
+    """Extract content from LinkedIn job postings"""
+    return JOB_CONTENT_EXTRACTORS['linkedin'](html)
+
+def extract_indeed_content(html):
     """Extract content from Indeed job postings"""
-    selectors = [
-        '#jobDescriptionText',
-        '.job-description',
-        '[data-testid="job-description"]',
-        '.jobsearch-jobDescriptionText',
-        '.job-description-container',
-        '.jobsearch-jobDescriptionText--container'
-    ]
-    
-    return extract_with_selectors(soup, selectors)
+    return JOB_CONTENT_EXTRACTORS['indeed'](html)
 
-def extract_glassdoor_content(soup):
+def extract_glassdoor_content(html):
     """Extract content from Glassdoor job postings"""
-    selectors = [
-        '.jobDescriptionContent',
-        '.job-description',
-        '[data-testid="job-description"]',
-        '.desc',
-        '.job-description-content',
-        '.job-description__content'
-    ]
-    
-    return extract_with_selectors(soup, selectors)
+    return JOB_CONTENT_EXTRACTORS['glassdoor'](html)
 
-def extract_generic_content(soup):
+def extract_generic_content(html):
     """Extract content from generic job postings"""
-    selectors = [
-        '.job-description',
-        '.job-content',
-        '.post-content',
-        '.entry-content',
-        '.content',
-        'main',
-        'article'
-    ]
-    
-    return extract_with_selectors(soup, selectors)
+    return JOB_CONTENT_EXTRACTORS['generic'](html)
 
-def extract_with_selectors(soup, selectors):
-    """Extract content using multiple selectors"""
-    for selector in selectors:
-        elements = soup.select(selector)
-        if elements:
-            text = ' '.join([elem.get_text(strip=True) for elem in elements])
-            if text and len(text) > 100:  # Ensure we have substantial content
-                return clean_extracted_text(text)
-    
-    # Fallback: try to find any substantial text content
-    for element in soup(['nav', 'footer', 'header', 'script', 'style', 'aside', 'iframe']):
-        element.decompose()
-    
-    main_content = soup.find('main') or soup.find('article') or soup.find('body')
-    if main_content:
-        text = main_content.get_text(strip=True)
-        return clean_extracted_text(text)
-    
-    return "" 
\ No newline at end of file
+def extract_with_selectors(html, selectors):
+    """Extract content using multiple selectors, all matched in a single pass"""
+    return SelectorExtractor('selectors', selectors)(html)
@@ -167,6 +167,30 @@ async function extractFromUrl() {
     }
 }
 
+// Known companies named in the posting (company_check in analysis responses)
+function companyCheckHtml(data) {
+    if (!data.company_check || data.company_check.companies.length === 0) {
+        return '';
+    }
+    
+    let html = `
+            <div class="pattern-matches">
+                <h4><i class="fas fa-building"></i> Companies in Our Database</h4>
+                <ul class="pattern-list">
+        `;
+    
+    data.company_check.companies.forEach(company => {
+        const status = company.is_fraud ? 'Reported as fraudulent' : 'No fraud reports';
+        html += `<li>${company.name} (${status}, fraud score ${company.fraud_score}/100)</li>`;
+    });
+    
+    html += `
+                </ul>
+            </div>
+        `;
+    return html;
+}
+
 // Display job analysis results
 function displayJobResults(data, extractedText = null) {
     const resultsDiv = document.getElementById('results');
@@ -211,6 +235,8 @@ function displayJobResults(data, extractedText = null) {
         `;
     }
     
+    html += companyCheckHtml(data);
+    
     if (extractedText) {
         html += `
             <div class="detail-item" style="margin-top: 1rem;">
@@ -566,6 +592,8 @@ function displayIntegrationResults(data, platform, extractedText = null) {
         `;
     }
     
+    html += companyCheckHtml(data);
+    
     if (extractedText) {
         html += `
             <div class="detail-item" style="margin-top: 1rem;">
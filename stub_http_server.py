@@ -0,0 +1,81 @@
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading a response early are expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+class StubHTTPServer:
+    def __init__(self, routes=None):
+        """
+        Local HTTP/1.1 server for scraping tests and benchmarks.
+        `routes` maps a path to a (status, headers, body) tuple or to a
+        callable taking the request handler and returning one.
+        Counts requests and distinct TCP connections.
+        """
+        self.routes = routes or {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append((self.path, dict(self.headers)))
+
+                route = stub.routes.get(self.path.split('?')[0])
+                if route is None:
+                    status, headers, body = 404, {}, b'not found'
+                elif callable(route):
+                    status, headers, body = route(self)
+                else:
+                    status, headers, body = route
+
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+
+                self.send_response(status)
+                headers = dict(headers)
+                headers.setdefault('Content-Type', 'text/html; charset=utf-8')
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = QuietHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url(self, path):
+        return self.base_url + path
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,60 @@
+import os
+from stub_http_server import StubHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+
+def load_fixture(platform):
+    with open(os.path.join(FIXTURES, f'{platform}.html'), encoding='utf-8') as f:
+        return f.read()
+
+def test_platform_routes_are_generated():
+    """Every registered platform gets its /analyze_<name> route with the usual checks"""
+    print("Testing Analysis Pipeline")
+    print("=" * 50)
+
+    from app import app, PLATFORMS
+
+    client = app.test_client()
+    routes = {rule.rule for rule in app.url_map.iter_rules()}
+    for name, platform in PLATFORMS.items():
+        assert f'/analyze_{name}' in routes
+        response = client.post(f'/analyze_{name}', json={})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == f'No {platform.label} URL provided'
+        response = client.post(f'/analyze_{name}', json={f'{name}_url': 'https://example.com/job/1'})
+        assert response.get_json()['error'] == f'Please provide a valid {platform.label} job posting URL'
+
+def test_platform_route_runs_all_stages():
+    """A fetched posting is analyzed exactly like the same text sent to /detect"""
+    from app import app, PLATFORMS, analyze_text, pipeline
+
+    os.environ['SNIFTERN_PAGE_CACHE_DB'] = ''
+    try:
+        html = load_fixture('indeed')
+        with StubHTTPServer({'/indeed.com/viewjob': (200, {'Content-Type': 'text/html'}, html)}) as server:
+            before = pipeline.stats()
+            client = app.test_client()
+            data = client.post('/analyze_indeed', json={'indeed_url': server.url('/indeed.com/viewjob')}).get_json()
+            after = pipeline.stats()
+
+            text = PLATFORMS['indeed'].extractor(html)
+            assert data == dict(analyze_text(text), success=True, source='Indeed')
+            for stage in ('fetch', 'extract'):
+                assert after[stage]['items'] == before[stage]['items'] + 1, stage
+
+            # Pages that cannot be fetched report a blocked scrape
+            response = client.post('/analyze_indeed', json={'indeed_url': server.url('/indeed.com/missing')})
+            assert response.status_code == 400
+            assert 'Indeed may have blocked automated access' in response.get_json()['error']
+    finally:
+        del os.environ['SNIFTERN_PAGE_CACHE_DB']
+
+    stats = app.test_client().get('/pipeline_stats').get_json()
+    assert set(stats) == {'fetch', 'extract', 'normalize', 'score', 'analyze'}
+    assert all(stats[stage]['items'] > 0 for stage in stats)
+
+    print("✅ Platform routes share one staged pipeline")
+
+if __name__ == "__main__":
+    test_platform_routes_are_generated()
+    test_platform_route_runs_all_stages()
@@ -0,0 +1,58 @@
+from app import app, get_predictor
+
+SAMPLE_TEXTS = [
+    "Software Engineering Internship at Microsoft. We are looking for talented students to join our team. Requirements: Currently pursuing Computer Science degree, knowledge of Python/Java. Benefits include competitive stipend and mentorship.",
+    "Virtual Internship Opportunity! You need to pay $50 for the certificate upon completion. No experience required. Limited time offer!",
+    "",
+    "Data Entry Clerk - Immediate Start. We need someone to process payments and transfer funds. Commission based.",
+    "<p>Marketing intern wanted for our <b>growing</b> team. Strategy, analysis and project work.</p>"
+]
+
+def test_predict_many():
+    """predict_many must give the same answers as calling predict one by one"""
+    print("Testing Batch Prediction")
+    print("=" * 50)
+
+    predictor = get_predictor()
+    batch = predictor.predict_many(SAMPLE_TEXTS)
+    assert len(batch) == len(SAMPLE_TEXTS)
+
+    for text, batch_result in zip(SAMPLE_TEXTS, batch):
+        single_result = predictor.predict(text)
+        assert batch_result[0] == single_result[0]
+        assert abs(batch_result[1] - single_result[1]) < 1e-9
+        assert batch_result[2:] == single_result[2:]
+        print(f"{text[:40]!r:45} -> {batch_result[0]} ({batch_result[1]:.1f}%)")
+
+    assert predictor.get_prediction_results(SAMPLE_TEXTS) == [predictor.get_prediction_result(t) for t in SAMPLE_TEXTS]
+
+def test_detect_batch_endpoint():
+    """/detect_batch keeps input order and isolates bad items"""
+    client = app.test_client()
+
+    items = SAMPLE_TEXTS + [None, {'text': SAMPLE_TEXTS[1]}]
+    response = client.post('/detect_batch', json=items)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == len(items)
+
+    results = data['results']
+    assert results[2] == {'error': 'No text provided'}
+    assert results[5] == {'error': 'No text provided'}
+
+    # Every valid item matches the single-posting endpoint
+    for index in (0, 1, 3, 4):
+        single = client.post('/detect', json={'text': SAMPLE_TEXTS[index]}).get_json()
+        assert results[index] == single
+    assert results[6] == results[1]
+
+    # {"texts": [...]} is accepted too, bad payloads are rejected
+    assert client.post('/detect_batch', json={'texts': SAMPLE_TEXTS[:1]}).status_code == 200
+    assert client.post('/detect_batch', json=[]).status_code == 400
+    assert client.post('/detect_batch', json={'text': 'not a list'}).status_code == 400
+
+    print("✅ /detect_batch returns ordered, isolated results")
+
+if __name__ == "__main__":
+    test_predict_many()
+    test_detect_batch_endpoint()
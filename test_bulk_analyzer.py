@@ -0,0 +1,173 @@
+import json
+import threading
+import time
+from bulk_analyzer import get_pool, iter_analyze_urls
+from page_reader import fetch_stats
+from scraping_client import ScrapingClient
+from scraping_utils import extract_job_content_from_html
+from stub_http_server import StubHTTPServer
+
+def job_page(i):
+    description = f"Remote internship number {i}. Pay the certificate fee to get started. " * 5
+    return f"<html><body><nav>menu</nav><div class='job-content'>{description}</div></body></html>"
+
+class SlowPages:
+    """Stub route that records how many requests are in flight at once"""
+    def __init__(self, delay):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, handler):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        i = int(handler.path.rsplit('=', 1)[-1])
+        return 200, {}, job_page(i)
+
+def test_bulk_analysis_against_stub_server():
+    """Every URL gets exactly one result; fetches are bounded and overlap"""
+    print("Testing Bulk URL Analyzer")
+    print("=" * 50)
+
+    pages = SlowPages(delay=0.05)
+    batches = []
+
+    def analyze(texts):
+        batches.append(len(texts))
+        return [{'result': 'Likely FAKE ❌' if 'certificate' in text else 'Likely REAL ✅',
+                 'word_count': len(text.split())} for text in texts]
+
+    with StubHTTPServer({'/job': pages, '/gone': (404, {}, 'missing')}) as server:
+        urls = [server.url(f'/job?id={i}') for i in range(40)]
+        urls += [server.url('/gone'), 'not-a-url']
+
+        start = time.perf_counter()
+        results = list(iter_analyze_urls(
+            urls, analyze,
+            client=ScrapingClient(pool_size=8),
+            concurrency=8,
+            per_host=4,
+            batch_size=16
+        ))
+        elapsed = time.perf_counter() - start
+
+    assert sorted(result['index'] for result in results) == list(range(len(urls)))
+    by_index = {result['index']: result for result in results}
+
+    for i in range(40):
+        assert by_index[i]['url'] == urls[i]
+        assert by_index[i]['result'] == 'Likely FAKE ❌'
+    assert '404' in by_index[40]['error']
+    assert by_index[41]['error'] == 'Invalid URL format'
+
+    # Bounded by the per-host limit, yet far faster than 40 serial fetches
+    assert pages.peak <= 4
+    assert elapsed < 40 * pages.delay
+    assert sum(batches) == 40 and max(batches) <= 16
+
+    print(f"42 URLs in {elapsed:.2f}s, peak in-flight {pages.peak}, scoring batches {batches}")
+
+def collect_within(seconds, urls, analyze, **options):
+    """list(iter_analyze_urls(...)), failing instead of hanging if it never finishes"""
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(iter_analyze_urls(urls, analyze, **options)), daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "bulk analysis hung"
+    return results
+
+def test_failed_batches_still_answer_every_url():
+    """Short or malformed scoring batches give an error per URL instead of hanging"""
+    with StubHTTPServer({'/job': (200, {}, job_page(1))}) as server:
+        urls = [server.url(f'/job?id={i}') for i in range(5)]
+        client = ScrapingClient()
+
+        for analyze in (lambda texts: [], lambda texts: [None] * len(texts)):
+            results = collect_within(10, urls, analyze, client=client, batch_size=2)
+            assert sorted(result['index'] for result in results) == list(range(5))
+            assert all(result['url'] == urls[result['index']] and result['error'] for result in results)
+
+def test_concurrent_runs_share_the_pools():
+    """Simultaneous bulk requests queue on one set of fetch threads instead of each adding their own"""
+    pages = SlowPages(delay=0.05)
+    with StubHTTPServer({'/job': pages}) as server:
+        runs = [[server.url(f'/job?run={run}&id={i}') for i in range(8)] for run in range(3)]
+        results = []
+        threads = [threading.Thread(target=lambda urls=urls: results.append(collect_within(
+            30, urls, lambda texts: [{} for _ in texts], client=ScrapingClient(), concurrency=2, per_host=8)))
+            for urls in runs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(len(run) for run in results) == [8, 8, 8]
+    assert pages.peak <= 2
+    assert get_pool('fetch', 2) is get_pool('fetch', 2)
+
+def test_pages_stream_through_the_extractor():
+    """Pages are parsed as they download, in threads or whole in processes, with the same text"""
+    page = job_page(1).replace("</body>", "<div class='ad'><img src='banner.png'></div>" * 30000 + "</body>")
+    with StubHTTPServer({'/job': (200, {}, page)}) as server:
+        url = server.url('/job')
+        texts = []
+        for parse_processes in (False, True):
+            results = collect_within(30, [url], lambda batch: [{'text': text} for text in batch],
+                                     client=ScrapingClient(), parse_processes=parse_processes, parse_workers=1)
+            texts.append(results[0]['text'])
+            fetch = [fetch for fetch in fetch_stats.recent if fetch['url'] == url][-1]
+            # Streamed, a chunk and the page's strings are held, never the whole markup
+            assert fetch['peak_buffered_chars'] == len(page) if parse_processes else \
+                fetch['peak_buffered_chars'] <= 2 * 64 * 1024
+
+    assert texts[0] == texts[1] == extract_job_content_from_html(page, 'unknown')
+
+def test_closing_the_stream_stops_fetching():
+    """A consumer that goes away (client disconnect) cancels the remaining fetches"""
+    pages = SlowPages(delay=0.1)
+    with StubHTTPServer({'/job': pages}) as server:
+        urls = [server.url(f'/job?id={i}') for i in range(30)]
+        stream = iter_analyze_urls(urls, lambda texts: [{} for _ in texts],
+                                   client=ScrapingClient(), concurrency=1, per_host=1)
+        next(stream)
+        stream.close()
+
+        time.sleep(0.3)
+        fetched = len(server.requests)
+        time.sleep(0.5)
+        assert len(server.requests) == fetched < 10
+
+    print(f"Stream closed after 1 result; {fetched} of 30 pages fetched")
+
+def test_analyze_urls_endpoint():
+    """/analyze_urls streams one JSON line per URL"""
+    from app import app
+
+    client = app.test_client()
+    with StubHTTPServer({'/job': (200, {}, job_page(1))}) as server:
+        response = client.post('/analyze_urls', json={'urls': [server.url('/job'), 'ftp://nope']})
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert sorted(line['index'] for line in lines) == [0, 1]
+    by_index = {line['index']: line for line in lines}
+    assert 'confidence_score' in by_index[0]
+    assert by_index[1]['error'] == 'Invalid URL format'
+
+    assert client.post('/analyze_urls', json=[]).status_code == 400
+
+    print("✅ Bulk analyzer streams bounded, batched results")
+
+if __name__ == "__main__":
+    test_bulk_analysis_against_stub_server()
+    test_failed_batches_still_answer_every_url()
+    test_concurrent_runs_share_the_pools()
+    test_pages_stream_through_the_extractor()
+    test_closing_the_stream_stops_fetching()
+    test_analyze_urls_endpoint()
@@ -0,0 +1,241 @@
+import os
+import random
+import string
+import tempfile
+from company_index import (
+    CompanyIndex,
+    company_key,
+    company_phrases,
+    name_words,
+    normalize_company_name,
+    table_ids,
+    website_name
+)
+from company_matcher import scan_words
+
+COMPANIES = {
+    "fakecorp": {"name": "FakeCorp Inc", "website": "fakecorp-scam.com", "fraud_score": 95},
+    "scamtech": {"name": "ScamTech Solutions", "website": "scamtech-fake.net", "fraud_score": 88},
+    "phishco": {"name": "PhishCo Ltd", "website": "phishco-scam.org", "fraud_score": 92},
+    "google": {"name": "Google", "website": "google.com", "fraud_score": 5},
+    "microsoft": {"name": "Microsoft", "website": "microsoft.com", "fraud_score": 3},
+    "amazon": {"name": "Amazon", "website": "amazon.com", "fraud_score": 6},
+    "cafe": {"name": "Café Résumé Services Pvt. Ltd.", "fraud_score": 70},
+}
+
+def test_normalization():
+    print("Testing Company Index")
+    print("=" * 50)
+
+    assert normalize_company_name("FakeCorp, Inc.") == "fakecorp"
+    assert normalize_company_name("Café Résumé Services Pvt. Ltd.") == "cafe resume services"
+    assert normalize_company_name("Johnson & Johnson") == "johnson and johnson"
+    # A legal form on its own is still a name
+    assert normalize_company_name("Company") == "company"
+    assert company_key("Scam Tech") == company_key("scamtech") == "scamtech"
+    assert website_name("https://www.fakecorp-scam.com/jobs?id=1") == "fakecorp scam"
+    assert website_name("google.co") == "google"
+
+def test_exact_prefix_and_fuzzy_matches():
+    index = CompanyIndex(COMPANIES)
+    assert len(index) == 7
+
+    for query in ["fakecorp", "FakeCorp, Inc.", "FAKECORP inc", "fakecorp-scam.com", "https://fakecorp-scam.com/apply"]:
+        assert index.search(query)[0] == ("fakecorp", 1.0), query
+        assert index.get(query) is COMPANIES["fakecorp"], query
+    assert index.get("fakecorp scam ltd") is COMPANIES["fakecorp"]
+    assert index.get("fakecorpx") is None
+
+    # Misspellings, prefixes and substrings are ranked, best first
+    assert index.search("Gogle")[0][0] == "google"
+    assert index.search("Microsfot")[0][0] == "microsoft"
+    assert index.search("micro")[0] == ("microsoft", 0.571)
+    assert index.search("cafe resume")[0][0] == "cafe"
+    assert index.search("corp")[0][0] == "fakecorp"
+    scam = [key for key, _ in index.search("scam", k=10)]
+    assert set(scam) == {"scamtech", "fakecorp", "phishco"}
+
+    results = index.search("phishco scam")
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+    assert results[0] == ("phishco", 1.0)
+
+    assert index.search("zzzz") == []
+    assert index.search("  ,. ") == []
+    assert len(index.search("o", k=2, min_score=0.0)) <= 2
+
+    # Companies added later are searchable too
+    index.add("jobscam", {"name": "JobScam Hiring", "fraud_score": 99})
+    assert index.search("jobscam hirring")[0][0] == "jobscam"
+
+def test_large_index_finds_misspelled_names():
+    """With thousands of similar names the intended company stays in the top 5"""
+    rng = random.Random(3)
+    companies = {}
+    for i in range(20000):
+        stem = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        companies[f"c{i}"] = {"name": f"{stem.title()} {rng.choice(['Solutions', 'Labs', 'Global'])} Inc"}
+    index = CompanyIndex(companies)
+
+    found = 0
+    for key in rng.sample(list(companies), 100):
+        name = companies[key]["name"]
+        i = rng.randrange(len(name) - 4)
+        misspelled = name[:i] + name[i + 1:]
+        found += key in [match for match, _ in index.search(misspelled)]
+    assert found >= 95, found
+
+def test_saved_index_matches_in_memory_one():
+    """A memory-mapped index answers exactly like the one it was saved from"""
+    index = CompanyIndex(COMPANIES)
+    path = os.path.join(tempfile.mkdtemp(), "companies.store")
+    index.save(path)
+    mapped = CompanyIndex.open(path)
+
+    assert len(mapped) == 7 and sorted(mapped.keys()) == sorted(COMPANIES)
+    for query in ["fakecorp-scam.com", "Gogle", "micro", "cafe resume", "scam", "o", "zzzz"]:
+        assert mapped.search(query, k=10, min_score=0.0) == index.search(query, k=10, min_score=0.0), query
+    assert mapped.record("cafe") == COMPANIES["cafe"]
+    assert mapped.get("FakeCorp, Inc.") == COMPANIES["fakecorp"]
+    assert mapped.record("nope") is None and mapped.get("nope") is None
+
+    try:
+        mapped.add("new", {"name": "New"})
+        assert False, "memory-mapped index accepted a new company"
+    except TypeError:
+        pass
+
+    empty = os.path.join(tempfile.mkdtemp(), "empty.store")
+    CompanyIndex().save(empty)
+    assert len(CompanyIndex.open(empty)) == 0 and CompanyIndex.open(empty).search("google") == []
+
+def test_mentions_in_postings():
+    """Companies are found by name anywhere in a text, and by website or email domain"""
+    index = CompanyIndex(dict(COMPANIES, acmeglobal={"name": "Acme Global Labs"}, globallabs={"name": "Global Labs"}))
+    text = ("Join ScamTech Solutions (not Google!) at our Acme Global Labs office. "
+            "Send your CV to hr@phishco-scam.org or visit https://www.fakecorp-scam.com/apply.")
+    assert index.mentions(text) == ["scamtech", "google", "acmeglobal", "globallabs", "phishco", "fakecorp"]
+    assert index.mentions("Café Résumé Services is hiring") == ["cafe"]
+    # Whole words only, and short or unknown names are not mentions
+    assert index.mentions("googleplex microsoftware amazonian co") == []
+    assert index.mentions("") == []
+    assert index.search("google", k=0) == [] and index.search("google", k=-1) == []
+
+    path = os.path.join(tempfile.mkdtemp(), "companies.store")
+    index.save(path)
+    assert CompanyIndex.open(path).mentions(text) == index.mentions(text)
+
+def test_mentions_match_brute_force():
+    """The phrase scan finds exactly the name phrases a word-by-word comparison finds"""
+    rng = random.Random(5)
+    vocabulary = ["ab", "abc", "tech", "soft", "labs", "global", "data", "datatech", "net", "hire"]
+    companies = {}
+    for i in range(300):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 4))]
+        companies[f"c{i}"] = {"name": " ".join(words)}
+    index = CompanyIndex(companies)
+
+    for _ in range(50):
+        text = " ".join(rng.choice(vocabulary + ["the", "inc"]) for _ in range(rng.randint(0, 40)))
+        words = name_words(text)
+        expected = {key for key, data in companies.items() for phrase in company_phrases(key, data)
+                    if any(tuple(words[i:i + len(phrase)]) == phrase for i in range(len(words)))}
+        assert set(index.mentions(text)) == expected, text
+
+def automaton_walk(arrays, ids):
+    """Reference scan: step an Aho-Corasick automaton over the stored trie one word at a time"""
+    size = len(arrays['root_next'])
+    offsets = arrays['output_offsets']
+    goto = {(0, word): int(child) for word, child in enumerate(arrays['root_next']) if child}
+    for key, child in zip(arrays['transition_keys'].tolist(), arrays['transition_next'].tolist()):
+        goto[divmod(key, size)] = child
+
+    # Failure links breadth first, so a state's parent is always done before it
+    fail, output_link = {0: 0}, {0: 0}
+    level = [state for (parent, _), state in goto.items() if parent == 0]
+    children = {}
+    for (parent, word), child in goto.items():
+        children.setdefault(parent, []).append((word, child))
+    for state in level:
+        fail[state] = output_link[state] = 0
+    while level:
+        next_level = []
+        for parent in level:
+            for word, child in children.get(parent, []):
+                state = fail[parent]
+                while state and (state, word) not in goto:
+                    state = fail[state]
+                fail[child] = goto.get((state, word), 0)
+                suffix = fail[child]
+                output_link[child] = suffix if offsets[suffix + 1] > offsets[suffix] else output_link[suffix]
+                next_level.append(child)
+        level = next_level
+
+    found = []
+    state = 0
+    for word in ids.tolist():
+        if word < 0:
+            state = 0
+            continue
+        while state and (state, word) not in goto:
+            state = fail[state]
+        state = goto.get((state, word), 0)
+        match = state if offsets[state + 1] > offsets[state] else output_link[state]
+        while match:
+            found.extend(arrays['outputs'][offsets[match]:offsets[match + 1]].tolist())
+            match = output_link[match]
+    return found
+
+def test_scan_matches_automaton_walk():
+    """The vectorized scan lists the same owners, in the same order and with repeats, as the automaton"""
+    rng = random.Random(9)
+    vocabulary = ["ab", "abc", "tech", "soft", "labs", "global", "data", "net"]
+    companies = {f"c{i}": {"name": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 5)))}
+                 for i in range(200)}
+    arrays = CompanyIndex(companies)._freeze()
+
+    for _ in range(200):
+        words = [rng.choice(vocabulary + ["the", "inc"]).encode('utf-8') for _ in range(rng.randint(0, 60))]
+        ids = table_ids(arrays['words'], words)
+        assert scan_words(arrays, ids) == automaton_walk(arrays, ids), words
+
+def test_search_company_endpoint():
+    """Exact hits look as before; fuzzy ones are flagged and ranked"""
+    from app import app
+
+    client = app.test_client()
+    data = client.post('/search_company', json={'company_name': 'FakeCorp Inc.'}).get_json()
+    assert data['found'] and data['is_fraud'] and data['company_data']['name'] == "FakeCorp Inc"
+    assert data['score'] == 1.0 and 'partial_match' not in data
+
+    data = client.post('/search_company', json={'company_name': 'gogle', 'limit': 3}).get_json()
+    assert data['found'] and data['partial_match'] and not data['is_fraud']
+    assert data['matches'][0]['key'] == 'google' and len(data['matches']) <= 3
+
+    data = client.post('/search_company', json={'company_name': 'qwxz'}).get_json()
+    assert data['found'] is False
+    assert client.post('/search_company', json={'company_name': ' '}).status_code == 400
+
+    # limit is clamped to 1..MAX_COMPANY_MATCHES and must be an integer
+    for limit in (-1, 0):
+        data = client.post('/search_company', json={'company_name': 'FakeCorp Inc.', 'limit': limit}).get_json()
+        assert data['found'] and len(data['matches']) == 1
+    assert client.post('/search_company', json={'company_name': 'gogle', 'limit': 'x'}).status_code == 400
+    assert client.post('/search_company', json={'company_name': 'gogle', 'limit': None}).status_code == 400
+
+    data = client.post('/detect', json={'text': "Internship at FakeCorp Inc, pay the fee to hr@fakecorp-scam.com"}).get_json()
+    assert data['company_check']['known_fraud']
+    assert [company['key'] for company in data['company_check']['companies']] == ['fakecorp']
+    data = client.post('/detect', json={'text': "Internship with a small local bakery"}).get_json()
+    assert data['company_check'] == {'companies': [], 'known_fraud': False}
+
+    print("✅ Company search is indexed and ranked")
+
+if __name__ == "__main__":
+    test_normalization()
+    test_exact_prefix_and_fuzzy_matches()
+    test_large_index_finds_misspelled_names()
+    test_saved_index_matches_in_memory_one()
+    test_mentions_in_postings()
+    test_mentions_match_brute_force()
+    test_scan_matches_automaton_walk()
+    test_search_company_endpoint()
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+from company_index import FILE_MAGIC, CompanyIndex, OutdatedIndexError
+from company_store import SEED_PATH, CompanyStore, file_version, seed_version
+from import_companies import import_feeds, read_feed
+
+def test_store_builds_from_seed_and_reloads():
+    """A missing store is built from the seed; a replaced file is picked up without a restart"""
+    print("Testing Company Store")
+    print("=" * 50)
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "companies.store")
+    store = CompanyStore(path, check_interval=0)
+    with open(SEED_PATH, encoding="utf-8") as f:
+        seed = json.load(f)
+    assert len(store) == len(seed)
+    assert store.search("FakeCorp Inc")[0] == ("fakecorp", 1.0)
+    assert store.record("google")["website"] == "google.com"
+
+    other = CompanyStore(path, check_interval=0)
+    CompanyIndex({"jobscam": {"name": "JobScam Hiring", "fraud_score": 99}}).save(path)
+    assert store.search("jobscam")[0] == ("jobscam", 1.0)
+    assert store.record("google") is None
+    assert other.get("JobScam Hiring")["fraud_score"] == 99
+    assert store.stats()["reloads"] == 1 and len(other) == 1
+
+    # A broken file keeps the last good copy in service
+    with open(path + ".tmp", "wb") as f:
+        f.write(b"not an index\n")
+    os.replace(path + ".tmp", path)
+    assert store.search("jobscam")[0] == ("jobscam", 1.0)
+
+def test_reload_checks_are_throttled():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "companies.store")
+    CompanyIndex({"google": {"name": "Google"}}).save(path)
+    store = CompanyStore(path, check_interval=3600)
+    store.index  # first check
+    CompanyIndex({"amazon": {"name": "Amazon"}}).save(path)
+    assert store.search("amazon") == [] and store.reloads == 0
+
+def test_outdated_store_is_rebuilt():
+    """A file from before the name trie is refused by open() and rebuilt by the store, not half read"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "companies.store")
+    CompanyIndex({"fakecorp": {"name": "FakeCorp Inc"}}).save(path)
+    with open(path, "r+b") as f:
+        f.write(FILE_MAGIC.replace(b" 2", b" 1"))
+    try:
+        CompanyIndex.open(path)
+        assert False, "expected OutdatedIndexError"
+    except OutdatedIndexError:
+        pass
+    assert CompanyIndex.open(path, any_format=True).record("fakecorp") == {"name": "FakeCorp Inc"}
+
+    store = CompanyStore(path, check_interval=0)
+    assert store.index.mentions("Apply now at FakeCorp Inc.") == ["fakecorp"]
+    assert CompanyIndex.open(path).record("fakecorp") == {"name": "FakeCorp Inc"}
+
+def test_seed_changes_are_merged_on_start():
+    """A new seed reaches an existing store on the next start, without losing imported companies"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "companies.store")
+    seed_path = os.path.join(directory, "companies.json")
+    with open(seed_path, "w", encoding="utf-8") as f:
+        json.dump({"fakecorp": {"name": "FakeCorp Inc", "fraud_score": 80}}, f)
+    CompanyStore(path, seed_path=seed_path)
+    index = CompanyIndex.open(path)
+    CompanyIndex(dict(index.items(), jobscam={"name": "JobScam Hiring"})).save(path, metadata=index.metadata)
+
+    # Unchanged seed: nothing to do
+    version = file_version(path)
+    CompanyStore(path, seed_path=seed_path)
+    assert file_version(path) == version
+
+    with open(seed_path, "w", encoding="utf-8") as f:
+        json.dump({"fakecorp": {"name": "FakeCorp Inc", "fraud_score": 95}, "google": {"name": "Google"}}, f)
+    store = CompanyStore(path, seed_path=seed_path)
+    assert store.record("fakecorp")["fraud_score"] == 95
+    assert store.get("Google") and store.get("JobScam Hiring")
+    assert store.index.metadata["seed"] == seed_version(seed_path)
+
+    # A store replaced by feeds alone does not follow the seed
+    feed_path = os.path.join(directory, "feed.json")
+    with open(feed_path, "w", encoding="utf-8") as f:
+        json.dump([{"key": "acme", "name": "Acme Corp"}], f)
+    import_feeds([feed_path], path, replace=True)
+    with open(seed_path, "w", encoding="utf-8") as f:
+        json.dump({"amazon": {"name": "Amazon"}}, f)
+    assert CompanyStore(path, seed_path=seed_path).index.keys() == ["acme"]
+
+def test_import_csv_and_json_feeds():
+    """Feeds add new companies and update known ones; flags and numbers are parsed"""
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, "reports.csv")
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("name,fraud_score,reports,website,red_flags\n")
+        f.write("Quick Cash Jobs LLC,97,12,quickcash-jobs.biz,Upfront fee; Telegram only\n")
+        f.write("PhishCo Ltd,93,240,,\n")
+        f.write(",50,1,,\n")
+    json_path = os.path.join(directory, "verified.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump([{"key": "acme", "name": "Acme Corp", "fraud_score": 2}], f)
+
+    rows = dict(read_feed(csv_path))
+    assert rows["quickcashjobs"] == {
+        "name": "Quick Cash Jobs LLC", "fraud_score": 97, "reports": 12,
+        "website": "quickcash-jobs.biz", "red_flags": ["Upfront fee", "Telegram only"]
+    }
+    assert len(rows) == 2
+
+    path = os.path.join(directory, "companies.store")
+    result = import_feeds([csv_path, json_path], path)
+    assert (result["added"], result["updated"]) == (2, 1)
+
+    index = CompanyIndex.open(path)
+    assert len(index) == result["total"] == result["existing"] + 2
+    phishco = index.record("phishco")
+    assert (phishco["fraud_score"], phishco["reports"], phishco["industry"]) == (93, 240, "Consulting")
+    assert index.search("quickcash-jobs.biz")[0] == ("quickcashjobs", 1.0)
+    assert index.search("acme")[0] == ("acme", 1.0)
+
+    result = import_feeds([json_path], path, replace=True)
+    assert result["total"] == len(CompanyIndex.open(path)) == 1
+
+    print("✅ Company store is memory-mapped, importable and hot-reloaded")
+
+if __name__ == "__main__":
+    test_store_builds_from_seed_and_reloads()
+    test_reload_checks_are_throttled()
+    test_outdated_store_is_rebuilt()
+    test_seed_changes_are_merged_on_start()
+    test_import_csv_and_json_feeds()
@@ -0,0 +1,116 @@
+import os
+import random
+import document
+from document import Document, RecentDocuments
+from preprocessing import preprocess_text
+from stub_http_server import StubHTTPServer
+from text_cleaner import clean_text
+from text_features import TextFeatures
+from test_text_features import SAMPLE_TEXTS, load_corpus, random_posting
+
+class CountingCalls:
+    """Replaces a function of the document module, counting calls to it"""
+    def __init__(self, name):
+        self.name = name
+        self.func = getattr(document, name)
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.func(*args)
+
+    def __enter__(self):
+        setattr(document, self.name, self)
+        return self
+
+    def __exit__(self, *exc):
+        setattr(document, self.name, self.func)
+
+def test_forms_are_lazy_and_memoized():
+    print("Testing Document")
+    print("=" * 50)
+
+    text = "  Paid <b>Internship</b>\n\nat  ACME &amp; Co — apply   today "
+    doc = Document(text)
+    assert vars(doc) == {'raw': text}
+
+    with CountingCalls('preprocess_text') as preprocess:
+        assert doc.processed == preprocess_text(text) == 'paid internship at acme co apply today'
+        assert doc.processed is doc.processed
+        assert doc.tokens == ['paid', 'internship', 'at', 'acme', 'co', 'apply', 'today']
+        assert preprocess.calls == 1
+    assert set(vars(doc)) == {'raw', 'processed', 'tokens'}
+
+    assert doc.cleaned == clean_text(text)
+    assert doc.word_count == len(text.split())
+    assert vars(doc.features) == vars(TextFeatures(text))
+    assert doc.features is doc.features
+
+    # Text that is already clean is not cleaned again
+    with CountingCalls('clean_text') as clean:
+        assert Document('clean text', cleaned='clean text').cleaned == 'clean text'
+        assert clean.calls == 0
+    assert Document('').tokens == [] and Document('').word_count == 0
+
+def test_tokens_match_vectorizer():
+    """tokens are exactly what the vectorizer counts (before stop words)"""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    analyzer = CountVectorizer().build_analyzer()
+    rng = random.Random(3)
+    texts = load_corpus() + [random_posting(rng) for _ in range(2000)]
+    for text in texts:
+        doc = Document(text)
+        assert doc.tokens == analyzer(doc.processed), repr(text[:200])
+
+def test_recent_documents():
+    recent = RecentDocuments(max_size=2)
+    first = recent.get('one')
+    first.processed
+    assert recent.get('one') is first
+    assert recent.get(Document('one')) is first
+
+    # Forms computed on a passed-in Document carry over to the known one
+    second = recent.get('two')
+    assert recent.get(Document('two', cleaned='two')) is second and vars(second)['cleaned'] == 'two'
+
+    recent.get('three')
+    assert recent.get('one') is not first  # least recently used, evicted
+    assert recent.stats() == {'hits': 3, 'misses': 4, 'size': 2, 'max_size': 2}
+
+    off = RecentDocuments(max_size=0)
+    assert off.get('one') is not off.get('one')
+
+def test_request_pipeline_computes_each_form_once():
+    """Scoring and analyses share one Document; /detect reuses the one /extract_url made"""
+    from app import app, analyze_texts, recent_documents
+
+    os.environ['SNIFTERN_PAGE_CACHE_DB'] = ''
+    try:
+        texts = [f"{text} Reference {random.random()}" for text in SAMPLE_TEXTS if text]
+        with CountingCalls('preprocess_text') as preprocess, CountingCalls('TextFeatures') as features:
+            analyze_texts(texts)
+            assert preprocess.calls == features.calls == len(texts)
+
+        html = f"<html><body><main>Remote internship, pay the $40 certificate fee. {random.random()}</main></body></html>"
+        with StubHTTPServer({'/job': (200, {'Content-Type': 'text/html'}, html)}) as server:
+            client = app.test_client()
+            with CountingCalls('clean_text') as clean, CountingCalls('preprocess_text') as preprocess:
+                extracted = client.post('/extract_url', json={'url': server.url('/job')}).get_json()
+                hits = recent_documents.stats()['hits']
+                detected = client.post('/detect', json={'text': extracted['text']}).get_json()
+
+                assert recent_documents.stats()['hits'] == hits + 1
+                assert clean.calls == 0 and preprocess.calls == 1
+            assert detected['word_count'] == extracted['word_count']
+            assert 'documents' in client.get('/cache_stats').get_json()
+    finally:
+        del os.environ['SNIFTERN_PAGE_CACHE_DB']
+
+    print("✅ Every form of a text is computed at most once")
+
+if __name__ == "__main__":
+    test_forms_are_lazy_and_memoized()
+    test_tokens_match_vectorizer()
+    test_recent_documents()
+    test_request_pipeline_computes_each_form_once()
@@ -0,0 +1,84 @@
+import os
+import random
+import tempfile
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from document import Document
+from fast_vectorizer import FastVectorizer, check_export, same_vectors
+from test_text_features import load_corpus, random_posting
+
+def load_vectorizer():
+    return joblib.load(os.path.join('model', 'tfidf_vectorizer.pkl'))
+
+def vocabulary_texts(vectorizer, rng, count=1000):
+    """Texts made of vocabulary terms, stop words and unknown words"""
+    words = list(vectorizer.vocabulary_) + ['the', 'and', 'of', 'x', 'zzqx', 'İnternship', 'Ünïcode']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(0, 300))) for _ in range(count)]
+
+def test_identical_to_model_vectorizer():
+    print("Testing Fast Vectorizer")
+    print("=" * 50)
+
+    vectorizer = load_vectorizer()
+    fast = FastVectorizer.from_vectorizer(vectorizer)
+    rng = random.Random(5)
+    texts = load_corpus() + [random_posting(rng) for _ in range(1000)] + vocabulary_texts(vectorizer, rng)
+
+    assert check_export(fast, vectorizer, texts, batch_size=100) == len(texts)
+    for text in texts[:300]:
+        assert same_vectors(fast.transform([text]), vectorizer.transform([text]))
+    assert fast.transform([]).shape == (0, len(vectorizer.vocabulary_))
+
+    # From Documents, the tokens they already hold give the same rows
+    documents = [Document(text) for text in texts]
+    assert same_vectors(fast.transform_documents(documents),
+                        vectorizer.transform([document.processed for document in documents]))
+
+def test_saved_vectorizer():
+    vectorizer = load_vectorizer()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'fast_vectorizer.npz')
+        FastVectorizer.from_vectorizer(vectorizer).save(path)
+        fast = FastVectorizer.load(path)
+    assert fast.vocabulary == vectorizer.vocabulary_
+    texts = vocabulary_texts(vectorizer, random.Random(6), 300)
+    check_export(fast, vectorizer, texts)
+
+def test_other_settings():
+    """Every setting transform() reads survives export and save"""
+    rng = random.Random(7)
+    words = ['Café', 'café', 'intern', 'paid', 'Paid', 'fee', 'a', 'Über', 'x-ray', 'C++', 'the']
+    corpus = [' '.join(rng.choice(words) for _ in range(rng.randint(0, 30))) for _ in range(300)]
+    vectorizers = [
+        TfidfVectorizer(sublinear_tf=True, norm='l1'),
+        TfidfVectorizer(binary=True, use_idf=False, lowercase=False),
+        TfidfVectorizer(norm=None, smooth_idf=False, stop_words=['the'], token_pattern=r'[\w+-]+')
+    ]
+    for vectorizer in vectorizers:
+        vectorizer.fit(corpus)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vectorizer.npz')
+            FastVectorizer.from_vectorizer(vectorizer).save(path)
+            fast = FastVectorizer.load(path)
+        check_export(fast, vectorizer, corpus)
+
+    try:
+        FastVectorizer.from_vectorizer(TfidfVectorizer(ngram_range=(1, 2)).fit(corpus))
+        assert False, "bigram vectorizers cannot be exported"
+    except ValueError:
+        pass
+
+def test_predictor_uses_export():
+    from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+
+    predictor = EnhancedFakeInternshipPredictor()
+    assert isinstance(predictor.vectorizer, FastVectorizer)
+    assert predictor.vectorizer.vocabulary == load_vectorizer().vocabulary_
+
+    print("✅ Exported vectorizer gives identical vectors")
+
+if __name__ == "__main__":
+    test_identical_to_model_vectorizer()
+    test_saved_vectorizer()
+    test_other_settings()
+    test_predictor_uses_export()
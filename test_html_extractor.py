@@ -0,0 +1,143 @@
+import os
+import random
+from bs4 import BeautifulSoup
+from html_extractor import LXML_INSTALLED, parse_selector, scan_html
+from text_cleaner import clean_text
+from scraping_utils import extract_job_content_from_html, extract_main_text_from_html, extract_with_selectors
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+PLATFORMS = ['linkedin', 'indeed', 'glassdoor', 'generic']
+BACKENDS = ['html.parser'] + (['lxml'] if LXML_INSTALLED else [])
+
+PLATFORM_SELECTORS = {
+    'linkedin': ['.job-description', '.show-more-less-html__markup', '.job-description__content',
+                 '[data-job-description]', '.job-description__text', '.description__text',
+                 '.job-description-content', '.job-description__content--rich-text'],
+    'indeed': ['#jobDescriptionText', '.job-description', '[data-testid="job-description"]',
+               '.jobsearch-jobDescriptionText', '.job-description-container',
+               '.jobsearch-jobDescriptionText--container'],
+    'glassdoor': ['.jobDescriptionContent', '.job-description', '[data-testid="job-description"]',
+                  '.desc', '.job-description-content', '.job-description__content'],
+    'generic': ['.job-description', '.job-content', '.post-content', '.entry-content',
+                '.content', 'main', 'article'],
+}
+
+def legacy_extract_with_selectors(html, selectors):
+    """The BeautifulSoup implementation the single-pass extractor replaces"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in selectors:
+        elements = soup.select(selector)
+        if elements:
+            text = ' '.join([elem.get_text(strip=True) for elem in elements])
+            if text and len(text) > 100:
+                return clean_text(text)
+
+    for element in soup(['nav', 'footer', 'header', 'script', 'style', 'aside', 'iframe']):
+        element.decompose()
+
+    main_content = soup.find('main') or soup.find('article') or soup.find('body')
+    if main_content:
+        return clean_text(main_content.get_text(strip=True))
+    return ""
+
+def legacy_extract_main_text(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe']):
+        element.decompose()
+
+    main_content = None
+    for selector in ['main', 'article', '.main-content', '.content', '.post-content', '.entry-content',
+                     '#content', '#main', '.job-description', '.job-content']:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    if not main_content:
+        main_content = soup.find('body')
+
+    if main_content:
+        text = main_content.get_text(separator=' ', strip=True)
+    else:
+        text = soup.get_text(separator=' ', strip=True)
+    return clean_text(text)
+
+def with_backend(backend, extract, *args):
+    os.environ['SNIFTERN_HTML_PARSER'] = backend
+    try:
+        return extract(*args)
+    finally:
+        del os.environ['SNIFTERN_HTML_PARSER']
+
+def load_fixture(platform):
+    with open(os.path.join(FIXTURES, f'{platform}.html'), 'rb') as f:
+        return f.read()
+
+FUZZ_TAGS = ['div', 'p', 'span', 'main', 'article', 'nav', 'footer', 'script', 'style',
+             'aside', 'template', 'br', 'img', 'li', 'ul', 'header', 'section', 'rt']
+FUZZ_ATTRS = ['', ' class="job-description"', ' class="content main"', ' id="content"',
+              ' data-testid="job-description"', ' data-job-description', " class='desc x'"]
+FUZZ_TEXT = ['Remote internship ', 'pay &amp; apply ', '&#169; ', '  \n ', 'x' * 40 + ' ', '&nbsp;',
+             '<!-- c -->', '<![CDATA[cd]]>', '&bogus; ', 'Stipend $500 ', '&#150;', '&#x2013x; ', '&#0;',
+             '&#xE9; ', '&#xA0;', '&#X4a; ']
+
+def random_html(rng, size=40):
+    parts = []
+    for _ in range(size):
+        roll = rng.random()
+        tag = rng.choice(FUZZ_TAGS)
+        if roll < 0.35:
+            parts.append(f'<{tag}{rng.choice(FUZZ_ATTRS)}>')
+        elif roll < 0.55:
+            parts.append(f'</{tag}>')
+        elif roll < 0.6:
+            parts.append(f'<{tag}{rng.choice(FUZZ_ATTRS)}/>')
+        else:
+            parts.append(rng.choice(FUZZ_TEXT))
+    return ''.join(parts)
+
+def test_parse_selector():
+    """The selector subset the scrapers use"""
+    assert parse_selector('main') == ('main', None, (), {})
+    assert parse_selector('.job-description') == (None, None, ('job-description',), {})
+    assert parse_selector('#jobDescriptionText') == (None, 'jobDescriptionText', (), {})
+    assert parse_selector('div.main') == ('div', None, ('main',), {})
+    assert parse_selector('[data-job-description]') == (None, None, (), {'data-job-description': None})
+    assert parse_selector('[data-testid="job-description"]') == (None, None, (), {'data-testid': 'job-description'})
+
+def test_fixtures_match_beautifulsoup():
+    """Both backends extract exactly what the BeautifulSoup code did"""
+    print("Testing Single-Pass HTML Extractor")
+    print("=" * 50)
+
+    for platform in PLATFORMS:
+        html = load_fixture(platform)
+        selectors = PLATFORM_SELECTORS[platform]
+        expected = legacy_extract_with_selectors(html, selectors)
+        expected_main = legacy_extract_main_text(html)
+        assert len(expected) > 500
+
+        for backend in BACKENDS:
+            assert with_backend(backend, extract_job_content_from_html, html, platform) == expected, (platform, backend)
+            assert with_backend(backend, extract_main_text_from_html, html) == expected_main, (platform, backend)
+        print(f"{platform}: {len(html) // 1024} KB page, {len(expected)} chars extracted")
+
+def test_fuzz_html_parser_backend():
+    """On arbitrary markup the html.parser backend reproduces the soup exactly"""
+    rng = random.Random(11)
+    selectors = PLATFORM_SELECTORS['generic']
+    for _ in range(2000):
+        html = random_html(rng)
+        assert with_backend('html.parser', extract_with_selectors, html, selectors) == \
+            legacy_extract_with_selectors(html, selectors), html
+        assert with_backend('html.parser', extract_main_text_from_html, html) == legacy_extract_main_text(html), html
+        scan = scan_html(html, ['.job-description'], backend='html.parser')
+        soup = BeautifulSoup(html, 'html.parser')
+        assert scan.document.text(' ') == soup.get_text(' ', strip=True), html
+        assert ([m.text() for m in scan.matches[0]] ==
+                [tag.get_text(strip=True) for tag in soup.select('.job-description')]), html
+
+    print("✅ Single-pass extraction matches BeautifulSoup")
+
+if __name__ == "__main__":
+    test_parse_selector()
+    test_fixtures_match_beautifulsoup()
+    test_fuzz_html_parser_backend()
@@ -0,0 +1,93 @@
+import os
+import random
+import shutil
+import tempfile
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from linear_scorer import LinearScorer
+from test_text_features import load_corpus, random_posting
+
+def load_model():
+    model = joblib.load(os.path.join('model', 'fake_job_model.pkl'))
+    vectorizer = joblib.load(os.path.join('model', 'tfidf_vectorizer.pkl'))
+    return model, vectorizer
+
+def posting_vectors(vectorizer, count=500):
+    """TF-IDF rows of the fixture postings plus random ones"""
+    rng = random.Random(11)
+    return vectorizer.transform(load_corpus() + [random_posting(rng) for _ in range(count)])
+
+def test_matches_model():
+    """Same labels as model.predict and the same probabilities as model.predict_proba"""
+    print("Testing Linear Scorer")
+    print("=" * 50)
+
+    model, vectorizer = load_model()
+    scorer = LinearScorer.from_model(model)
+    X = posting_vectors(vectorizer)
+
+    labels, probas = scorer.score(X)
+    assert (labels == model.predict(X)).all()
+    assert np.allclose(probas, model.predict_proba(X), rtol=0, atol=1e-12)
+    assert np.allclose(scorer.decision_function(X), model.decision_function(X), rtol=0, atol=1e-12)
+
+    # One posting at a time, as the app scores them
+    for row in range(20):
+        label, proba = scorer.score(X[row])
+        assert label[0] == model.predict(X[row])[0]
+        assert np.allclose(proba, model.predict_proba(X[row]), rtol=0, atol=1e-12)
+
+    rng = np.random.RandomState(0)
+    multiclass = LogisticRegression().fit(rng.rand(30, 4), np.arange(30) % 3)
+    try:
+        LinearScorer.from_model(multiclass)
+        assert False, "only binary classifiers can be exported"
+    except ValueError:
+        pass
+
+def test_saved_scorer():
+    model, vectorizer = load_model()
+    scorer = LinearScorer.from_model(model)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'linear_scorer.npz')
+        scorer.save(path)
+        loaded = LinearScorer.load(path)
+
+    assert np.array_equal(loaded.coef, scorer.coef) and np.array_equal(loaded.intercept, scorer.intercept)
+    assert loaded.classes.tolist() == model.classes_.tolist()
+    X = posting_vectors(vectorizer, 100)
+    labels, probas = loaded.score(X)
+    assert (labels == model.predict(X)).all()
+    assert np.array_equal(probas, scorer.score(X)[1])
+
+def test_predictor_uses_fresh_export():
+    """The export is used while it is at least as new as the pickled model, and ignored once it is older"""
+    from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in os.listdir('model'):
+            shutil.copy2(os.path.join('model', name), directory)
+        model_path = os.path.join(directory, 'fake_job_model.pkl')
+        scorer_path = os.path.join(directory, 'linear_scorer.npz')
+
+        # Marked weights, to tell the export from weights taken from the model
+        exported = LinearScorer.load(scorer_path)
+        LinearScorer(exported.coef * 2, exported.intercept, exported.classes).save(scorer_path)
+        model_time = os.path.getmtime(model_path)
+        os.utime(scorer_path, (model_time, model_time))
+
+        predictor = EnhancedFakeInternshipPredictor(directory)
+        assert np.array_equal(predictor.scorer.coef, exported.coef * 2)
+        assert predictor._model is None  # the pickle was not needed
+
+        os.utime(scorer_path, (model_time - 60, model_time - 60))
+        predictor = EnhancedFakeInternshipPredictor(directory)
+        assert np.array_equal(predictor.scorer.coef, LinearScorer.from_model(load_model()[0]).coef)
+
+    print("✅ Linear scorer matches the scikit-learn model")
+
+if __name__ == "__main__":
+    test_matches_model()
+    test_saved_scorer()
+    test_predictor_uses_fresh_export()
@@ -0,0 +1,110 @@
+import io
+import os
+from types import SimpleNamespace
+from unittest import mock
+from PIL import Image
+import ocr_backend
+import ocr_utils
+from ocr_backend import TesseractAPI, get_ocr_backend
+from ocr_pool import create_ocr_pool
+
+class FakeTessBaseAPI:
+    """Records what the tesserocr backend asks of Tesseract's API"""
+    instances = []
+
+    def __init__(self, lang='eng'):
+        self.lang = lang
+        self.calls = []
+        FakeTessBaseAPI.instances.append(self)
+
+    def SetPageSegMode(self, psm):
+        self.calls.append(('psm', psm))
+
+    def SetImage(self, img):
+        self.calls.append(('image', img.size))
+
+    def SetSourceResolution(self, dpi):
+        self.calls.append(('dpi', dpi))
+
+    def GetUTF8Text(self):
+        return "Unpaid internship, pay a training fee"
+
+    def Clear(self):
+        self.calls.append(('clear',))
+
+    def End(self):
+        self.calls.append(('end',))
+
+fake_tesserocr = SimpleNamespace(
+    PyTessBaseAPI=FakeTessBaseAPI,
+    PSM=SimpleNamespace(AUTO=3),
+    get_languages=lambda: ('/usr/share/tessdata/', ['eng', 'osd']),
+    tesseract_version=lambda: 'tesseract 5.3.0\n leptonica-1.82.0'
+)
+
+def test_backend_selection():
+    print("Testing OCR Backends")
+    print("=" * 50)
+
+    with mock.patch.object(ocr_backend, 'tesserocr', None):
+        assert get_ocr_backend() == 'pytesseract'
+        with mock.patch.dict(os.environ, {'SNIFTERN_OCR_BACKEND': 'tesserocr'}):
+            # Falls back when the fast backend is missing
+            assert get_ocr_backend() == 'pytesseract'
+
+    with mock.patch.object(ocr_backend, 'tesserocr', fake_tesserocr):
+        assert get_ocr_backend() == 'tesserocr'
+        with mock.patch.dict(os.environ, {'SNIFTERN_OCR_BACKEND': 'pytesseract'}):
+            assert get_ocr_backend() == 'pytesseract'
+
+    assert create_ocr_pool().initializer is ocr_backend.start_ocr_worker
+
+def test_resident_engine():
+    """The model is loaded once and reused; images go over in memory"""
+    FakeTessBaseAPI.instances.clear()
+    api = TesseractAPI()
+    img = Image.new('L', (400, 100), 255)
+
+    with mock.patch.object(ocr_backend, 'tesserocr', fake_tesserocr):
+        assert api.version() == '5.3.0'
+        assert not FakeTessBaseAPI.instances  # checking the install does not load the model
+
+        for _ in range(3):
+            assert api.image_to_string(img, '--psm 6 --dpi 300') == "Unpaid internship, pay a training fee"
+        assert len(FakeTessBaseAPI.instances) == 1
+        engine = FakeTessBaseAPI.instances[0]
+        assert engine.calls[:4] == [('psm', 6), ('image', (400, 100)), ('dpi', 300), ('clear',)]
+
+        api.image_to_string(img)
+        assert engine.calls[-3:] == [('psm', 3), ('image', (400, 100)), ('clear',)]
+
+        api.close()
+        assert engine.calls[-1] == ('end',) and api._api is None
+
+        missing = TesseractAPI(lang='ind')
+        try:
+            missing.version()
+            assert False, "missing language data must be reported"
+        except RuntimeError as e:
+            assert "'ind'" in str(e)
+
+def test_ocr_utils_uses_the_configured_backend():
+    FakeTessBaseAPI.instances.clear()
+    buffer = io.BytesIO()
+    Image.new('RGB', (640, 480), 'white').save(buffer, format='PNG')
+
+    with mock.patch.object(ocr_backend, 'tesserocr', fake_tesserocr), \
+         mock.patch.object(ocr_backend, 'tesseract_api', TesseractAPI()), \
+         mock.patch.object(ocr_utils, '_tesseract_status', None):
+        assert ocr_utils.check_tesseract_installation() == (True, "Tesseract 5.3.0 is installed")
+        ocr_backend.start_ocr_worker()
+        assert len(FakeTessBaseAPI.instances) == 1
+        assert ocr_utils.ocr_image_bytes(buffer.getvalue()) == "Unpaid internship, pay a training fee"
+        assert len(FakeTessBaseAPI.instances) == 1
+
+    print("✅ OCR runs on a resident Tesseract engine when tesserocr is available")
+
+if __name__ == "__main__":
+    test_backend_selection()
+    test_resident_engine()
+    test_ocr_utils_uses_the_configured_backend()
@@ -0,0 +1,72 @@
+import io
+import time
+from PIL import Image
+from ocr_pool import OCRPool, OCRPoolFull
+
+POSTING = ("Remote data entry internship. No experience needed, earn $500 per week from home. "
+           "Pay a one-time registration fee to secure your spot.")
+
+def slow_ocr(data):
+    """Stand-in for Tesseract: takes a while and returns a fixed posting"""
+    time.sleep(0.3)
+    return POSTING
+
+def png_bytes(size=(320, 120)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def test_queue_depth_limit():
+    """Work past the queue depth is refused instead of piling up"""
+    print("Testing OCR Worker Pool")
+    print("=" * 50)
+
+    pool = OCRPool(workers=1, max_pending=2, ocr=slow_ocr)
+    try:
+        futures = [pool.submit(b'image-1'), pool.submit(b'image-2')]
+        try:
+            pool.submit(b'image-3')
+            assert False, "third image should have been refused"
+        except OCRPoolFull:
+            pass
+
+        assert [future.result(10) for future in futures] == [POSTING, POSTING]
+        time.sleep(0.05)  # done callbacks run right after the results
+        assert pool.extract(b'image-4', timeout=10) == POSTING
+        stats = pool.stats()
+        assert stats['pending'] == 0 and stats['completed'] == 3 and stats['rejected'] == 1
+    finally:
+        pool.shutdown()
+
+def test_analyze_image_endpoint():
+    """OCR text goes through the normal prediction path; a full queue answers 429"""
+    import app as app_module
+
+    client = app_module.app.test_client()
+    original = app_module.ocr_pool
+    app_module.ocr_pool = OCRPool(workers=1, max_pending=1, ocr=slow_ocr)
+    try:
+        response = client.post('/analyze_image', data={'image': (io.BytesIO(png_bytes()), 'ad.png')},
+                               content_type='multipart/form-data')
+        body = response.get_json()
+        assert response.status_code == 200, body
+        assert body['source'] == 'image' and body['text'] == POSTING
+        assert body == dict(app_module.analyze_text(POSTING), success=True, source='image', text=POSTING)
+
+        response = client.post('/analyze_image', data={'image': (io.BytesIO(b'not an image'), 'ad.png')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 400
+
+        app_module.ocr_pool.max_pending = 0
+        response = client.post('/analyze_image', data={'image': (io.BytesIO(png_bytes()), 'ad.png')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 429 and response.headers['Retry-After']
+    finally:
+        app_module.ocr_pool.shutdown()
+        app_module.ocr_pool = original
+
+    print("✅ OCR runs in a bounded pool with 429 backpressure")
+
+if __name__ == "__main__":
+    test_queue_depth_limit()
+    test_analyze_image_endpoint()
@@ -0,0 +1,95 @@
+import io
+import os
+from unittest import mock
+import pytesseract
+from PIL import Image, ImageDraw
+import ocr_utils
+from ocr_preprocessing import binarize, crop_to_text, get_ocr_settings, preprocess_image, target_size, to_grayscale
+
+def text_card(size, background, ink, box=None):
+    """A screenshot-like image: a line of text, optionally inside a differently coloured button"""
+    img = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(img)
+    if box:
+        draw.rectangle(box[0], fill=box[1])
+    draw.text((size[0] // 3, size[1] // 2), "Remote internship, apply now", fill=ink)
+    return img
+
+def ink_box(img):
+    """Box around the black pixels of a black-on-white image"""
+    return Image.eval(img, lambda level: 255 - level).getbbox()
+
+def test_downscale_and_settings():
+    print("Testing OCR Preprocessing")
+    print("=" * 50)
+
+    settings = get_ocr_settings()
+    assert settings == {'preprocess': True, 'dpi': 300, 'max_side': 2000, 'binarize': True, 'crop': False, 'psm': 3}
+    with mock.patch.dict(os.environ, {'SNIFTERN_OCR_PSM': '6', 'SNIFTERN_OCR_CROP': '1', 'SNIFTERN_OCR_BINARIZE': 'off'}):
+        assert get_ocr_settings()['psm'] == 6
+        assert get_ocr_settings()['crop'] is True
+        assert get_ocr_settings()['binarize'] is False
+
+    # Phone-sized screenshot without DPI info: capped by the longest side
+    assert target_size(Image.new('RGB', (1170, 3200)))[0] == (731, 2000)
+    # Small images are never upscaled
+    assert target_size(Image.new('RGB', (800, 600))) == (None, 300)
+    # A 600 DPI scan comes down to 300 DPI
+    scan = Image.new('RGB', (1200, 1600))
+    scan.info['dpi'] = (600, 600)
+    assert target_size(scan) == ((600, 800), 300)
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (4000, 3000), 'white').save(buffer, format='JPEG')
+    img, config = preprocess_image(Image.open(buffer), dict(settings, psm=6))
+    assert img.size == (2000, 1500) and img.mode == 'L'
+    assert config == '--psm 6 --dpi 300'
+
+    raw = Image.new('RGB', (4000, 3000))
+    assert preprocess_image(raw, dict(settings, preprocess=False)) == (raw, '--psm 3')
+
+def test_binarize_light_and_dark_mode():
+    """Text comes out black on white whatever the colours around it"""
+    cards = {
+        'light': text_card((600, 120), 'white', 'black'),
+        'dark': text_card((600, 120), (18, 18, 30), (230, 230, 230)),
+        'button': text_card((600, 120), (18, 18, 30), 'white', box=((150, 30, 500, 100), (90, 150, 240))),
+    }
+    for name, card in cards.items():
+        bw = binarize(to_grayscale(card))
+        # The text is ink; the background and the inside of the button are not
+        assert bw.crop((200, 55, 380, 75)).histogram()[0] > 200, name
+        assert bw.crop((160, 40, 195, 90)).getextrema() == (255, 255), name
+        assert bw.crop((0, 0, 140, 120)).getextrema() == (255, 255), name
+
+    transparent = Image.new('RGBA', (50, 50), (0, 0, 0, 0))
+    assert to_grayscale(transparent).getextrema() == (255, 255)
+    assert ink_box(binarize(to_grayscale(transparent))) is None
+
+def test_crop_to_text():
+    bw = binarize(to_grayscale(text_card((600, 120), 'white', 'black')))
+    cropped = crop_to_text(bw)
+    assert cropped.width < 250 and cropped.height < 40
+    blank = Image.new('L', (50, 50), 255)
+    assert crop_to_text(blank) is blank
+
+def test_ocr_uses_the_preprocessed_image():
+    card = text_card((3000, 600), 'white', 'black')
+    buffer = io.BytesIO()
+    card.save(buffer, format='PNG')
+
+    with mock.patch.object(ocr_utils, 'check_tesseract_installation', return_value=(True, '')), \
+         mock.patch.object(pytesseract, 'image_to_string', return_value='Remote internship') as ocr, \
+         mock.patch.dict(os.environ, {'SNIFTERN_OCR_PSM': '11'}):
+        assert ocr_utils.ocr_image_bytes(buffer.getvalue()) == 'Remote internship'
+    img = ocr.call_args[0][0]
+    assert img.mode == 'L' and img.size == (2000, 400)
+    assert ocr.call_args[1]['config'] == '--psm 11 --dpi 300'
+
+    print("✅ Images are downscaled and binarized before OCR")
+
+if __name__ == "__main__":
+    test_downscale_and_settings()
+    test_binarize_light_and_dark_mode()
+    test_crop_to_text()
+    test_ocr_uses_the_preprocessed_image()
@@ -0,0 +1,76 @@
+import io
+import os
+from unittest import mock
+import pytesseract
+from PIL import Image
+import ocr_utils
+from ocr_utils import check_tesseract_installation, image_info, is_valid_image
+
+IMAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images')
+
+def encode(size, image_format, **options):
+    buffer = io.BytesIO()
+    mode = 'RGBA' if image_format == 'WEBP' and options.pop('alpha', False) else 'RGB'
+    Image.new(mode, size, 'white').save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+def test_header_sniffing_matches_pillow():
+    """Format and dimensions come from the header alone"""
+    print("Testing OCR Utilities")
+    print("=" * 50)
+
+    exif = Image.Exif()
+    exif[0x010e] = 'x' * 60000  # a large APP1 segment before the frame header
+    samples = {
+        'PNG': encode((1900, 870), 'PNG'),
+        'JPEG': encode((1024, 3000), 'JPEG'),
+        'JPEG+EXIF': encode((640, 480), 'JPEG', exif=exif.tobytes(), progressive=True),
+        'GIF': encode((300, 200), 'GIF'),
+        'BMP': encode((123, 45), 'BMP'),
+        'WEBP lossy': encode((333, 222), 'WEBP'),
+        'WEBP lossless': encode((333, 222), 'WEBP', lossless=True),
+        'WEBP alpha': encode((333, 222), 'WEBP', alpha=True, quality=50),
+        'TIFF': encode((77, 66), 'TIFF'),
+    }
+
+    for name, data in samples.items():
+        with Image.open(io.BytesIO(data)) as img:
+            expected = (img.format, img.width, img.height)
+        stream = io.BytesIO(data)
+        stream.seek(0)
+        assert image_info(stream) == expected, name
+        assert stream.tell() == 0, name
+
+    for path in sorted(os.listdir(IMAGES)):
+        assert is_valid_image(os.path.join(IMAGES, path)), path
+
+def test_rejects_non_images():
+    png = encode((10, 10), 'PNG')
+    assert not is_valid_image(io.BytesIO(b''))
+    assert not is_valid_image(io.BytesIO(b'not an image at all'))
+    assert not is_valid_image(io.BytesIO(png[:20]))
+    assert not is_valid_image(io.BytesIO(b'\xff\xd8\xff\xd9'))
+
+    # Decompression bombs are refused before anything is decoded
+    bomb = bytearray(png)
+    bomb[16:24] = (100000).to_bytes(4, 'big') * 2
+    assert not is_valid_image(io.BytesIO(bytes(bomb)))
+
+def test_tesseract_probe_is_cached():
+    """The version probe (a subprocess) runs once until a refresh is asked for"""
+    ocr_utils._tesseract_status = None
+    with mock.patch.object(pytesseract, 'get_tesseract_version', return_value='5.3.0') as probe:
+        for _ in range(5):
+            assert check_tesseract_installation() == (True, "Tesseract 5.3.0 is installed")
+        assert probe.call_count == 1
+
+        check_tesseract_installation(refresh=True)
+        assert probe.call_count == 2
+    ocr_utils._tesseract_status = None
+
+    print("✅ Images are validated from their headers and Tesseract is probed once")
+
+if __name__ == "__main__":
+    test_header_sniffing_matches_pillow()
+    test_rejects_non_images()
+    test_tesseract_probe_is_cached()
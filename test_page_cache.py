@@ -0,0 +1,107 @@
+import os
+import tempfile
+from page_cache import PageCache, get_page_cache
+from scraping_client import ScrapingClient
+from scraping_utils import fetch_page, store_page
+from stub_http_server import StubHTTPServer
+
+JOB_PAGE = "<html><body><div class='job-description'>Remote data internship, paid weekly.</div></body></html>"
+
+class ConditionalPage:
+    """Stub route honouring If-None-Match / If-Modified-Since"""
+    def __init__(self, etag='"v1"', last_modified='Wed, 01 Jan 2025 00:00:00 GMT'):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = 0
+
+    def __call__(self, handler):
+        validators = {}
+        if self.etag:
+            validators['ETag'] = self.etag
+        if self.last_modified:
+            validators['Last-Modified'] = self.last_modified
+
+        if ((self.etag and handler.headers.get('If-None-Match') == self.etag) or
+                (self.last_modified and handler.headers.get('If-Modified-Since') == self.last_modified)):
+            self.not_modified += 1
+            return 304, validators, b''
+        return 200, validators, JOB_PAGE
+
+def fetch_and_count(url, client, parses):
+    """Same flow as fetch_and_extract, recording every page that had to be parsed"""
+    text, response = fetch_page(url, 'unknown', 'test', client=client)
+    if response is not None:
+        parses.append(url)
+        text = response.text
+        store_page(url, 'test', response, text)
+    return text
+
+def test_hits_and_revalidation():
+    """Fresh hits skip the network; stale entries are revalidated with a 304"""
+    print("Testing Page Cache")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['SNIFTERN_PAGE_CACHE_DB'] = os.path.join(tmp, 'pages.db')
+        os.environ['SNIFTERN_PAGE_CACHE_TTL'] = '3600'
+        try:
+            etag_page = ConditionalPage(last_modified=None)
+            dated_page = ConditionalPage(etag=None)
+            routes = {'/etag': etag_page, '/dated': dated_page, '/plain': (200, {}, JOB_PAGE)}
+            with StubHTTPServer(routes) as server:
+                client = ScrapingClient()
+                parses = []
+
+                for path in ('/etag', '/dated', '/plain'):
+                    url = server.url(path)
+                    assert fetch_and_count(url, client, parses) == JOB_PAGE
+                    assert fetch_and_count(url, client, parses) == JOB_PAGE
+                # Second round came from the cache: no requests, no parses
+                assert len(server.requests) == 3 and len(parses) == 3
+
+                get_page_cache().ttl = 0
+                for path in ('/etag', '/dated', '/plain'):
+                    assert fetch_and_count(server.url(path), client, parses) == JOB_PAGE
+
+            assert server.requests[3][1]['If-None-Match'] == '"v1"'
+            assert server.requests[4][1]['If-Modified-Since'] == dated_page.last_modified
+            assert etag_page.not_modified == 1 and dated_page.not_modified == 1
+            # Only the page without validators had to be parsed again
+            assert len(parses) == 4
+        finally:
+            del os.environ['SNIFTERN_PAGE_CACHE_DB']
+            del os.environ['SNIFTERN_PAGE_CACHE_TTL']
+
+def test_size_cap_evicts_least_recently_used():
+    """The total stored text stays under the cap, dropping the coldest pages"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PageCache(os.path.join(tmp, 'pages.db'), max_bytes=2500)
+        for i in range(3):
+            cache.put(f'https://example.com/{i}', 'test', 'x' * 1000)
+            cache.get('https://example.com/0', 'test')  # keep page 0 hot
+
+        assert cache.total_bytes() <= 2500
+        assert cache.get('https://example.com/0', 'test').text == 'x' * 1000
+        assert cache.get('https://example.com/1', 'test') is None
+        assert cache.get('https://example.com/2', 'test').fresh
+
+        cache.put('https://example.com/huge', 'test', 'x' * 5000)
+        assert cache.get('https://example.com/huge', 'test') is None
+
+def test_off_by_default_and_versioned():
+    """No cache without SNIFTERN_PAGE_CACHE_DB; a new extractor version misses old pages"""
+    assert 'SNIFTERN_PAGE_CACHE_DB' not in os.environ
+    assert get_page_cache() is None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'pages.db')
+        PageCache(db_path, version=1).put('https://example.com/job', 'test', 'old extraction')
+        assert PageCache(db_path, version=1).get('https://example.com/job', 'test').text == 'old extraction'
+        assert PageCache(db_path, version=2).get('https://example.com/job', 'test') is None
+
+    print("✅ Page cache serves hits, revalidates stale pages and stays bounded")
+
+if __name__ == "__main__":
+    test_hits_and_revalidation()
+    test_size_cap_evicts_least_recently_used()
+    test_off_by_default_and_versioned()
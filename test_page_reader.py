@@ -0,0 +1,124 @@
+import os
+import tempfile
+from page_reader import fetch_stats, read_page
+from scraping_client import ScrapingClient
+from scraping_utils import (
+    JOB_CONTENT_EXTRACTORS,
+    MAIN_TEXT_EXTRACTOR,
+    extract_job_content_from_html,
+    extract_main_text_from_html,
+    fetch_and_extract
+)
+from stub_http_server import StubHTTPServer
+
+DESCRIPTION = "<div class='job-content'>" + "Remote design internship with weekly mentoring. " * 20 + "</div>"
+FILLER = "<div class='sidebar'><p>" + "Related posting. " * 50 + "</p></div>"
+
+def big_page(repeat):
+    """A job page whose description comes first, followed by megabytes of sidebar"""
+    return f"<html><body><nav>Jobs</nav><main>{DESCRIPTION}</main>{FILLER * repeat}</body></html>"
+
+def stream(client, url, **options):
+    return read_page(client.get(url, stream=True), **options)
+
+def test_byte_cap_and_early_stop():
+    """Huge pages are cut at the budget, or abandoned once the description closed"""
+    print("Testing Streaming Page Reader")
+    print("=" * 50)
+
+    page = big_page(3000)
+    with StubHTTPServer({'/big': (200, {}, page)}) as server:
+        client = ScrapingClient()
+
+        html = stream(client, server.url('/big'), max_bytes=256 * 1024)
+        truncated = fetch_stats.recent[-1]
+        assert len(html) == 256 * 1024 and html == page[:256 * 1024]
+        assert truncated['truncated'] and truncated['bytes_read'] == 256 * 1024
+
+        text = stream(client, server.url('/big'), extractor=MAIN_TEXT_EXTRACTOR)
+        early = fetch_stats.recent[-1]
+        assert text == extract_main_text_from_html(page)
+        assert early['stopped_early'] and not early['truncated']
+        assert early['bytes_read'] < len(page) / 10
+        # The chunk being parsed plus the strings the scan kept from the first one
+        assert early['peak_buffered_chars'] <= 2 * 64 * 1024
+        assert fetch_stats.recent[-2]['peak_buffered_chars'] == len(html)
+
+    print(f"{len(page) // 1024} KB page: capped at {truncated['bytes_read'] // 1024} KB, "
+          f"early stop after {early['bytes_read'] // 1024} KB, peak buffered {early['peak_buffered_chars'] // 1024}K chars")
+
+def test_early_stop_matches_full_parse():
+    """
+    Streaming gives the same text as parsing the whole page: decoy matches
+    in <header>/<nav> do not stop the download, and the job extractors,
+    which join every match of a selector, read to the end
+    """
+    decoy = "<div class='content'>" + "Sign in to see more jobs like this one. " * 5 + "</div>"
+    posting = "<div class='job-description'>" + "Paid data internship, mentoring included. " * 5 + "</div>"
+    more = "<div class='job-description'>Apply by Friday with your CV.</div>"
+    pages = {
+        '/decoys': f"<html><body><header>{decoy}</header><nav>{decoy}</nav>{FILLER * 90}"
+                   f"<main>{posting}</main>{FILLER * 10}</body></html>",
+        '/nested': f"<html><body><main><main>{posting}</main>{posting}</main>{FILLER * 90}</body></html>",
+        '/joined': f"<html><body><main>{posting}</main>{FILLER * 90}{more}</body></html>",
+    }
+    with StubHTTPServer({path: (200, {}, page) for path, page in pages.items()}) as server:
+        client = ScrapingClient()
+        for path, page in pages.items():
+            assert len(page) > 70 * 1024
+            text = stream(client, server.url(path), extractor=MAIN_TEXT_EXTRACTOR)
+            assert text == extract_main_text_from_html(page) and 'Paid data internship' in text, path
+            for platform, extractor in JOB_CONTENT_EXTRACTORS.items():
+                text = stream(client, server.url(path), extractor=extractor)
+                assert text == extract_job_content_from_html(page, platform), (path, platform)
+                assert not fetch_stats.recent[-1]['stopped_early']
+
+        stream(client, server.url('/decoys'), extractor=MAIN_TEXT_EXTRACTOR)
+        assert fetch_stats.recent[-1]['stopped_early']
+        assert 'Apply by Friday' in extract_job_content_from_html(pages['/joined'], 'generic')
+
+def test_incremental_decoding():
+    """Content-Type charset, <meta charset> and byte order marks, split across chunks"""
+    text = "Café stipend: 500 € " * 200
+    routes = {
+        '/header': (200, {'Content-Type': 'text/html; charset=iso-8859-15'}, text.encode('iso-8859-15')),
+        '/meta': (200, {'Content-Type': 'text/html'},
+                  b'<meta charset="windows-1252">' + text.encode('windows-1252')),
+        '/bom': (200, {'Content-Type': 'text/html'}, b'\xef\xbb\xbf' + text.encode('utf-8')),
+        '/utf8': (200, {'Content-Type': 'text/html'}, text.encode('utf-8')),
+    }
+    with StubHTTPServer(routes) as server:
+        client = ScrapingClient()
+        assert stream(client, server.url('/header'), chunk_size=7) == text
+        assert stream(client, server.url('/meta'), chunk_size=7) == '<meta charset="windows-1252">' + text
+        assert stream(client, server.url('/bom'), chunk_size=7) == text
+        assert stream(client, server.url('/utf8'), chunk_size=7) == text
+
+        # Fully read pages keep their connection alive
+        assert server.connections == 1
+
+def test_fetch_and_extract_streams():
+    """The scrapers stream through the extractor and report it in /scrape_stats"""
+    from app import app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['SNIFTERN_PAGE_CACHE_DB'] = os.path.join(tmp, 'pages.db')
+        try:
+            with StubHTTPServer({'/job': (200, {}, big_page(2000))}) as server:
+                text = fetch_and_extract(server.url('/job'), 'unknown', MAIN_TEXT_EXTRACTOR)
+                assert text.startswith('Remote design internship')
+                assert fetch_stats.recent[-1]['stopped_early']
+        finally:
+            del os.environ['SNIFTERN_PAGE_CACHE_DB']
+
+    stats = app.test_client().get('/scrape_stats').get_json()
+    assert stats['fetches'] >= 1 and stats['stopped_early'] >= 1
+    assert stats['recent'][-1]['url'] == server.url('/job')
+
+    print("✅ Pages stream in with bounded memory")
+
+if __name__ == "__main__":
+    test_byte_cap_and_early_stop()
+    test_early_stop_matches_full_parse()
+    test_incremental_decoding()
+    test_fetch_and_extract_streams()
@@ -0,0 +1,65 @@
+import random
+import re
+from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+from pattern_matcher import PatternMatcher
+
+def legacy_scan(pattern_groups, text):
+    """The original check_fake_patterns loop, kept as the reference"""
+    return [f"{pattern_type}: {pattern}"
+            for pattern_type, patterns in pattern_groups.items()
+            for pattern in patterns
+            if re.search(pattern, text)]
+
+def random_posting(words, length, rng):
+    """Build a posting from rule fragments and filler words"""
+    return ' '.join(rng.choice(words) for _ in range(length))
+
+def test_pattern_matcher():
+    """The compiled matcher must agree with re.search on every rule"""
+    print("Testing Compiled Pattern Matcher")
+    print("=" * 50)
+
+    predictor = EnhancedFakeInternshipPredictor()
+    pattern_groups = predictor.fake_internship_patterns
+    matcher = PatternMatcher(pattern_groups)
+
+    fragments = sorted({part for patterns in pattern_groups.values()
+                        for pattern in patterns for part in pattern.split('.*')})
+    filler = ['the', 'team', 'internship', 'apply', 'role', 'paying', 'nothing', 'cards', 'rs', 'no']
+    words = fragments + filler + ['\n']
+    rng = random.Random(42)
+
+    for length in (0, 1, 3, 10, 50, 200):
+        for _ in range(200):
+            text = random_posting(words, length, rng)
+            assert matcher.scan(text) == legacy_scan(pattern_groups, text), text
+
+    # Literals glued together or split across lines
+    edge_cases = [
+        'paycertificate',
+        'certificate pay',
+        'pay\ncertificate',
+        'no experience needed\nno',
+        'nonono experienceneeded',
+        'virtual internship\ninternship pay',
+    ]
+    for text in edge_cases:
+        assert matcher.scan(text) == legacy_scan(pattern_groups, text), text
+
+    # Rules that are not plain literal chains still go through re
+    mixed = PatternMatcher({'custom': [r'pay\s+now', r'free.*gift']})
+    assert mixed.scan('pay   now for a free gift') == ['custom: pay\\s+now', 'custom: free.*gift']
+
+    # check_fake_patterns keeps its contract
+    is_fake, pattern_matches, confidence_boost = predictor.check_fake_patterns(
+        'pay 50 dollars for the certificate no experience required'
+    )
+    print(f"Pattern Matches: {pattern_matches}")
+    assert is_fake
+    assert pattern_matches == legacy_scan(pattern_groups, 'pay 50 dollars for the certificate no experience required')
+    assert confidence_boost == 15 * len(pattern_matches) + 25
+
+    print("✅ Compiled matcher agrees with the regex loop")
+
+if __name__ == "__main__":
+    test_pattern_matcher()
@@ -0,0 +1,95 @@
+import html
+import random
+import re
+import sys
+import pandas as pd
+from bs4 import BeautifulSoup
+from preprocessing import preprocess_text, strip_html
+
+def legacy_preprocess_text(text):
+    """The original BeautifulSoup-based preprocess_text, kept as the reference"""
+    if pd.isna(text) or text == '':
+        return ''
+    text = html.unescape(str(text))
+    text = BeautifulSoup(text, 'html.parser').get_text()
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+EDGE_CASES = [
+    'Plain pasted posting with no markup at all',
+    'R&D intern, salary 5000 & benefits',
+    '<p>Marketing <b>Intern</b></p><ul><li>Python</li><li>SQL</li></ul>',
+    'a<script>var x = "<p>hidden</p>";</script>b',
+    '<style>p { color: red }</style>visible',
+    '<template><p>hidden</p></template>shown',
+    '<div><template><p>x</div>back',
+    '<br><template>x</br>still hidden',
+    'a<!-- comment -->b<!DOCTYPE html>c<?php echo 1 ?>d',
+    'a<![CDATA[cdata text]]>b',
+    'x < y and y > z, 5<6',
+    'a &amp;lt; b &amp;#65; &amp;fjlig; &amp;foo; &amp;ampx',
+    '&amp;#x41 &amp;#1114112; &amp;#150;',
+    '<p>Caf&#xE9;&#xA0;&#x4A;obs &#X4a;</p>',
+    '<a href="x>y">link</a>',
+    'unclosed <b',
+    'a</ b>c',
+    '<textarea>a<b>c</b></textarea>',
+    'Line one\r\nLine two\tTab',
+    '<P>Upper<BR/>Case</P>',
+    '',
+    None,
+    float('nan'),
+    12345,
+]
+
+def fuzz_inputs(count, rng):
+    """Random tag soup built from the fragments that trip parsers up"""
+    fragments = [
+        '<p>', '</p>', '<b>', '</b>', '<script>', '</script>', '<style>', '</style>',
+        '<template>', '</template>', '<br>', '</br>', '<br/>', '<div class="x">', '</div>',
+        '<!--', '-->', '<![CDATA[', ']]>', '<!x>', '<?pi?>', '&amp;', '&lt;', '&gt;', '&#65;',
+        '&#x42;', '&#xE9;', '&#XA0;', '&#x4A;', '&nbsp;', '&', '<', '>', '"', 'intern', 'pay', 'Fee', ' ', '\n', '123'
+    ]
+    for _ in range(count):
+        yield ''.join(rng.choice(fragments) for _ in range(rng.randint(1, 30)))
+
+def test_preprocess_text_matches_beautifulsoup():
+    """The tiered stripper must produce exactly what BeautifulSoup did"""
+    print("Testing Tiered HTML Preprocessing")
+    print("=" * 50)
+
+    for text in EDGE_CASES:
+        assert preprocess_text(text) == legacy_preprocess_text(text), repr(text)
+
+    rng = random.Random(7)
+    for text in fuzz_inputs(5000, rng):
+        assert preprocess_text(text) == legacy_preprocess_text(text), repr(text)
+
+def test_strip_html_matches_get_text():
+    """
+    preprocess_text unescapes before stripping, so check the stripper's
+    own character reference decoding (either case of hex digit) directly
+    """
+    for text in ['Caf&#xE9;&#xA0;&#x4A;obs &#X4a; &#XE9;', '&#150; &#x96; &#0; &#x110000;',
+                 '&#x81; &#x9D; &#xD800; &#xFDD0; &#127;', '<p>&#x2013x; &#65</p>']:
+        assert strip_html(text) == BeautifulSoup(text, 'html.parser').get_text(), repr(text)
+
+    print("✅ preprocess_text matches the BeautifulSoup reference")
+
+def verify_corpus(file_path):
+    """Compare both implementations on every row of fake_job_postings.csv"""
+    df = pd.read_csv(file_path)
+    columns = [col for col in ['title', 'company_profile', 'description'] if col in df.columns]
+    texts = df[columns].fillna('').agg(' '.join, axis=1)
+
+    mismatches = [i for i, text in texts.items() if preprocess_text(text) != legacy_preprocess_text(text)]
+    print(f"Rows checked: {len(texts)}, mismatches: {len(mismatches)}")
+    return not mismatches
+
+if __name__ == "__main__":
+    test_preprocess_text_matches_beautifulsoup()
+    test_strip_html_matches_get_text()
+    if len(sys.argv) > 1:
+        sys.exit(0 if verify_corpus(sys.argv[1]) else 1)
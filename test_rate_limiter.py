@@ -0,0 +1,119 @@
+import time
+from rate_limiter import HostRateLimiter, RateLimitExceeded, TokenBucket
+from scraping_client import ScrapingClient, get_client
+from stub_http_server import StubHTTPServer
+
+class FakeClock:
+    """Deterministic clock whose sleep just advances time"""
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def measure_throughput(client, url, requests, platform='unknown'):
+    """Fetch `url` repeatedly and return requests per second"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        assert client.get(url, platform=platform).status_code == 200
+    return requests / (time.perf_counter() - start)
+
+def test_token_bucket():
+    """Bursts go through immediately, then callers wait for refills"""
+    print("Testing Per-Host Rate Limiter")
+    print("=" * 50)
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0  # queued behind the previous reservation
+
+    clock.now += 10  # an idle hour (or ten seconds) later the budget is full again
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+
+def test_max_wait():
+    """Reservations that would queue past max_wait are refused and give their token back"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, max_wait=2)
+
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 1.0, 2.0]
+    for _ in range(3):
+        try:
+            bucket.reserve()
+            assert False, "a 3 second wait should be refused"
+        except RateLimitExceeded as e:
+            assert e.retry_after == 1.0
+    assert bucket.tokens == -2
+
+    clock.now += 1
+    assert bucket.reserve() == 2.0
+
+    limiter = HostRateLimiter({'unknown': (1, 1)}, clock=clock, sleep=clock.sleep, max_wait=0)
+    assert limiter.acquire('https://example.com/a') == 0
+    try:
+        limiter.acquire('https://example.com/b')
+        assert False, "the limiter should refuse rather than sleep"
+    except RateLimitExceeded:
+        pass
+    assert clock.slept == []
+
+def test_app_answers_429():
+    """A fetch the limiter refuses becomes a 429 with Retry-After"""
+    from app import app
+
+    client = get_client()
+    limiter = client.rate_limiter
+    client.rate_limiter = HostRateLimiter({'unknown': (0.1, 1)}, max_wait=1)
+    try:
+        with StubHTTPServer({'/job': (200, {}, 'ok')}) as server:
+            url = server.url(f'/job?t={time.time()}')
+            app_client = app.test_client()
+            app_client.post('/extract_url', json={'url': url})
+            response = app_client.post('/extract_url', json={'url': url + '&again'})
+            assert response.status_code == 429
+            assert response.headers['Retry-After'] == '9'
+    finally:
+        client.rate_limiter = limiter
+
+def test_hosts_are_independent():
+    """Only the exhausted host is delayed; each platform gets its own rate"""
+    clock = FakeClock()
+    limiter = HostRateLimiter({'linkedin': (1, 1), 'unknown': (100, 100)}, clock=clock, sleep=clock.sleep)
+
+    assert limiter.acquire('https://www.linkedin.com/jobs/view/1', 'linkedin') == 0
+    assert limiter.acquire('https://www.linkedin.com/jobs/view/2', 'linkedin') == 1.0
+    for i in range(50):
+        assert limiter.acquire(f'https://example.com/job/{i}') == 0
+    assert clock.slept == [1.0]
+
+def test_throughput_against_stub_server():
+    """Unlimited hosts run at full speed; a limited host converges to its rate"""
+    with StubHTTPServer({'/job': (200, {}, 'ok')}) as server:
+        url = server.url('/job')
+
+        unlimited = ScrapingClient()
+        free_rate = measure_throughput(unlimited, url, 50)
+
+        limited = ScrapingClient(rate_limiter=HostRateLimiter({'indeed': (20, 5)}))
+        limited_rate = measure_throughput(limited, url, 45, platform='indeed')
+
+        print(f"Unlimited: {free_rate:.0f} req/s, limited to 20 req/s (burst 5): {limited_rate:.1f} req/s")
+        assert free_rate > 50
+        # 5 burst + 40 refills at 20/s is about 2 seconds
+        assert 15 < limited_rate < 30
+
+    print("✅ Rate limiter only delays exhausted hosts")
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_max_wait()
+    test_app_answers_429()
+    test_hosts_are_independent()
+    test_throughput_against_stub_server()
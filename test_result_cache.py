@@ -0,0 +1,88 @@
+import os
+import tempfile
+import time
+from result_cache import ResultCache
+
+def test_lru_and_ttl():
+    """Entries are evicted least recently used first and expire after the TTL"""
+    print("Testing Result Cache")
+    print("=" * 50)
+
+    cache = ResultCache(max_size=2, ttl=0.2)
+    keys = [cache.make_key(text, 'v1') for text in ('a', 'b', 'c')]
+
+    cache.set(keys[0], {'result': 'a'})
+    cache.set(keys[1], {'result': 'b'})
+    assert cache.get(keys[0]) == {'result': 'a'}  # 'a' is now most recently used
+    cache.set(keys[2], {'result': 'c'})           # evicts 'b'
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == {'result': 'c'}
+
+    time.sleep(0.25)
+    assert cache.get(keys[0]) is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    assert stats['size'] == 1
+
+def test_keys():
+    """Keys ignore surrounding whitespace but not content or model version"""
+    cache = ResultCache()
+    assert cache.make_key('  Pay fee\r\nnow ', 'v1') == cache.make_key('Pay fee\nnow', 'v1')
+    assert cache.make_key('Pay fee now', 'v1') != cache.make_key('Pay  fee now', 'v1')
+    assert cache.make_key('Pay fee now', 'v1') != cache.make_key('Pay fee now', 'v2')
+
+def test_shared_sqlite_backend():
+    """Two caches on the same SQLite file see each other's results"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'results.db')
+        worker_a = ResultCache(db_path=db_path)
+        worker_b = ResultCache(db_path=db_path)
+
+        key = worker_a.make_key('posting', 'v1')
+        worker_a.set(key, {'result': 'Likely FAKE ❌', 'pattern_matches': ['x']})
+
+        assert worker_b.get(key) == {'result': 'Likely FAKE ❌', 'pattern_matches': ['x']}
+        assert worker_b.stats()['shared_hits'] == 1
+        assert worker_b.get(key) is not None
+        assert worker_b.stats()['hits'] == 1
+
+def test_detect_uses_cache():
+    """Repeated /detect calls are served from the cache"""
+    from app import app, result_cache
+
+    client = app.test_client()
+    result_cache.clear()
+    text = "Virtual internship! Pay the certificate fee of 500 rupees to start immediately."
+
+    first = client.post('/detect', json={'text': text}).get_json()
+    second = client.post('/detect', json={'text': text + '\n'}).get_json()
+    assert first == second
+
+    stats = client.get('/cache_stats').get_json()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['model_version'] and stats['rules_version']
+    print(f"Cache stats: {stats}")
+    print("✅ Result cache works")
+
+def test_rules_change_cache_version():
+    """Editing the pattern rules gives cached results a new key"""
+    from app import get_predictor
+
+    predictor = get_predictor()
+    patterns = predictor.fake_internship_patterns
+    before = predictor.get_rules_version()
+    assert predictor.cache_version == f"{predictor.model_version}-{before}"
+    try:
+        predictor.fake_internship_patterns = dict(patterns, certificate_payment=patterns['certificate_payment'] + [r'gift.*card'])
+        assert predictor.get_rules_version() != before
+    finally:
+        predictor.fake_internship_patterns = patterns
+    assert predictor.get_rules_version() == before
+
+if __name__ == "__main__":
+    test_lru_and_ttl()
+    test_keys()
+    test_shared_sqlite_backend()
+    test_detect_uses_cache()
+    test_rules_change_cache_version()
@@ -0,0 +1,79 @@
+import time
+from scraping_client import ScrapingClient
+from stub_http_server import StubHTTPServer
+
+JOB_PAGE = "<html><body><main><div class='job-description'>Paid internship</div></main></body></html>"
+
+def test_connections_are_reused():
+    """Repeated fetches to one host share a single keep-alive connection"""
+    print("Testing Pooled Scraping Client")
+    print("=" * 50)
+
+    with StubHTTPServer({'/job': (200, {}, JOB_PAGE)}) as server:
+        client = ScrapingClient(pool_size=2)
+        for _ in range(10):
+            response = client.get(server.url('/job'), headers={'User-Agent': 'test'})
+            assert response.status_code == 200
+            assert 'Paid internship' in response.text
+
+        assert len(server.requests) == 10
+        assert server.connections == 1
+        assert server.requests[0][1]['User-Agent'] == 'test'
+        assert client.session_for(server.url('/other')) is client.session_for(server.url('/job'))
+        client.close()
+
+    print(f"10 requests over {server.connections} connection")
+
+def test_retries_with_backoff():
+    """429 and 5xx responses are retried before giving up"""
+    attempts = []
+
+    def flaky(handler):
+        attempts.append(handler.path)
+        if len(attempts) == 1:
+            return 429, {'Retry-After': '0'}, 'slow down'
+        if len(attempts) == 2:
+            return 503, {}, 'unavailable'
+        return 200, {}, JOB_PAGE
+
+    with StubHTTPServer({'/flaky': flaky, '/down': (500, {}, 'error')}) as server:
+        client = ScrapingClient(retries=3, backoff_factor=0)
+
+        response = client.get(server.url('/flaky'))
+        assert response.status_code == 200
+        assert len(attempts) == 3
+
+        # Once retries are exhausted the last response comes back as-is
+        response = client.get(server.url('/down'))
+        assert response.status_code == 500
+        assert sum(1 for path, _ in server.requests if path == '/down') == 4
+        client.close()
+
+def test_retry_after_is_capped():
+    """A huge Retry-After waits max_retry_after seconds, not what the server asks for"""
+    attempts = []
+
+    def throttled(handler):
+        attempts.append(handler.path)
+        if len(attempts) == 1:
+            return 429, {'Retry-After': '3600'}, 'come back in an hour'
+        return 200, {}, JOB_PAGE
+
+    with StubHTTPServer({'/throttled': throttled}) as server:
+        client = ScrapingClient(retries=3, backoff_factor=0, max_retry_after=0.2)
+
+        start = time.perf_counter()
+        response = client.get(server.url('/throttled'))
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+        assert len(attempts) == 2
+        assert 0.2 <= elapsed < 5
+        client.close()
+
+    print(f"Retry-After: 3600 waited {elapsed:.2f}s")
+    print("✅ Scraping client pools connections and retries")
+
+if __name__ == "__main__":
+    test_connections_are_reused()
+    test_retries_with_backoff()
+    test_retry_after_is_capped()
@@ -0,0 +1,51 @@
+import json
+import subprocess
+import sys
+
+# Loaded on first use (or by app.warm_up()), never by importing the app
+HEAVY_MODULES = ['PIL', 'bs4', 'lxml', 'pandas', 'sklearn', 'scipy', 'joblib', 'reportlab', 'pytesseract']
+
+def loaded_after(code):
+    """Which of HEAVY_MODULES a fresh interpreter has imported after running `code`"""
+    check = f"{code}\nimport json, sys\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    output = subprocess.run([sys.executable, '-W', 'ignore', '-c', check], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_import_app_stays_light():
+    """Importing the app loads no model, parser, imaging or PDF library"""
+    print("Testing Lazy Startup")
+    print("=" * 50)
+
+    import ocr_backend
+    loaded = loaded_after("import app")
+    # tesserocr, when installed, is the OCR engine itself and brings Pillow along
+    if ocr_backend.tesserocr is not None:
+        loaded = [module for module in loaded if module != 'PIL']
+    assert loaded == [], loaded
+
+    loaded = loaded_after("import app\napp.warm_up()")
+    assert {'PIL', 'bs4', 'lxml', 'scipy', 'reportlab'} <= set(loaded), loaded
+    print(f"warm_up() loads: {', '.join(loaded)}")
+
+def test_model_version_follows_the_weights():
+    """The cache version is a hash of the loaded weights, not of the pickles on disk"""
+    from app import get_predictor
+
+    predictor = get_predictor()
+    version = predictor.get_model_version()
+    assert version == predictor.model_version and len(version) == 12
+
+    coef = predictor.scorer.coef
+    try:
+        predictor.scorer.coef = coef * 2
+        assert predictor.get_model_version() != version
+    finally:
+        predictor.scorer.coef = coef
+    assert predictor.get_model_version() == version
+
+    print("✅ The app starts light and loads the rest on first use")
+
+if __name__ == "__main__":
+    test_import_app_stays_light()
+    test_model_version_follows_the_weights()
@@ -0,0 +1,88 @@
+import glob
+import os
+import random
+import re
+from text_cleaner import BOILERPLATE_PHRASES, TextCleaner, clean_job_text, clean_text
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+
+def legacy_clean_text(text):
+    """preprocessing.clean_extracted_text as it was"""
+    if not text or text.strip() == '':
+        return ''
+    text = text.strip()
+    text = re.sub(r'\n+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+def legacy_clean_job_text(text):
+    """app.clean_extracted_text as it was: one re.sub per group of phrases"""
+    if not text:
+        return ""
+    text = ' '.join(text.split())
+    remove_patterns = [
+        r'cookie|privacy|terms|conditions',
+        r'sign in|sign up|login|register',
+        r'apply now|apply for this job',
+        r'share|save|bookmark',
+        r'related jobs|similar jobs',
+        r'company reviews|employee reviews',
+        r'salary estimates|salary information',
+        r'job alerts|email alerts',
+        r'feedback|report|flag'
+    ]
+    for pattern in remove_patterns:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    return ' '.join(text.split())
+
+def load_pages():
+    """Visible text of the saved job pages, unclean"""
+    from bs4 import BeautifulSoup
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages.append(BeautifulSoup(f.read(), 'html.parser').get_text(' '))
+    return pages
+
+def random_text(rng):
+    """Boilerplate phrases in any case, separated by words, spaces or nothing"""
+    pieces = BOILERPLATE_PHRASES + ['intern', 'python', 'Sign', 'in', 'reports', 'ſhare', 'İ', ' ', '\x1c', '\n\n', '\t']
+    parts = [rng.choice(pieces) for _ in range(rng.randint(0, 20))]
+    text = ''.join(part + rng.choice([' ', '  ', '\n', ' . ']) for part in parts)
+    return ''.join(c.upper() if rng.random() < 0.3 else c for c in text)
+
+def test_whitespace_cleaner_matches_preprocessing():
+    print("Testing Text Cleaner")
+    print("=" * 50)
+
+    rng = random.Random(6)
+    texts = load_pages() + [None, '', ' \n\t ', 'a\r\n\r\nb', ' x y\x1c']
+    texts += [random_text(rng) for _ in range(3000)]
+    for text in texts:
+        assert clean_text(text) == legacy_clean_text(text), repr(text)
+
+def test_job_cleaner_matches_app():
+    """One pass removes what the nine passes did, whenever phrases are separated"""
+    rng = random.Random(8)
+    texts = load_pages() + [random_text(rng) for _ in range(3000)]
+    for text in texts:
+        assert clean_job_text(text) == legacy_clean_job_text(text), repr(text)
+
+    # Known differences, on words glued together: the passes could rejoin
+    # the text around a removed phrase into a new one, and an earlier group
+    # won an overlap even when the later group's phrase started first
+    assert legacy_clean_job_text("sigcookien in") == "" and clean_job_text("sigcookien in") == "sign in"
+    assert legacy_clean_job_text("reporterms") == "repor" and clean_job_text("reporterms") == "erms"
+
+def test_custom_phrases():
+    cleaner = TextCleaner(['Apply', 'a.b'])
+    assert cleaner("  APPLY here:\n a.b axb ") == "here: axb"
+    assert TextCleaner()("  keep   Apply ") == "keep Apply"
+
+    print("✅ One cleaner, one pass over the text")
+
+if __name__ == "__main__":
+    test_whitespace_cleaner_matches_preprocessing()
+    test_job_cleaner_matches_app()
+    test_custom_phrases()
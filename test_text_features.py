@@ -0,0 +1,129 @@
+import glob
+import os
+import random
+import re
+from scraping_utils import extract_job_content_from_html
+from text_features import (
+    LEGITIMATE_INTERVIEW_TERMS,
+    PROFESSIONAL_TERMS,
+    SALARY_PATTERNS,
+    SUSPICIOUS_INTERVIEW_TERMS,
+    SUSPICIOUS_SALARY_TERMS,
+    UNPROFESSIONAL_TERMS,
+    PhraseScanner,
+    TextFeatures,
+    salary_mentioned
+)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'html')
+
+def legacy_analyses(text):
+    """The three analyze_* methods as they were, each lowercasing and scanning on its own"""
+    text_lower = text.lower()
+    salary_found = any(re.search(pattern, text_lower) for pattern in SALARY_PATTERNS)
+    suspicious_terms = sum(1 for term in SUSPICIOUS_SALARY_TERMS if term in text_lower)
+    if salary_found and suspicious_terms >= 3:
+        salary = "⚠️ HIGH RISK: Unrealistic salary promises detected"
+    elif salary_found and suspicious_terms >= 1:
+        salary = "⚠️ MEDIUM RISK: Potentially unrealistic salary"
+    elif salary_found:
+        salary = "✅ NORMAL: Standard salary range"
+    else:
+        salary = "ℹ️ INFO: No specific salary mentioned"
+
+    text_lower = text.lower()
+    professional_count = sum(1 for term in PROFESSIONAL_TERMS if term in text_lower)
+    unprofessional_count = sum(1 for term in UNPROFESSIONAL_TERMS if term in text_lower)
+    total_words = len(text.split())
+    professional_ratio = professional_count / max(total_words, 1) * 100
+    unprofessional_ratio = unprofessional_count / max(total_words, 1) * 100
+    if professional_ratio > 2 and unprofessional_ratio < 1:
+        quality = "✅ EXCELLENT: Professional internship description"
+    elif professional_ratio > 1 and unprofessional_ratio < 2:
+        quality = "✅ GOOD: Well-structured internship description"
+    elif unprofessional_ratio > 2:
+        quality = "⚠️ POOR: Unprofessional internship description"
+    else:
+        quality = "ℹ️ AVERAGE: Standard internship description"
+
+    text_lower = text.lower()
+    suspicious_count = sum(1 for pattern in SUSPICIOUS_INTERVIEW_TERMS if pattern in text_lower)
+    legitimate_count = sum(1 for pattern in LEGITIMATE_INTERVIEW_TERMS if pattern in text_lower)
+    if suspicious_count >= 2:
+        interview = "🚨 HIGH RISK: Suspicious interview process detected"
+    elif suspicious_count >= 1:
+        interview = "⚠️ MEDIUM RISK: Potentially suspicious interview process"
+    elif legitimate_count >= 2:
+        interview = "✅ GOOD: Standard interview process"
+    else:
+        interview = "ℹ️ INFO: No specific interview details mentioned"
+
+    return salary, quality, interview
+
+def analyses(predictor, text):
+    features = TextFeatures(text)
+    return (predictor.analyze_salary_range(text, features),
+            predictor.analyze_internship_description_quality(text, features),
+            predictor.analyze_interview_process(text, features))
+
+SAMPLE_TEXTS = [
+    "Software Engineering Internship at Microsoft. We are looking for talented students to join our team. Requirements: Currently pursuing Computer Science degree, knowledge of Python/Java. Benefits include competitive stipend and mentorship.",
+    "Virtual Internship Opportunity! You need to pay $50 for the certificate upon completion. No experience required. Limited time offer!",
+    "",
+    "Data Entry Clerk - Immediate Start. We need someone to process payments and transfer funds. Commission based.",
+    "URGENT! Work from home, earn 500 dollars per week. Quick money, no interview required, start immediately via WhatsApp interview.",
+    "Paid research internship, salary of $2,500 per month. Interview process: coding test, technical interview and a case study presentation.",
+]
+
+def load_corpus():
+    """Sample postings plus the text extracted from the saved job pages"""
+    texts = list(SAMPLE_TEXTS)
+    for path in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            texts.append(extract_job_content_from_html(f.read(), os.path.basename(path)[:-5]))
+    return texts
+
+def random_posting(rng):
+    """Indicator phrases, salary fragments and near misses, in any case"""
+    pieces = (SUSPICIOUS_SALARY_TERMS + PROFESSIONAL_TERMS + UNPROFESSIONAL_TERMS +
+              SUSPICIOUS_INTERVIEW_TERMS + LEGITIMATE_INTERVIEW_TERMS +
+              ['$', '$5', '$1,200-2,000', ' per ', 'hour', 'month', 'salary', 'pay of', 'repay', 'earnings',
+               '300 usd', '50 dollars', 'rupees', 'inr', 'of ', ',000', '\n', '\t', 'no ', 'the', 'İ', 'ß'])
+    parts = [rng.choice(pieces) for _ in range(rng.randint(0, 30))]
+    text = ''.join(part + rng.choice(['', ' ', '  ', '\n']) for part in parts)
+    return ''.join(c.upper() if rng.random() < 0.2 else c for c in text)
+
+def test_phrase_scanner():
+    print("Testing Text Features")
+    print("=" * 50)
+
+    scanner = PhraseScanner(['background check', 'no background check', 'check', 'team'])
+    assert scanner.scan('we run a background check') == {'background check', 'check'}
+    assert scanner.scan('no background check, steam') == {'background check', 'no background check', 'check', 'team'}
+    assert scanner.scan('') == set()
+
+def test_salary_mentioned_matches_regexes():
+    rng = random.Random(2)
+    for _ in range(5000):
+        text = random_posting(rng).lower()
+        assert salary_mentioned(text) == any(re.search(pattern, text) for pattern in SALARY_PATTERNS), repr(text)
+
+def test_verdicts_unchanged():
+    """Every analyzer gives exactly the verdict it gave before, on the corpus and on fuzzed text"""
+    from enhanced_prediction_utils import EnhancedFakeInternshipPredictor
+
+    predictor = EnhancedFakeInternshipPredictor()
+    texts = load_corpus()
+    rng = random.Random(4)
+    texts += [random_posting(rng) for _ in range(3000)]
+    for text in texts:
+        assert analyses(predictor, text) == legacy_analyses(text), repr(text[:200])
+        assert (predictor.analyze_salary_range(text), predictor.analyze_internship_description_quality(text),
+                predictor.analyze_interview_process(text)) == legacy_analyses(text)
+
+    print("✅ One feature pass gives the same verdicts")
+
+if __name__ == "__main__":
+    test_phrase_scanner()
+    test_salary_mentioned_matches_regexes()
+    test_verdicts_unchanged()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import pandas as pd
+from preprocessing import preprocess_text
+from train_model import load_and_preprocess_data
+
+def make_dataset(path, rows):
+    """Write a small fake_job_postings.csv lookalike"""
+    pd.DataFrame({
+        'job_id': range(rows),
+        'title': [f'<b>Intern {i}</b>' for i in range(rows)],
+        'company_profile': ['Great &amp; growing team' if i % 3 else None for i in range(rows)],
+        'description': ['' if i % 10 == 0 else f'<p>Pay certificate fee #{i}</p>' for i in range(rows)],
+        'fraudulent': [i % 2 for i in range(rows)]
+    }).to_csv(path, index=False)
+
+def test_load_and_preprocess_data():
+    """Parallel chunked preprocessing matches the serial result and is cached"""
+    print("Testing Parallel Preprocessing Pipeline")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'postings.csv')
+        cache_dir = os.path.join(tmp, 'cache')
+        make_dataset(csv_path, 250)
+
+        df = load_and_preprocess_data(csv_path, workers=2, chunksize=40, cache_dir=cache_dir)
+
+        # Same result as cleaning the whole file serially
+        raw = pd.read_csv(csv_path)
+        expected = (raw['title'].fillna('') + ' ' + raw['company_profile'].fillna('') + ' '
+                    + raw['description'].fillna('') + ' ').apply(preprocess_text)
+        assert df['full_text'].tolist() == expected.tolist()
+        assert df['fraudulent'].tolist() == raw['fraudulent'].tolist()
+
+        # Second run is served from the cache
+        assert len(os.listdir(cache_dir)) == 1
+        cached = load_and_preprocess_data(csv_path, workers=2, chunksize=40, cache_dir=cache_dir)
+        assert cached.equals(df)
+
+        # Changing the input invalidates the cache key
+        make_dataset(csv_path, 120)
+        smaller = load_and_preprocess_data(csv_path, workers=1, chunksize=40, cache_dir=cache_dir)
+        assert len(smaller) == 120
+        assert len(os.listdir(cache_dir)) == 2
+
+    print("✅ Chunked preprocessing is correct and cached")
+
+if __name__ == "__main__":
+    test_load_and_preprocess_data()
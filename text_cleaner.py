@@ -0,0 +1,53 @@
+import re
+from collections import defaultdict
+
+# Site chrome job boards wrap around a posting, removed wherever it appears
+BOILERPLATE_PHRASES = [
+    'cookie', 'privacy', 'terms', 'conditions',
+    'sign in', 'sign up', 'login', 'register',
+    'apply now', 'apply for this job',
+    'share', 'save', 'bookmark',
+    'related jobs', 'similar jobs',
+    'company reviews', 'employee reviews',
+    'salary estimates', 'salary information',
+    'job alerts', 'email alerts',
+    'feedback', 'report', 'flag'
+]
+
+def phrase_pattern(phrases):
+    """
+    One case-insensitive regex matching any of `phrases`, grouped by first
+    letter ('c(?:ookie|onditions|...)|p(?:rivacy)|...') so the regex engine
+    rejects most positions on their first character instead of trying
+    every phrase there
+    """
+    groups = defaultdict(list)
+    for phrase in phrases:
+        groups[phrase[0].lower()].append(re.escape(phrase[1:]))
+    return re.compile('|'.join(f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in groups.items()),
+                      re.IGNORECASE)
+
+class TextCleaner:
+    def __init__(self, remove_phrases=()):
+        """
+        Cleaner for extracted text: runs of whitespace (including newlines)
+        become single spaces, and `remove_phrases` are deleted,
+        case-insensitively and in a single pass
+        """
+        self.pattern = phrase_pattern(remove_phrases) if remove_phrases else None
+
+    def __call__(self, text):
+        if not text:
+            return ''
+        text = ' '.join(text.split())
+        if self.pattern is not None:
+            text, removed = self.pattern.subn('', text)
+            if removed:
+                text = ' '.join(text.split())
+        return text
+
+# Whitespace only: text from OCR and generic pages
+clean_text = TextCleaner()
+
+# Also drops job board boilerplate: text from the /analyze_<platform> scrapers
+clean_job_text = TextCleaner(BOILERPLATE_PHRASES)
@@ -0,0 +1,108 @@
+import re
+
+# Salary mentions: an amount per period, an amount in a named currency per
+# period, or a pay word followed by a dollar amount
+SALARY_PATTERNS = [
+    r'\$\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?\s*(?:per\s+)?(?:hour|day|week|month|year)',
+    r'\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?\s*(?:dollars?|usd|inr|rupees?)\s*(?:per\s+)?(?:hour|day|week|month|year)',
+    r'(?:salary|pay|compensation|earnings?)\s*(?:of\s+)?\$\d{1,3}(?:,\d{3})*(?:-\d{1,3}(?:,\d{3})*)?'
+]
+DOLLAR_AMOUNT, CURRENCY_AMOUNT, PAY_AMOUNT = (re.compile(pattern) for pattern in SALARY_PATTERNS)
+
+# Literals every match of CURRENCY_AMOUNT / PAY_AMOUNT contains or starts with,
+# checked first so the regexes only run on texts (and at positions) that can match
+CURRENCY_WORDS = ('dollar', 'usd', 'inr', 'rupee')
+PAY_WORDS = ('salary', 'pay', 'compensation', 'earning')
+
+SUSPICIOUS_SALARY_TERMS = [
+    'no experience required', 'work from home', 'immediate start', 'quick money', 'fast cash',
+    'easy money', 'high salary', 'excellent pay', 'great compensation'
+]
+
+PROFESSIONAL_TERMS = [
+    'requirements', 'qualifications', 'responsibilities', 'duties',
+    'experience', 'skills', 'education', 'degree', 'certification',
+    'team', 'collaboration', 'leadership', 'management',
+    'project', 'development', 'analysis', 'strategy'
+]
+
+UNPROFESSIONAL_TERMS = [
+    'urgent', 'immediate', 'quick', 'fast', 'easy',
+    'no experience needed', 'anyone can apply', 'everyone welcome',
+    'work from anywhere', 'flexible hours', 'no pressure',
+    'commission only', 'no salary', 'payment required'
+]
+
+SUSPICIOUS_INTERVIEW_TERMS = [
+    'no interview required', 'immediate hiring', 'quick hiring process', 'no background check',
+    'no verification needed', 'start immediately', 'no questions asked', 'automatic approval',
+    'instant approval', 'no formal interview', 'chat interview only', 'text interview',
+    'whatsapp interview'
+]
+
+LEGITIMATE_INTERVIEW_TERMS = [
+    'interview process', 'multiple rounds', 'technical interview', 'behavioral interview',
+    'background check', 'reference check', 'skill assessment', 'coding test',
+    'presentation', 'case study'
+]
+
+class PhraseScanner:
+    def __init__(self, phrases):
+        """
+        Finds which of a set of phrases occur anywhere in a text (as
+        substrings, like `phrase in text`). Each distinct phrase is looked
+        for once, shortest first, and a phrase containing another one is
+        only looked for if that one was found: 'no background check'
+        cannot occur without 'background check'.
+        """
+        phrases = sorted(set(phrases), key=lambda phrase: (len(phrase), phrase))
+        parts = {phrase: frozenset(other for other in phrases if other != phrase and other in phrase)
+                 for phrase in phrases}
+        self.simple = [phrase for phrase in phrases if not parts[phrase]]
+        self.compound = [(phrase, parts[phrase]) for phrase in phrases if parts[phrase]]
+
+    def scan(self, text):
+        found = {phrase for phrase in self.simple if phrase in text}
+        for phrase, parts in self.compound:
+            if parts <= found and phrase in text:
+                found.add(phrase)
+        return found
+
+INDICATOR_SCANNER = PhraseScanner(
+    SUSPICIOUS_SALARY_TERMS + PROFESSIONAL_TERMS + UNPROFESSIONAL_TERMS +
+    SUSPICIOUS_INTERVIEW_TERMS + LEGITIMATE_INTERVIEW_TERMS
+)
+
+def salary_mentioned(text_lower):
+    """Whether any of SALARY_PATTERNS matches the lowercased text"""
+    if '$' in text_lower:
+        if DOLLAR_AMOUNT.search(text_lower):
+            return True
+        # PAY_AMOUNT can only start at a pay word; try it there alone
+        for word in PAY_WORDS:
+            start = text_lower.find(word)
+            while start >= 0:
+                if PAY_AMOUNT.match(text_lower, start):
+                    return True
+                start = text_lower.find(word, start + 1)
+    if any(word in text_lower for word in CURRENCY_WORDS):
+        return CURRENCY_AMOUNT.search(text_lower) is not None
+    return False
+
+class TextFeatures:
+    def __init__(self, text, word_count=None):
+        """
+        What the salary, description quality and interview analyses read
+        from a text, computed in one pass: the lowercased text, its word
+        count (unless the caller already knows it), which indicator phrases
+        it contains and whether it mentions a salary
+        """
+        self.text = text
+        self.lower = text.lower()
+        self.word_count = len(text.split()) if word_count is None else word_count
+        self.phrases = INDICATOR_SCANNER.scan(self.lower)
+        self.salary_found = salary_mentioned(self.lower)
+
+    def count(self, terms):
+        """How many of `terms` (distinct phrases) occur in the text"""
+        return len(self.phrases.intersection(terms))
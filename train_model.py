@@ -7,41 +7,97 @@ from sklearn.metrics import classification_report, accuracy_score
 import joblib
 import re
 import os
+import argparse
+import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import preprocessing
 from preprocessing import preprocess_text
+from linear_scorer import LinearScorer
+from fast_vectorizer import FastVectorizer, check_export
 
-def load_and_preprocess_data(file_path):
-    """Load and preprocess the dataset"""
-    print("Loading dataset...")
-    df = pd.read_csv(file_path)
-    
-    print("Combining text columns...")
-    # Combine text columns (only use available columns)
-    text_columns = ['title', 'company_profile', 'description']
-    
-    # Check which columns exist in the dataset
-    available_columns = [col for col in text_columns if col in df.columns]
-    print(f"Using columns: {available_columns}")
-    
-    # Combine available text columns
-    df['full_text'] = ''
-    for col in available_columns:
-        df['full_text'] += df[col].fillna('') + ' '
-    
-    print("Cleaning text...")
-    # Clean the combined text (process in batches for memory efficiency)
-    batch_size = 1000
-    cleaned_texts = []
+# Text columns combined into the training document
+TEXT_COLUMNS = ['title', 'company_profile', 'description']
+
+# Preprocessed datasets are cached here, keyed by input file and preprocessing code
+CACHE_DIR = '.preprocess_cache'
+
+def preprocess_chunk(texts):
+    """Preprocess one chunk of documents (runs in a worker process)"""
+    return [preprocess_text(text) for text in texts]
+
+def get_cache_key(file_path):
+    """Hash of the dataset, the preprocessing code and the text columns"""
+    digest = hashlib.sha256()
     
-    for i in range(0, len(df), batch_size):
-        batch = df['full_text'].iloc[i:i+batch_size]
-        cleaned_batch = batch.apply(preprocess_text)
-        cleaned_texts.extend(cleaned_batch.tolist())
-        print(f"Processed batch {i//batch_size + 1}/{(len(df)-1)//batch_size + 1}")
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
     
-    df['full_text'] = cleaned_texts
+    with open(preprocessing.__file__, 'rb') as f:
+        digest.update(f.read())
+    
+    digest.update(','.join(TEXT_COLUMNS).encode())
+    return digest.hexdigest()[:32]
+
+def load_and_preprocess_data(file_path, workers=None, chunksize=1000, cache_dir=CACHE_DIR):
+    """
+    Load and preprocess the dataset.
+    The CSV is streamed in chunks that are cleaned in a pool of `workers`
+    processes (all cores by default); the result is cached in `cache_dir`
+    so retraining on the same data skips cleaning entirely.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, f'{get_cache_key(file_path)}.pkl')
+        if os.path.exists(cache_path):
+            print(f"Loading preprocessed dataset from cache {cache_path}...")
+            df = pd.read_pickle(cache_path)
+            print(f"Dataset shape after preprocessing: {df.shape}")
+            return df
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"Loading and cleaning dataset with {workers} worker(s)...")
+    
+    labels = []
+    cleaned_texts = []
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        
+        def collect(limit):
+            # Wait for the oldest chunks until at most `limit` are in flight
+            while len(pending) > limit:
+                cleaned_texts.extend(pending.popleft().result())
+                print(f"Processed {len(cleaned_texts)} rows")
+        
+        for i, chunk in enumerate(pd.read_csv(file_path, chunksize=chunksize)):
+            # Combine text columns (only use available columns)
+            available_columns = [col for col in TEXT_COLUMNS if col in chunk.columns]
+            if i == 0:
+                print(f"Using columns: {available_columns}")
+            
+            full_text = pd.Series('', index=chunk.index)
+            for col in available_columns:
+                full_text += chunk[col].fillna('') + ' '
+            
+            labels.extend(chunk['fraudulent'].tolist())
+            pending.append(executor.submit(preprocess_chunk, full_text.tolist()))
+            
+            # Keep a bounded number of chunks in flight so memory stays flat
+            collect(2 * workers)
+        
+        collect(0)
+    
+    df = pd.DataFrame({'full_text': cleaned_texts, 'fraudulent': labels})
     
     # Drop rows where full_text is empty
-    df = df[df['full_text'].str.strip() != '']
+    df = df[df['full_text'].str.strip() != ''].reset_index(drop=True)
+    
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_pickle(cache_path)
+        print(f"Cached preprocessed dataset in {cache_path}")
     
     print(f"Dataset shape after preprocessing: {df.shape}")
     return df
@@ -87,26 +143,46 @@ def train_model(df):
     
     return model, vectorizer, X_test, y_test
 
-def save_model(model, vectorizer, model_dir='model'):
-    """Save the trained model and vectorizer"""
+def save_model(model, vectorizer, model_dir='model', texts=None):
+    """
+    Save the trained model and vectorizer, plus their inference-only
+    exports (the vectorizer's checked against it on `texts`)
+    """
     # Create model directory if it doesn't exist
     os.makedirs(model_dir, exist_ok=True)
     
     print(f"Saving model and vectorizer to {model_dir}/...")
     joblib.dump(model, f'{model_dir}/fake_job_model.pkl')
     joblib.dump(vectorizer, f'{model_dir}/tfidf_vectorizer.pkl')
+    LinearScorer.from_model(model).save(f'{model_dir}/linear_scorer.npz')
+    fast_vectorizer = FastVectorizer.from_vectorizer(vectorizer)
+    if texts is not None:
+        check_export(fast_vectorizer, vectorizer, texts)
+    fast_vectorizer.save(f'{model_dir}/fast_vectorizer.npz')
     print("Model and vectorizer saved successfully!")
 
 def main():
     """Main function to run the training pipeline"""
+    parser = argparse.ArgumentParser(description="Train the fake job posting model")
+    parser.add_argument('--data', default='fake_job_postings.csv', help="Path to the training CSV")
+    parser.add_argument('--workers', type=int, default=None, help="Preprocessing processes (default: all cores)")
+    parser.add_argument('--chunksize', type=int, default=1000, help="Rows per preprocessing chunk")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-run preprocessing")
+    args = parser.parse_args()
+    
     # Load and preprocess data
-    df = load_and_preprocess_data('fake_job_postings.csv')
+    df = load_and_preprocess_data(
+        args.data,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        cache_dir=None if args.no_cache else CACHE_DIR
+    )
     
     # Train model
     model, vectorizer, X_test, y_test = train_model(df)
     
     # Save model
-    save_model(model, vectorizer)
+    save_model(model, vectorizer, texts=df['full_text'])
     
     print("\nTraining completed successfully!")
     print("Model and vectorizer saved in the 'model' folder.")